@@ -0,0 +1,339 @@
+import argparse
+import datetime
+import json
+import multiprocessing
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from api.data.client import SpeechDatabaseClient
+from api.data.tables import Speech
+from api.service.analysis2_service import Analysis2Result, analyze_stt_script
+
+"""
+저장된 STT 결과로 analysis-2를 일괄 재수행하는 배치 작업
+(교정 부호 기준값이나 LPM 분석 로직이 바뀐 경우 기존 스피치들의 분석 결과를 갱신할 때 사용)
+
+* 사용 예시 *
+python -m api.command.reanalyze --presentation-id 3 7 --workers 4 --dry-run
+python -m api.command.reanalyze --since 2023-08-01 --until 2023-09-01 \\
+    --progress-file reanalyze.progress.json --s3-writes-per-second 30
+# 이전 실행에서 실패한 스피치를 먼저 다시 처리한 뒤 이어서 재개
+python -m api.command.reanalyze --progress-file reanalyze.progress.json --retry-failed
+
+* 주의 * analysis-2는 STT.json을 문장 단위로 재조합한 결과로 덮어쓰므로,
+원본 STT 결과(STT_RAW.json)가 있으면 그것으로 재분석한다.
+원본이 없는 스피치(원본 보관 이전에 분석된 스피치)는 재조합된 STT.json을 다시 재조합한다. (재조합 결과는 동일하게 유지됨)
+이전 버전에서 재조합된 STT.json은 깨진 문장(broken)의 텍스트가 배정된 단어보다 짧게 잘려 있으므로, 단어들로 텍스트를 복원한 뒤 재조합한다.
+그래도 재조합할 수 없는 스피치는 재분석하지 않고 실패로 기록한다.
+"""
+
+
+class RateLimiter:
+    """
+    초당 허용량을 넘지 않도록 acquire 호출을 지연시킨다. (rate가 None이면 제한하지 않음)
+    """
+
+    def __init__(self, rate_per_second: Optional[float]) -> None:
+        self.rate_per_second = rate_per_second
+        self._next_available = time.monotonic()
+
+    def acquire(self, amount: int = 1) -> None:
+        if not self.rate_per_second:
+            return
+
+        now = time.monotonic()
+        if self._next_available < now:
+            self._next_available = now
+
+        wait = self._next_available - now
+        self._next_available += amount / self.rate_per_second
+        if wait > 0:
+            time.sleep(wait)
+
+
+class ReanalyzeProgress:
+    """
+    재분석 진행 상황을 파일에 기록한다.
+    page 단위로 모든 스피치의 처리가 끝났을 때 해당 page의 마지막 speech id를 기록하므로,
+    중단 후 재시작하면 그 다음 speech부터 이어서 처리한다.
+    """
+
+    def __init__(self, path: Optional[Path]) -> None:
+        self.path = path
+        self.last_id: Optional[int] = None
+        self.failed: List[dict] = []
+
+        if path is not None and path.is_file():
+            with open(path, "r") as f:
+                saved = json.load(f)
+            self.last_id = saved.get("last_id")
+            self.failed = saved.get("failed", [])
+
+    def save(self, last_id: Optional[int]) -> None:
+        self.last_id = last_id
+        if self.path is None:
+            return
+
+        # 기록 도중 중단되어도 이전 진행 상황이 깨지지 않도록 임시 파일에 쓴 뒤 교체
+        tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump({"last_id": self.last_id, "failed": self.failed}, f)
+        tmp_path.replace(self.path)
+
+
+class NotReanalyzableError(Exception):
+    """
+    저장된 STT 결과를 재조합할 수 없어 재분석할 수 없는 경우
+    """
+
+
+def restore_broken_segment_texts(stt_script: dict) -> dict:
+    """
+    _summary_
+        재조합된 STT 결과에서 깨진 문장(broken)의 텍스트를 배정된 단어들로 다시 만든다.
+        (이전 버전의 재조합은 깨진 문장의 텍스트를 배정된 단어보다 짧게 잘라 저장하여, 다시 재조합할 수 없음)
+    """
+    segments = [
+        (
+            {**segment, "text": " ".join(word[2] for word in segment["words"])}
+            if segment.get("broken")
+            else segment
+        )
+        for segment in stt_script["segments"]
+    ]
+    return {**stt_script, "segments": segments}
+
+
+# worker process 마다 한 번만 생성하는 객체들
+_worker_storage_service = None
+_worker_speech_service = None
+
+
+def _init_worker() -> None:
+    from api.service.speech import SpeechService
+    from api.service.storage import get_storage_service
+
+    global _worker_storage_service, _worker_speech_service
+    _worker_storage_service = get_storage_service()
+    _worker_speech_service = SpeechService()
+
+
+def _analyze_speech(
+    presentation_id: int, speech_id: int, dry_run: bool = False
+) -> Tuple[int, int, Analysis2Result, int]:
+    """
+    _summary_
+        저장된 STT 결과로 analysis-2를 수행한다.
+        dry_run이면 문장 재조합 결과를 저장소에 저장하지 않는다. (ALIGNMENT_CACHE_PERSIST 설정과 무관)
+
+    Returns:
+        Tuple[int, int, Analysis2Result, int]: (presentation id, speech id, 분석 결과, 저장한 문장 재조합 결과 수)
+    """
+    from api.service.aws.s3 import get_aligned_script_cache_url, get_raw_stt_save_url
+
+    stt_script = _worker_storage_service.download_json_object_if_exists(
+        get_raw_stt_save_url(presentation_id, speech_id)
+    )
+    if stt_script is None:
+        stt_key = f"{presentation_id}/{speech_id}/analysis/STT.json"
+        stt_script = restore_broken_segment_texts(
+            _worker_storage_service.download_json_object(stt_key)
+        )
+
+    write_count = _worker_speech_service.alignment_cache_write_count
+    try:
+        result = analyze_stt_script(
+            stt_script,
+            _worker_speech_service,
+            (
+                None
+                if dry_run
+                else get_aligned_script_cache_url(presentation_id, speech_id)
+            ),
+        )
+    except IndexError as e:
+        # 문장에 배정할 단어가 없는 경우 (텍스트와 단어가 맞지 않는 STT 결과)
+        raise NotReanalyzableError(f"STT 결과를 재조합할 수 없습니다: {e!r}") from e
+
+    return (
+        presentation_id,
+        speech_id,
+        result,
+        _worker_speech_service.alignment_cache_write_count - write_count,
+    )
+
+
+def get_target_conditions(args: argparse.Namespace) -> list:
+    conditions = []
+    if args.presentation_id:
+        conditions.append(Speech.presentation_id.in_(args.presentation_id))
+    if args.since:
+        conditions.append(Speech.created_date >= args.since)
+    if args.until:
+        conditions.append(Speech.created_date < args.until)
+    return conditions
+
+
+def reanalyze(args: argparse.Namespace) -> ReanalyzeProgress:
+    from api.service.analysis_record import AnalysisRecordService
+
+    speech_db_client = SpeechDatabaseClient()
+    analysis_record_service = None if args.dry_run else AnalysisRecordService()
+
+    progress = ReanalyzeProgress(None if args.dry_run else args.progress_file)
+    s3_rate_limiter = RateLimiter(args.s3_writes_per_second)
+    db_rate_limiter = RateLimiter(args.db_writes_per_second)
+
+    if progress.last_id is not None:
+        print(f"[LOG] speech id {progress.last_id} 이후부터 재분석을 재개합니다.")
+
+    def process(executor: Executor, targets: List[Tuple[int, int]]) -> None:
+        """
+        (presentation id, speech id) 목록을 재분석하여 저장하고, 실패한 스피치는 progress.failed에 기록한다.
+        """
+        futures = {
+            executor.submit(
+                _analyze_speech, presentation_id, speech_id, args.dry_run
+            ): (
+                presentation_id,
+                speech_id,
+            )
+            for presentation_id, speech_id in targets
+        }
+
+        for future in as_completed(futures):
+            presentation_id, speech_id = futures[future]
+            try:
+                _, _, result, cache_write_count = future.result()
+
+                if args.dry_run:
+                    print(
+                        f"[DRY-RUN] presentation={presentation_id} speech={speech_id}",
+                        json.dumps(result.speech_info, ensure_ascii=False),
+                    )
+                    continue
+
+                # 분석 결과 업로드 (S3 put 여러 건) + AnalysisRecord / Speech 갱신 (DB write 2건)
+                # worker에서 이미 저장한 문장 재조합 결과도 업로드 수에 포함하여 이후 업로드를 늦춤
+                s3_rate_limiter.acquire(len(result.records) + cache_write_count)
+                db_rate_limiter.acquire(2)
+                analysis_record_service.save_analysis_results(
+                    presentation_id, speech_id, result.records, upsert=True
+                )
+                speech_db_client.update_columns(
+                    [Speech.id == speech_id], result.speech_info
+                )
+            except Exception as e:
+                print(
+                    f"[ERROR] presentation={presentation_id} speech={speech_id}",
+                    repr(e),
+                )
+                progress.failed.append(
+                    {
+                        "presentation_id": presentation_id,
+                        "speech_id": speech_id,
+                        "error": repr(e),
+                    }
+                )
+
+    processed_count = 0
+    # worker에서 DB / S3 client를 부모와 공유하지 않도록 spawn 사용
+    with ProcessPoolExecutor(
+        max_workers=args.workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+    ) as executor:
+        if args.retry_failed and progress.failed:
+            retry_targets = [
+                (failed["presentation_id"], failed["speech_id"])
+                for failed in progress.failed
+            ]
+            print(
+                f"[LOG] 이전에 실패한 스피치 {len(retry_targets)}개를 다시 처리합니다."
+            )
+            # 다시 실패한 스피치만 실패 목록에 남김
+            progress.failed = []
+            process(executor, retry_targets)
+            progress.save(progress.last_id)
+
+        for page in speech_db_client.iter_pages(
+            get_target_conditions(args),
+            page_size=args.page_size,
+            columns=["presentation_id"],
+            after_id=progress.last_id,
+        ):
+            process(executor, [(row.presentation_id, row.id) for row in page])
+
+            processed_count += len(page)
+            progress.save(page[-1].id)
+            print(
+                f"[LOG] {processed_count}개 스피치 처리 완료 (last speech id: {page[-1].id}, 실패: {len(progress.failed)})"
+            )
+
+    return progress
+
+
+def get_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="저장된 STT 결과로 analysis-2를 일괄 재수행합니다."
+    )
+    parser.add_argument(
+        "--presentation-id",
+        type=int,
+        nargs="+",
+        help="재분석할 presentation id 목록 (생략 시 전체)",
+    )
+    parser.add_argument(
+        "--since",
+        type=datetime.datetime.fromisoformat,
+        help="이 시각 이후 생성된 스피치만 재분석 (ISO 8601)",
+    )
+    parser.add_argument(
+        "--until",
+        type=datetime.datetime.fromisoformat,
+        help="이 시각 이전 생성된 스피치만 재분석 (ISO 8601)",
+    )
+    parser.add_argument(
+        "--workers", type=int, default=multiprocessing.cpu_count(), help="worker 수"
+    )
+    parser.add_argument(
+        "--page-size", type=int, default=200, help="한 번에 조회할 스피치 수"
+    )
+    parser.add_argument(
+        "--s3-writes-per-second",
+        type=float,
+        default=None,
+        help="초당 최대 S3 업로드 수 (생략 시 제한 없음)",
+    )
+    parser.add_argument(
+        "--db-writes-per-second",
+        type=float,
+        default=None,
+        help="초당 최대 DB write 수 (생략 시 제한 없음)",
+    )
+    parser.add_argument(
+        "--progress-file",
+        type=Path,
+        default=None,
+        help="진행 상황을 기록할 파일 (지정하면 중단된 지점부터 재개)",
+    )
+    parser.add_argument(
+        "--retry-failed",
+        action="store_true",
+        help="진행 상황 파일에 기록된, 이전 실행에서 실패한 스피치를 먼저 다시 처리",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="분석만 수행하고 S3 / DB에 저장하지 않음",
+    )
+    return parser
+
+
+if __name__ == "__main__":
+    progress = reanalyze(get_parser().parse_args())
+    print(f"[LOG] 재분석 완료 (실패: {len(progress.failed)})")
+    for failed in progress.failed:
+        print("[LOG] 실패:", failed)
@@ -0,0 +1,177 @@
+import argparse
+import gc
+import os
+import signal
+import socket
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict
+
+from api.configs.analysis import config as analysis_config
+
+"""
+worker process들을 fork하기 전에 부모 프로세스에서 무거운 초기화를 미리 수행하는 서버 실행 모드
+kiwi 모델 로드, librosa(pyin / stft)의 numba JIT 컴파일, 문장 분리를 부모 프로세스에서 한 번 수행한 뒤 worker들을 fork하므로,
+각 worker는 첫 요청부터 초기화 비용 없이 처리하고 모델 메모리는 copy-on-write로 공유한다.
+worker가 비정상 종료되면 초기화된 부모 프로세스에서 다시 fork한다.
+
+* 사용 예시 *
+python -m api.command.serve --host 0.0.0.0 --port 8000 --workers 4
+
+* 주의 * kiwi의 worker thread들은 fork 이후 자식 프로세스에서 동작하지 않으므로,
+이 모드에서는 kiwi를 single thread로 사용한다. (병렬 처리는 worker process 단위로 수행)
+
+* 주의 * worker들은 하나의 socket을 공유하므로 같은 speech의 요청이 서로 다른 worker로 전달될 수 있다.
+점진 분석(analysis-2 segments)은 상태를 process memory에 보관하므로, worker가 2개 이상이면 점진 분석 endpoint를 끈다. (503 반환)
+점진 분석을 사용하려면 `--workers 1`로 여러 인스턴스를 실행하고, 앞단의 proxy에서
+같은 speech의 요청(`/{presentation_id}/speech/{speech_id}/...`)을 항상 같은 인스턴스로 보내야 한다. (sticky routing)
+"""
+
+
+def warm_up() -> None:
+    """
+    _summary_
+        요청 처리 경로의 lazy 초기화(모델 로드, JIT 컴파일 등)를 짧은 입력으로 미리 수행한다.
+    """
+    import numpy as np
+    import soundfile as sf
+
+    from api.service.audio_analysis_service import (
+        get_db_analysis,
+        get_f0_analysis,
+        get_f0_average_analysis,
+    )
+    from api.service.speech import get_kiwi
+
+    get_kiwi().split_into_sents("안녕하세요. 발표 연습을 시작하겠습니다.")
+
+    # librosa.load 기본 sample rate로 만든 1초 길이의 150Hz sine wave
+    sample_rate = 22050
+    times = np.arange(sample_rate) / sample_rate
+    clip = 0.5 * np.sin(2 * np.pi * 150 * times)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        clip_path = Path(tmp_dir) / "warm_up.wav"
+        sf.write(clip_path, clip, sample_rate)
+
+        get_f0_analysis(clip_path)
+        get_f0_average_analysis(clip_path)
+        get_db_analysis(clip_path)
+
+
+def run_worker(app, sock: socket.socket, args: argparse.Namespace) -> None:
+    import uvicorn
+
+    config = uvicorn.Config(app, log_level=args.log_level)
+    uvicorn.Server(config).run(sockets=[sock])
+
+
+class PreforkServer:
+    def __init__(self, app, sock: socket.socket, args: argparse.Namespace) -> None:
+        self.app = app
+        self.sock = sock
+        self.args = args
+        # pid -> worker 번호
+        self.workers: Dict[int, int] = {}
+        self.shutting_down = False
+
+    def spawn_worker(self, worker_number: int) -> None:
+        pid = os.fork()
+        if pid:
+            self.workers[pid] = worker_number
+            return
+
+        # 자식 프로세스: 부모의 signal handler를 되돌린 뒤 uvicorn이 다시 설치하도록 함
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        signal.signal(signal.SIGINT, signal.SIG_DFL)
+
+        exit_code = 0
+        try:
+            run_worker(self.app, self.sock, self.args)
+        except BaseException as e:
+            print(f"[ERROR] worker {worker_number} 비정상 종료", repr(e))
+            exit_code = 1
+        finally:
+            os._exit(exit_code)
+
+    def shutdown(self, signum, frame) -> None:
+        self.shutting_down = True
+        for pid in self.workers:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    def run(self) -> None:
+        signal.signal(signal.SIGTERM, self.shutdown)
+        signal.signal(signal.SIGINT, self.shutdown)
+
+        for worker_number in range(self.args.workers):
+            self.spawn_worker(worker_number)
+        print(f"[LOG] worker {len(self.workers)}개 시작 (pid: {list(self.workers)})")
+
+        while self.workers:
+            pid, status = os.wait()
+            worker_number = self.workers.pop(pid, None)
+            if worker_number is None or self.shutting_down:
+                continue
+
+            print(
+                f"[LOG] worker {worker_number} (pid: {pid}) 종료됨 (status: {status}), 다시 시작합니다."
+            )
+            # 연속으로 비정상 종료되는 경우 fork가 반복되지 않도록 잠시 대기
+            time.sleep(1)
+            self.spawn_worker(worker_number)
+
+        print("[LOG] 서버 종료")
+
+
+def serve(args: argparse.Namespace) -> None:
+    # kiwi는 처음 사용할 때(warm_up) 생성되므로 그 전에 설정
+    analysis_config.kiwi_num_workers = 1
+    if args.workers > 1 and analysis_config.incremental_analysis_enabled:
+        analysis_config.incremental_analysis_enabled = False
+        print(
+            "[LOG] worker가 2개 이상이므로 점진 분석(analysis-2 segments) endpoint를 끕니다. "
+            "(사용하려면 --workers 1로 여러 인스턴스를 실행하고 speech 별 sticky routing 필요)"
+        )
+
+    started_at = time.perf_counter()
+    from main import app
+
+    warm_up()
+    print(f"[LOG] 초기화 완료 ({time.perf_counter() - started_at:.2f}s)")
+
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((args.host, args.port))
+    sock.listen(args.backlog)
+    sock.set_inheritable(True)
+    print(f"[LOG] http://{args.host}:{args.port} 에서 요청을 받습니다.")
+
+    # 초기화 중 생성된 객체들을 GC 대상에서 제외하여, worker에서 GC가 객체를 건드려 page가 복사되지 않도록 함
+    gc.collect()
+    gc.freeze()
+
+    PreforkServer(app, sock, args).run()
+
+
+def get_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="초기화를 마친 부모 프로세스에서 worker들을 fork하여 서버를 실행합니다."
+    )
+    parser.add_argument("--host", default="127.0.0.1", help="bind할 host")
+    parser.add_argument("--port", type=int, default=8000, help="bind할 port")
+    parser.add_argument(
+        "--workers", type=int, default=os.cpu_count() or 1, help="worker process 수"
+    )
+    parser.add_argument(
+        "--backlog", type=int, default=2048, help="연결 대기열의 최대 길이"
+    )
+    parser.add_argument("--log-level", default="info", help="uvicorn log level")
+    return parser
+
+
+if __name__ == "__main__":
+    serve(get_parser().parse_args())
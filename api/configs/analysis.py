@@ -0,0 +1,26 @@
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class AnalysisConfig(BaseSettings):
+    # kiwi 형태소 분석 / 문장 분리에 사용할 thread 수 (0: 사용 가능한 모든 코어)
+    kiwi_num_workers: int = 0
+    # 문장 분리 시 STT segment 단위로 묶어 병렬 처리할 chunk의 최대 글자 수 (0: 나누지 않음)
+    sentence_split_chunk_size: int = 2000
+    # 문장 별 LPM으로 속도 교정 부호(TOO_FAST / TOO_SLOW)를 생성할지 여부
+    speech_correction_lpm: bool = False
+    # 점진 분석(analysis-2 segments) 시 다음 segment가 도착하면 다시 분리할 마지막 문장 수
+    incremental_tail_sentence_count: int = 2
+    # 점진 분석 endpoint 사용 여부 (상태를 process memory에 보관하므로 같은 speech의 요청이 같은 process로 전달되어야 함)
+    incremental_analysis_enabled: bool = True
+    # 점진 분석 상태를 마지막 요청 이후 보관할 시간(초), memory에 보관할 최대 speech 수
+    incremental_session_ttl: float = 600
+    incremental_session_max_count: int = 1000
+    # 문장 재조합 결과를 memory에 보관할 STT 결과 수 (0: 보관하지 않음)
+    alignment_cache_size: int = 128
+    # 문장 재조합 결과를 STT 결과 옆에 저장하여 재분석 시 재사용할지 여부
+    alignment_cache_persist: bool = False
+
+    model_config = SettingsConfigDict(env_file=".env", extra="ignore")
+
+
+config = AnalysisConfig()
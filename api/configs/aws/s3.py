@@ -1,3 +1,5 @@
+from typing import Dict, Tuple
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -5,6 +7,37 @@ class S3Config(BaseSettings):
     audio_bucket_name: str
     aws_region: str
 
+    # boto3 client 설정 (프로세스 당 하나의 client를 공유)
+    s3_max_pool_connections: int = 50
+    s3_retry_mode: str = "adaptive"
+    s3_max_attempts: int = 5
+
+    # upload_file / download_file 시 사용할 multipart 전송 설정
+    s3_multipart_threshold: int = 8 * 1024 * 1024
+    s3_multipart_chunksize: int = 8 * 1024 * 1024
+    s3_max_concurrency: int = 10
+
+    # 분석 결과 JSON 압축 방식 ("identity": 압축 안 함, "gzip", "zstd")
+    s3_json_content_encoding: str = "identity"
+    # 압축 레벨 (AnalysisRecordType 별로 지정하지 않은 경우 사용)
+    s3_json_compression_level: int = 6
+    # AnalysisRecordType 별 압축 레벨 (0이면 압축하지 않음) ex) {"HERTZ": 9, "PAUSE_RATIO": 0}
+    s3_json_compression_levels: Dict[str, int] = {}
+    # 이 크기(byte)보다 작은 JSON은 압축하지 않음
+    s3_json_compression_min_size: int = 1024
+
+    def get_json_compression(self, record_type: str) -> Tuple[str, int]:
+        """
+        Returns:
+            Tuple[str, int]: (Content-Encoding, 압축 레벨)
+        """
+        level = self.s3_json_compression_levels.get(
+            record_type, self.s3_json_compression_level
+        )
+        if level <= 0:
+            return "identity", 0
+        return self.s3_json_content_encoding, level
+
     model_config = SettingsConfigDict(env_file=".env", extra="ignore")
 
 
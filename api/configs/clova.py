@@ -5,6 +5,18 @@ class ClovaSpeechConfigs(BaseSettings):
     clova_secret_key: str
     clova_stt_target_url: str
 
+    # 연결 / 응답 대기 시간 제한 (초)
+    clova_connect_timeout: float = 3.05
+    clova_read_timeout: float = 30.0
+
+    # 5xx / 429 응답 및 연결 실패 시 재시도 (최초 요청 제외 횟수)
+    clova_max_retries: int = 3
+    clova_backoff_base: float = 0.5
+    clova_backoff_max: float = 8.0
+
+    # 유지할 connection 수
+    clova_pool_maxsize: int = 10
+
     model_config = SettingsConfigDict(env_file=".env", extra="ignore")
 
 
@@ -8,9 +8,19 @@ class DatabaseConfigs(BaseSettings):
     db_port: int
     db_name: str
 
+    # 커넥션 풀 설정 (모두 worker process 하나 당 값)
+    # 전체 MySQL 커넥션 수 = replica 수 * worker 수 * (db_pool_size + db_max_overflow)
+    db_pool_size: int = 5
+    db_max_overflow: int = 5
+    db_pool_recycle: int = 500
+    db_pool_timeout: float = 30.0
+
     def get_full_url(self) -> str:
         return f"mysql+pymysql://{self.db_username}:{self.db_password}@{self.db_host}:{self.db_port}/{self.db_name}"
 
+    def get_async_full_url(self) -> str:
+        return f"mysql+aiomysql://{self.db_username}:{self.db_password}@{self.db_host}:{self.db_port}/{self.db_name}"
+
     model_config = SettingsConfigDict(env_file=".env", extra="ignore")
 
 
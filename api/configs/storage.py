@@ -0,0 +1,17 @@
+from typing import Optional
+
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class StorageConfig(BaseSettings):
+    # 파일 저장소 종류 ("s3", "local": 로컬 파일 시스템, "memory": 프로세스 메모리)
+    storage_backend: str = "s3"
+    # storage_backend가 local인 경우 파일을 저장할 디렉토리
+    local_storage_root: str = "./.storage"
+    # storage_backend가 local인 경우 URL 생성에 사용할 주소 (없으면 file:// URL 사용)
+    local_storage_base_url: Optional[str] = None
+
+    model_config = SettingsConfigDict(env_file=".env", extra="ignore")
+
+
+config = StorageConfig()
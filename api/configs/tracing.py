@@ -0,0 +1,13 @@
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class TracingConfig(BaseSettings):
+    # 분석 pipeline의 trace span 기록 여부
+    tracing_enabled: bool = False
+    # span을 한 줄에 하나씩(JSON Lines) 기록할 파일 경로
+    tracing_export_path: str = "./traces.jsonl"
+
+    model_config = SettingsConfigDict(env_file=".env", extra="ignore")
+
+
+config = TracingConfig()
@@ -3,6 +3,11 @@ from datetime import datetime
 from fastapi import FastAPI, HTTPException
 from pydantic import BaseModel
 
+from api.data.engine import engine_registry
+from api.service.aws.s3 import s3_client_factory
+from api.service.clova_service import clova_metrics
+from api.service.speech import aligned_segments_cache
+
 app = FastAPI()
 
 
@@ -15,6 +20,26 @@ def server_time():
     return {"now": datetime.now()}
 
 
+@app.get("/db-pool")
+def db_pool_stats():
+    return engine_registry.get_pool_stats()
+
+
+@app.get("/s3")
+def s3_stats():
+    return s3_client_factory.metrics.get_stats()
+
+
+@app.get("/clova")
+def clova_stats():
+    return clova_metrics.get_stats()
+
+
+@app.get("/alignment-cache")
+def alignment_cache_stats():
+    return aligned_segments_cache.get_stats()
+
+
 @app.get("/echo-string")
 async def echo_string(input_string: str):
     if not input_string:
@@ -0,0 +1,164 @@
+from typing import Dict, Iterable, List
+
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
+
+from api.data.engine import engine_registry
+from api.service.aws.s3 import s3_client_factory
+from api.service.clova_service import clova_metrics
+from api.service.metrics_service import format_sample, registry
+from api.service.speech import aligned_segments_cache
+
+"""
+Prometheus scrape용 metric endpoint
+pipeline metric(metrics_service)과 함께, /api/v1/info 에서 JSON으로 제공하는 S3 / Clova / DB 풀 / 문장 재조합 cache 통계를
+같은 이름 규칙의 metric으로 변환하여 노출한다.
+"""
+
+app = FastAPI()
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _format_family(
+    name: str, metric_type: str, documentation: str, samples: List[str]
+) -> List[str]:
+    return [
+        f"# HELP {name} {documentation}",
+        f"# TYPE {name} {metric_type}",
+    ] + samples
+
+
+def collect_s3_metrics() -> Iterable[str]:
+    stats: Dict[str, Dict[str, float]] = s3_client_factory.metrics.get_stats()
+    families = [
+        ("wasak_s3_requests_total", "counter", "S3 요청 수", "count"),
+        (
+            "wasak_s3_request_errors_total",
+            "counter",
+            "실패한 S3 요청 수",
+            "error_count",
+        ),
+        (
+            "wasak_s3_request_seconds_total",
+            "counter",
+            "S3 요청 소요 시간 합계",
+            "total_seconds",
+        ),
+        (
+            "wasak_s3_request_seconds_max",
+            "gauge",
+            "S3 요청 최대 소요 시간",
+            "max_seconds",
+        ),
+        ("wasak_s3_transferred_bytes_total", "counter", "S3 전송 byte 수", "bytes"),
+    ]
+
+    lines = []
+    for name, metric_type, documentation, key in families:
+        samples = [
+            format_sample(name, ("operation",), (operation,), operation_stats[key])
+            for operation, operation_stats in sorted(stats.items())
+        ]
+        lines.extend(_format_family(name, metric_type, documentation, samples))
+    return lines
+
+
+def collect_clova_metrics() -> Iterable[str]:
+    stats = clova_metrics.get_stats()
+    families = [
+        ("wasak_clova_requests_total", "counter", "Clova STT 요청 수", "count"),
+        (
+            "wasak_clova_request_errors_total",
+            "counter",
+            "실패한 Clova STT 요청 수",
+            "error_count",
+        ),
+        ("wasak_clova_retries_total", "counter", "Clova STT 재시도 수", "retry_count"),
+        (
+            "wasak_clova_request_seconds_total",
+            "counter",
+            "Clova STT 요청 소요 시간 합계",
+            "total_seconds",
+        ),
+        (
+            "wasak_clova_request_seconds_max",
+            "gauge",
+            "Clova STT 요청 최대 소요 시간",
+            "max_seconds",
+        ),
+    ]
+
+    lines = []
+    for name, metric_type, documentation, key in families:
+        samples = [format_sample(name, (), (), stats[key])]
+        lines.extend(_format_family(name, metric_type, documentation, samples))
+    return lines
+
+
+def collect_db_pool_metrics() -> Iterable[str]:
+    stats = engine_registry.get_pool_stats()
+
+    # 풀 상태 중 숫자 값만 metric으로 노출
+    keys = sorted(
+        {
+            key
+            for pool_stats in stats.values()
+            for key, value in pool_stats.items()
+            if key != "pid" and isinstance(value, (int, float))
+        }
+    )
+
+    lines = []
+    for key in keys:
+        name = f"wasak_db_pool_{key}"
+        samples = [
+            format_sample(name, ("url",), (url,), pool_stats[key])
+            for url, pool_stats in sorted(stats.items())
+            if key in pool_stats
+        ]
+        lines.extend(_format_family(name, "gauge", f"DB 커넥션 풀 {key}", samples))
+    return lines
+
+
+def collect_alignment_cache_metrics() -> Iterable[str]:
+    stats = aligned_segments_cache.get_stats()
+    return (
+        _format_family(
+            "wasak_alignment_cache_hits_total",
+            "counter",
+            "문장 재조합 cache hit 수",
+            [
+                format_sample(
+                    "wasak_alignment_cache_hits_total", (), (), stats["hit_count"]
+                )
+            ],
+        )
+        + _format_family(
+            "wasak_alignment_cache_misses_total",
+            "counter",
+            "문장 재조합 cache miss 수",
+            [
+                format_sample(
+                    "wasak_alignment_cache_misses_total", (), (), stats["miss_count"]
+                )
+            ],
+        )
+        + _format_family(
+            "wasak_alignment_cache_size",
+            "gauge",
+            "memory에 보관 중인 문장 재조합 결과 수",
+            [format_sample("wasak_alignment_cache_size", (), (), stats["size"])],
+        )
+    )
+
+
+registry.register_collector(collect_s3_metrics)
+registry.register_collector(collect_clova_metrics)
+registry.register_collector(collect_db_pool_metrics)
+registry.register_collector(collect_alignment_cache_metrics)
+
+
+@app.get("/", response_class=PlainTextResponse)
+def metrics():
+    return PlainTextResponse(registry.render(), media_type=CONTENT_TYPE)
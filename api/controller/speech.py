@@ -1,24 +1,44 @@
-import json
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List
+from threading import Lock
+from typing import Any, Dict, List, Optional, Tuple
 import tempfile
-from functools import reduce
+import time
 
-from fastapi import FastAPI, BackgroundTasks
+from fastapi import FastAPI, BackgroundTasks, Body, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+import msgspec
 from pydantic import BaseModel
 
+from api.configs.analysis import config as analysis_config
+from api.configs.aws.s3 import config as s3_config
+from api.service.aws.s3 import get_aligned_script_cache_url, get_raw_stt_save_url
+from api.data.async_client import AsyncSpeechDatabaseClient
 from api.data.client import SpeechDatabaseClient, AudioSegmentDatabaseClient
-from api.data.shortcuts import get_object_or_404
+from api.data.shortcuts import get_object_or_404, get_object_or_404_async
+from api.data.stt import SttSegment, decode_stt_script, decode_stt_segments
 from api.data.tables import Speech, AudioSegment
 from api.data.enums import AnalysisRecordType
 
 from api.service.analysis_record import AnalysisRecordService
+from api.service.metrics_service import Gauge, pipeline_metrics, registry
+from api.service.tracing_service import (
+    extract_traceparent,
+    inject_traceparent,
+    tracer,
+)
+from api.service.analysis2_service import (
+    Analysis2Result,
+    IncrementalAnalysis2,
+    analyze_stt_script,
+)
+from api.utils import compression
 
-from api.service.aws.s3 import S3Service
+from api.service.storage import get_storage_service
 from api.service.speech import SpeechService
 from api.service.ffmpeg_service import (
     merge_webm_files_binary_concat,
-    wav_to_mp3,
+    wav_to_mp3_stream,
     webm_to_wav,
 )
 from api.service.clova_service import clova_stt_send
@@ -27,25 +47,113 @@ from api.service.audio_analysis_service import (
     get_f0_analysis,
     get_f0_average_analysis,
 )
-from api.service.speech_correction_symbol_service import get_speech_correction
-from api.service.stt_analysis_service import (
-    get_average_lpm,
-    get_lpm_by_sentence_v2,
-    get_lpm_heatmap,
-    get_ptl_ratio,
-    get_ptl_by_sentence,
-)
 
 app = FastAPI()
 
 
 speech_db_client = SpeechDatabaseClient()
+async_speech_db_client = AsyncSpeechDatabaseClient()
 audio_segment_db_client = AudioSegmentDatabaseClient()
 
 analysis_record_service = AnalysisRecordService()
-s3_service = S3Service()
+storage_service = get_storage_service()
 speech_service = SpeechService()
 
+# 분석과 별개로 수행해도 되는 저장 작업(원본 STT 결과 보관 등)을 처리
+persist_executor = ThreadPoolExecutor(max_workers=4)
+
+
+class IncrementalAnalysis2Session:
+    """
+    점진 분석(analysis-2 segments) 중인 speech의 상태
+    상태는 process memory에 있으므로, 같은 speech의 요청은 같은 worker process로 보내야 한다.
+    마지막 요청 이후 incremental_session_ttl이 지나거나 보관 개수를 넘으면 제거된다.
+    """
+
+    def __init__(
+        self, target_speech: Speech, traceparent: Optional[str] = None
+    ) -> None:
+        self.target_speech = target_speech
+        # 첫 segment 요청으로 받은 trace context (이후 segment / 완료 처리를 같은 trace로 기록)
+        self.traceparent = traceparent
+        self.analysis = IncrementalAnalysis2(speech_service)
+        # segment 추가 / 완료 처리를 순서대로 수행하기 위한 lock
+        self.lock = Lock()
+        # 중간 결과 업로드가 늦게 끝나 최신 결과를 덮어쓰지 않도록, 몇 번째 추가의 결과인지 기록
+        self.append_count = 0
+        self.published_count = 0
+        self.publish_lock = Lock()
+        # 다음 segment 요청이 시작해야 할 segment index (지금까지 받은 segment 수)
+        self.segment_count = 0
+        # 완료 처리가 진행 중인지 여부 (실패하면 다시 완료할 수 있도록 상태를 남겨둠)
+        self.completing = False
+        self.last_touched = time.monotonic()
+
+    def touch(self) -> None:
+        self.last_touched = time.monotonic()
+
+
+# (presentation id, speech id) -> 점진 분석 상태
+incremental_sessions: Dict[Tuple[int, int], IncrementalAnalysis2Session] = {}
+incremental_sessions_lock = Lock()
+incremental_sessions_gauge: Gauge = registry.register(
+    Gauge("wasak_incremental_sessions", "memory에 보관 중인 점진 분석 상태 수")
+)
+
+
+def expire_incremental_sessions(reserve: int = 0) -> None:
+    """
+    _summary_
+        마지막 요청 이후 incremental_session_ttl이 지난 점진 분석 상태를 제거하고,
+        보관 개수가 (incremental_session_max_count - reserve)를 넘으면 가장 오래 요청이 없던 상태부터 제거한다.
+        incremental_sessions_lock을 잡은 상태에서 호출해야 한다.
+
+    Args:
+        reserve (int): 새로 추가할 상태 수
+    """
+    now = time.monotonic()
+    expired = [
+        key
+        for key, session in incremental_sessions.items()
+        if now - session.last_touched > analysis_config.incremental_session_ttl
+    ]
+    overflow = (
+        len(incremental_sessions)
+        - len(expired)
+        + reserve
+        - analysis_config.incremental_session_max_count
+    )
+    if overflow > 0:
+        remaining = sorted(
+            (key for key in incremental_sessions if key not in expired),
+            key=lambda key: incremental_sessions[key].last_touched,
+        )
+        expired.extend(remaining[:overflow])
+
+    for key in expired:
+        del incremental_sessions[key]
+        print("[LOG] 점진 분석 상태 만료", key)
+    incremental_sessions_gauge.set(value=len(incremental_sessions))
+
+
+def remove_incremental_session(
+    key: Tuple[int, int], session: IncrementalAnalysis2Session
+) -> None:
+    # 만료 후 같은 speech의 새 상태가 생겼을 수 있으므로 같은 상태인 경우에만 제거
+    with incremental_sessions_lock:
+        if incremental_sessions.get(key) is session:
+            del incremental_sessions[key]
+        incremental_sessions_gauge.set(value=len(incremental_sessions))
+
+
+def check_incremental_analysis_enabled() -> None:
+    # prefork 모드에서 worker가 2개 이상이면 같은 speech의 요청이 서로 다른 process로 전달되므로 사용할 수 없음
+    if not analysis_config.incremental_analysis_enabled:
+        raise HTTPException(
+            status_code=503,
+            detail="Incremental analysis is disabled (requests for a speech must reach the same process)",
+        )
+
 
 class Analysis1Dto(BaseModel):
     """
@@ -61,7 +169,13 @@ class Analysis1Dto(BaseModel):
     download_url: str
 
 
-def analysis1_async_wrapper(presentation_id: int, speech_id: int, dto: Analysis1Dto):
+@pipeline_metrics.track_job("analysis-1")
+def analysis1_async_wrapper(
+    presentation_id: int,
+    speech_id: int,
+    dto: Analysis1Dto,
+    traceparent: Optional[str] = None,
+):
     """
     ## STT 결과가 필요 없는 음성 분석 수행
     1. DB에서 speech_id에 물려있는 audio_segments의 S3 경로들을 가져온다.
@@ -71,179 +185,524 @@ def analysis1_async_wrapper(presentation_id: int, speech_id: int, dto: Analysis1
     4-2. wav파일로 f0 Analysis
     4-3. wav파일로 dB Analysis
     4-4. wav -> mp3 변환
-        4-4-1. 변환된 mp3파일 S3 업로드
-        4-4-2. 변환된 mp3파일 삭제
+        4-4-1. 변환되는 대로 mp3 stream을 S3에 multipart 업로드
     5. 모든 작업 후 wav 파일 삭제
+
+    traceparent가 주어지면 그 trace에 이어서 기록하고, Clova의 callback_url로 trace context를 전달한다.
     """
 
-    try:
-        # tempfile 라이브러리 사용, pathlib로 경로 관리
-        tmp_dir_context = tempfile.TemporaryDirectory()
-        tmp_dir_path = Path(tmp_dir_context.name)
+    with tracer.start_trace(
+        "analysis-1", traceparent, presentation_id=presentation_id, speech_id=speech_id
+    ):
+        try:
+            # tempfile 라이브러리 사용, pathlib로 경로 관리
+            tmp_dir_context = tempfile.TemporaryDirectory()
+            tmp_dir_path = Path(tmp_dir_context.name)
+
+            # 1. DB에서 speech_id에 물려있는 audio_segments의 S3 경로들을 가져온다.
+            with pipeline_metrics.stage("analysis-1", "db_select"):
+                target_speech: Speech = get_object_or_404(
+                    speech_db_client,
+                    [
+                        Speech.presentation_id.bool_op("=")(presentation_id),
+                        Speech.id.bool_op("=")(speech_id),
+                    ],
+                )
+
+                audio_segments: List[
+                    AudioSegment
+                ] = audio_segment_db_client.select_audio_segments_of(target_speech)
+
+            # speech column 변경 사항은 모았다가 한 번에 반영한다.
+            speech_update = speech_service.begin_update(target_speech)
+
+            # 2. S3에서 해당 경로들의 파일들을 다운로드한다.
+            audio_segment_file_paths = []
+
+            with pipeline_metrics.stage("analysis-1", "download"):
+                for audio_segment in audio_segments:
+                    key = audio_segment.get_key()
+                    file_path = tmp_dir_path / key
+                    audio_segment_file_paths.append(str(file_path))
+                    storage_service.download_object(
+                        audio_segment.get_full_path(), file_path
+                    )
+
+            # key의 맨 앞자리에 timestamp가 들어 있으므로 정렬함
+            audio_segment_file_paths.sort()
+
+            # 3. 해당 파일들을 하나의 webm으로 합친 후에 wav로 변환
+            with pipeline_metrics.stage("analysis-1", "merge"):
+                merged_webm_file_path = merge_webm_files_binary_concat(
+                    audio_segment_file_paths
+                )
+            with pipeline_metrics.stage("analysis-1", "ffmpeg_wav"):
+                target_wav_file_path = webm_to_wav(merged_webm_file_path)
+            merged_webm_file_path.unlink()
+
+            # 4. 병합된 wav 파일을 mp3로 변환하면서 변환된 부분부터 바로 S3에 업로드한다.
+            with pipeline_metrics.stage("analysis-1", "ffmpeg_mp3_upload"):
+                with wav_to_mp3_stream(target_wav_file_path) as mp3_stream:
+                    url = storage_service.upload_stream(
+                        mp3_stream, dto.upload_key, content_type="audio/mpeg"
+                    )
+            full_audio_path = dto.download_url.split("?")[0]
+            speech_service.update_full_audio_s3_url(
+                target_speech, full_audio_path, unit_of_work=speech_update
+            )
+
+            # 분석 결과들은 모았다가 한 번에 저장한다.
+            analysis_results = []
+
+            # 4-2. wav파일로 f0(Hz) Analysis
+            with pipeline_metrics.stage("analysis-1", "pyin"):
+                result = get_f0_analysis(target_wav_file_path)
+            analysis_results.append((AnalysisRecordType.HERTZ, result))
+
+            # 4-3. wav파일로 dB Analysis
+            with pipeline_metrics.stage("analysis-1", "stft"):
+                result = get_db_analysis(target_wav_file_path)
+            analysis_results.append((AnalysisRecordType.DECIBEL, result))
+
+            # 4-4. wav파일로 f0(Hz) average analysis
+            with pipeline_metrics.stage("analysis-1", "pyin_average"):
+                f0_average_result = get_f0_average_analysis(target_wav_file_path)
+            speech_service.update_analysis_info(
+                target_speech, "avgf0", f0_average_result, unit_of_work=speech_update
+            )
+            analysis_results.append((AnalysisRecordType.HERTZ_AVG, f0_average_result))
+
+            with pipeline_metrics.stage("analysis-1", "save_results"):
+                analysis_record_service.save_analysis_results(
+                    presentation_id, speech_id, analysis_results
+                )
+                speech_update.flush()
+
+            with pipeline_metrics.stage("analysis-1", "clova_submit"):
+                # STT 결과로 수행하는 analysis-2가 같은 trace로 기록되도록 callback_url에 trace context를 전달
+                callback_url = inject_traceparent(
+                    dto.callback_url, tracer.get_traceparent()
+                )
+                clova_result = clova_stt_send(dto.download_url, callback_url)
+            if not clova_result:
+                raise Exception("STT Failed", clova_result)
+
+            # 5. 모든 작업 후 wav 파일 삭제
+            target_wav_file_path.unlink()
+
+        except Exception as e:
+            pipeline_metrics.fail_job()
+            tracer.record_exception(e)
+            # TODO: Advanced error handling
+            print("Error Occurred: ", (e))
+            print(e.__traceback__)
+
+        finally:
+            tmp_dir_context.cleanup()
 
-        # 1. DB에서 speech_id에 물려있는 audio_segments의 S3 경로들을 가져온다.
-        target_speech: Speech = get_object_or_404(
-            speech_db_client,
-            [
-                Speech.presentation_id.bool_op("=")(presentation_id),
-                Speech.id.bool_op("=")(speech_id),
-            ],
-        )
 
-        audio_segments: List[
-            AudioSegment
-        ] = audio_segment_db_client.select_audio_segments_of(target_speech)
-
-        # 2. S3에서 해당 경로들의 파일들을 다운로드한다.
-        audio_segment_file_paths = []
-
-        for audio_segment in audio_segments:
-            key = audio_segment.get_key()
-            file_path = tmp_dir_path / key
-            audio_segment_file_paths.append(str(file_path))
-            s3_service.download_object(audio_segment.get_full_path(), file_path)
-
-        # key의 맨 앞자리에 timestamp가 들어 있으므로 정렬함
-        audio_segment_file_paths.sort()
-
-        # 3. 해당 파일들을 하나의 webm으로 합친 후에 wav로 변환
-        merged_webm_file_path = merge_webm_files_binary_concat(audio_segment_file_paths)
-        target_wav_file_path = webm_to_wav(merged_webm_file_path)
-        merged_webm_file_path.unlink()
-
-        # 4. 병합된 wav 파일을 mp3로 변환하여 S3에 업로드한다.
-        mp3_path = wav_to_mp3(target_wav_file_path)
-        url = s3_service.upload_object(mp3_path, dto.upload_key)
-        full_audio_path = dto.download_url.split("?")[0]
-        speech_service.update_full_audio_s3_url(target_speech, full_audio_path)
-        mp3_path.unlink()
-
-        # 4-2. wav파일로 f0(Hz) Analysis
-        result = get_f0_analysis(target_wav_file_path)
-        analysis_record_service.save_analysis_result(
-            presentation_id, speech_id, AnalysisRecordType.HERTZ, result
-        )
+@app.post("/{presentation_id}/speech/{speech_id}/analysis-1")
+def trigger_analysis_1(
+    presentation_id: int,
+    speech_id: int,
+    dto: Analysis1Dto,
+    request: Request,
+    background_tasks: BackgroundTasks,
+):
+    pipeline_metrics.enqueue("analysis-1")
+    background_tasks.add_task(
+        analysis1_async_wrapper,
+        presentation_id,
+        speech_id,
+        dto,
+        extract_traceparent(request.headers, request.query_params),
+    )
+    return "success"
+
+
+def run_analysis_2(
+    presentation_id: int,
+    speech_id: int,
+    stt_script: Any,
+    target_speech: Optional[Speech] = None,
+):
+    """
+    _summary_
+        STT 결과 객체로 analysis-2를 수행하고 결과를 저장한다.
+
+    Args:
+        presentation_id (int): presentation id
+        speech_id (int): speech id
+        stt_script (Any): Clova STT 결과 (역직렬화된 객체)
+        target_speech (Optional[Speech]): 이미 조회한 speech entity (없으면 DB에서 조회)
+    """
+    # 0. DB에 정보 저장 위해서 speech entity 불러옴
+    if target_speech is None:
+        with pipeline_metrics.stage("analysis-2", "db_select"):
+            target_speech = get_object_or_404(
+                speech_db_client,
+                [
+                    Speech.presentation_id.bool_op("=")(presentation_id),
+                    Speech.id.bool_op("=")(speech_id),
+                ],
+            )
+
+    # 2 ~ 4. 문장 재조합, 휴지 / LPM 분석 및 서버 교정 부호 생성
+    analysis_result = analyze_stt_script(
+        stt_script,
+        speech_service,
+        get_aligned_script_cache_url(presentation_id, speech_id),
+    )
 
-        # 4-3. wav파일로 dB Analysis
-        result = get_db_analysis(target_wav_file_path)
-        analysis_record_service.save_analysis_result(
-            presentation_id, speech_id, AnalysisRecordType.DECIBEL, result
+    save_analysis_2_result(presentation_id, speech_id, analysis_result, target_speech)
+
+
+def save_analysis_2_result(
+    presentation_id: int,
+    speech_id: int,
+    analysis_result: Analysis2Result,
+    target_speech: Speech,
+):
+    speech_update = speech_service.begin_update(target_speech)
+    for analysis_type, data in analysis_result.speech_info.items():
+        speech_service.update_analysis_info(
+            target_speech, analysis_type, data, unit_of_work=speech_update
         )
 
-        # 4-4. wav파일로 f0(Hz) average analysis
-        f0_average_result = get_f0_average_analysis(target_wav_file_path)
-        speech_service.update_analysis_info(target_speech, "avgf0", f0_average_result)
-        analysis_record_service.save_analysis_result(
-            presentation_id, speech_id, AnalysisRecordType.HERTZ_AVG, f0_average_result
+    # 5. 분석 결과 및 speech 정보 저장
+    with pipeline_metrics.stage("analysis-2", "save_results"):
+        analysis_record_service.save_analysis_results(
+            presentation_id, speech_id, analysis_result.records
         )
+        speech_update.flush()
+
 
-        clova_result = clova_stt_send(dto.download_url, dto.callback_url)
-        if not clova_result:
-            raise Exception("STT Failed", clova_result)
+@pipeline_metrics.track_job("analysis-2")
+def analysis2_async_wrapper(
+    presentation_id: int, speech_id: int, traceparent: Optional[str] = None
+):
+    """
+    ## STT 결과가 필요한 음성 분석 수행
+    1. S3에서 p.id / s.id로 STT 결과 json을 받아온다.
+    2-1. 휴지 분석 수행
+    2-2. LPM 분석 수행
+    """
+    with tracer.start_trace(
+        "analysis-2", traceparent, presentation_id=presentation_id, speech_id=speech_id
+    ):
+        # 1. S3에서 p.id / s.id로 STT 결과 json을 받아온다.
+        stt_key = f"{presentation_id}/{speech_id}/analysis/STT.json"
+        with pipeline_metrics.stage("analysis-2", "stt_download"):
+            stt_script = storage_service.download_json_object(stt_key)
 
-        # 5. 모든 작업 후 wav 파일 삭제
-        target_wav_file_path.unlink()
+        run_analysis_2(presentation_id, speech_id, stt_script)
 
+
+def persist_raw_stt(presentation_id: int, speech_id: int, stt_body: bytes):
+    try:
+        content_encoding, level = s3_config.get_json_compression(
+            AnalysisRecordType.STT.value
+        )
+        # 이미 JSON bytes이므로 재직렬화 없이 그대로 업로드
+        storage_service.upload_json_object(
+            get_raw_stt_save_url(presentation_id, speech_id),
+            stt_body,
+            content_encoding=content_encoding,
+            compression_level=level,
+        )
     except Exception as e:
-        # TODO: Advanced error handling
-        print("Error Occurred: ", (e))
-        print(e.__traceback__)
+        print("[ERROR] 원본 STT 결과 저장 실패", presentation_id, speech_id, repr(e))
 
-    finally:
-        tmp_dir_context.cleanup()
+
+@pipeline_metrics.track_job("analysis-2")
+def analysis2_from_stt_wrapper(
+    presentation_id: int,
+    speech_id: int,
+    stt_script: Any,
+    stt_body: bytes,
+    target_speech: Speech,
+    traceparent: Optional[str] = None,
+):
+    """
+    ## 요청으로 받은 STT 결과로 음성 분석 수행
+    원본 STT 결과 저장은 분석과 동시에 별도 thread에서 수행한다.
+    """
+    persist_executor.submit(persist_raw_stt, presentation_id, speech_id, stt_body)
+    with tracer.start_trace(
+        "analysis-2", traceparent, presentation_id=presentation_id, speech_id=speech_id
+    ):
+        run_analysis_2(presentation_id, speech_id, stt_script, target_speech)
 
 
-@app.post("/{presentation_id}/speech/{speech_id}/analysis-1")
-def trigger_analysis_1(
+@app.post("/{presentation_id}/speech/{speech_id}/analysis-2")
+def trigger_analysis_2(
     presentation_id: int,
     speech_id: int,
-    dto: Analysis1Dto,
+    request: Request,
     background_tasks: BackgroundTasks,
 ):
-    background_tasks.add_task(analysis1_async_wrapper, presentation_id, speech_id, dto)
+    """
+    ## S3에 저장된 STT 결과로 analysis-2 수행
+    analysis-1이 callback_url에 실어 보낸 traceparent를 header 또는 query parameter로 전달하면 같은 trace로 기록한다.
+    """
+    pipeline_metrics.enqueue("analysis-2")
+    background_tasks.add_task(
+        analysis2_async_wrapper,
+        presentation_id,
+        speech_id,
+        extract_traceparent(request.headers, request.query_params),
+    )
     return "success"
 
 
-def analysis2_async_wrapper(presentation_id: int, speech_id: int):
+async def read_stt_body(request: Request) -> bytes:
+    # 본문을 chunk 단위로 받아 이어 붙임 (chunked transfer encoding 업로드 포함)
+    chunks = []
+    async for chunk in request.stream():
+        chunks.append(chunk)
+    body = b"".join(chunks)
+
+    try:
+        return compression.decompress(body, request.headers.get("content-encoding"))
+    except (OSError, ValueError) as e:
+        raise HTTPException(status_code=400, detail=f"Invalid STT payload: {e}")
+
+
+@app.post("/{presentation_id}/speech/{speech_id}/analysis-2/stt")
+async def ingest_stt_result(
+    presentation_id: int,
+    speech_id: int,
+    request: Request,
+    background_tasks: BackgroundTasks,
+):
     """
-    ## STT 결과가 필요한 음성 분석 수행
-    1. S3에서 p.id / s.id로 STT 결과 json을 받아온다.
-    2-1. 휴지 분석 수행
-    2-2. LPM 분석 수행
+    ## STT 결과를 직접 받아 analysis-2 수행
+    S3에 STT.json을 저장한 뒤 다시 내려받는 과정 없이, 요청 본문의 STT 결과로 바로 분석을 시작한다.
+    본문은 Clova STT 결과 JSON이며, Content-Encoding(gzip, zstd)으로 압축하여 보낼 수 있다.
     """
-    # 0. DB에 정보 저장 위해서 speech entity 불러옴
-    target_speech: Speech = get_object_or_404(
-        speech_db_client,
+    target_speech: Speech = await get_object_or_404_async(
+        async_speech_db_client,
         [
             Speech.presentation_id.bool_op("=")(presentation_id),
             Speech.id.bool_op("=")(speech_id),
         ],
     )
 
-    # 1. S3에서 p.id / s.id로 STT 결과 json을 받아온다.
-    stt_key = f"{presentation_id}/{speech_id}/analysis/STT.json"
-    stt_script = s3_service.download_json_object(stt_key)
-    if not isinstance(stt_script, dict):
-        stt_script = json.loads(stt_script)
-
-    # 2. STT 결과를 kiwi를 이용하여 문장 별로 분할하여 재조합한다.
-    concatenated_script = speech_service.get_aligned_script(stt_script)
-    analysis_record_service.save_analysis_result(
-        presentation_id, speech_id, AnalysisRecordType.STT, concatenated_script
-    )
-
-    # 3-1. 문장 간 휴지 분석 수행
-    ptl_result = get_ptl_by_sentence(concatenated_script)
-    analysis_record_service.save_analysis_result(
-        presentation_id, speech_id, AnalysisRecordType.PAUSE, ptl_result
-    )
-    print("[LOG] 3-1. 문장 간 휴지 분석 수행 완료")
+    stt_body = await read_stt_body(request)
+    try:
+        stt_script = decode_stt_script(stt_body)
+    except msgspec.DecodeError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid STT payload: {e}")
 
-    # 3-2. LPM 분석 수행
-    lpm_result = get_lpm_by_sentence_v2(concatenated_script)
-    analysis_record_service.save_analysis_result(
-        presentation_id, speech_id, AnalysisRecordType.LPM, lpm_result
+    pipeline_metrics.enqueue("analysis-2")
+    background_tasks.add_task(
+        analysis2_from_stt_wrapper,
+        presentation_id,
+        speech_id,
+        stt_script,
+        stt_body,
+        target_speech,
+        extract_traceparent(request.headers, request.query_params),
     )
-    print("[LOG] 3-2. LPM 분석 수행 완료")
+    return "success"
 
-    # 3-3. 휴지 비율 분석 수행
-    ptl_ratio_result = get_ptl_ratio(concatenated_script)
-    analysis_record_service.save_analysis_result(
-        presentation_id, speech_id, AnalysisRecordType.PAUSE_RATIO, ptl_ratio_result
-    )
-    speech_service.update_analysis_info(target_speech, "pause_ratio", ptl_ratio_result)
-    print("[LOG] 3-3. 휴지 비율 분석 수행 완료")
 
-    # 3-4. Average LPM 분석 수행
-    avg_lpm_result = get_average_lpm(concatenated_script)
-    analysis_record_service.save_analysis_result(
-        presentation_id, speech_id, AnalysisRecordType.LPM_AVG, avg_lpm_result
-    )
-    speech_service.update_analysis_info(target_speech, "avglpm", avg_lpm_result)
-
-    print("[LOG] 3-4. Average LPM 분석 수행 완료")
+def append_incremental_segments(
+    session: IncrementalAnalysis2Session,
+    segments: Tuple[SttSegment, ...],
+    offset: int,
+) -> Tuple[int, int, Analysis2Result]:
+    """
+    _summary_
+        segment들을 이어 붙여 분석한다. offset이 지금까지 받은 segment 수와 다르면(누락, 중복, 순서 뒤바뀜) 거부한다.
 
-    # 4. 서버 교정 부호 생성
-    speech_correction_result = get_speech_correction(
-        lpm_result, ptl_result, concatenated_script
+    Returns:
+        Tuple[int, int, Analysis2Result]: (몇 번째 추가인지, 확정된 문장 수, 중간 분석 결과)
+    """
+    with session.lock:
+        session.touch()
+        if session.analysis.finished or session.completing:
+            raise HTTPException(status_code=409, detail="Analysis already completed")
+        if offset != session.segment_count:
+            raise HTTPException(
+                status_code=409,
+                detail=f"Expected segment offset {session.segment_count}",
+            )
+
+        with tracer.start_trace(
+            "analysis-2.segments",
+            session.traceparent,
+            presentation_id=session.target_speech.presentation_id,
+            speech_id=session.target_speech.id,
+        ) as span:
+            if span is not None:
+                span.set_attribute("segment_count", len(segments))
+            analysis_result = session.analysis.append_segments(segments)
+        session.segment_count += len(segments)
+        session.append_count += 1
+        return session.append_count, session.analysis.sentence_count, analysis_result
+
+
+def publish_partial_analysis_2(
+    presentation_id: int,
+    speech_id: int,
+    session: IncrementalAnalysis2Session,
+    append_count: int,
+    analysis_result: Analysis2Result,
+):
+    with session.publish_lock:
+        # 이후에 추가된 segment들의 결과가 이미 업로드된 경우 건너뜀
+        if append_count <= session.published_count:
+            return
+
+        try:
+            analysis_record_service.publish_partial_results(
+                presentation_id, speech_id, analysis_result.records
+            )
+            session.published_count = append_count
+        except Exception as e:
+            print("[ERROR] 중간 분석 결과 저장 실패", presentation_id, speech_id, repr(e))
+
+
+@app.post("/{presentation_id}/speech/{speech_id}/analysis-2/segments")
+async def append_stt_segments(
+    presentation_id: int,
+    speech_id: int,
+    offset: int,
+    request: Request,
+    background_tasks: BackgroundTasks,
+):
+    """
+    ## STT 결과를 segment 단위로 받아 점진적으로 analysis-2 수행
+    본문은 `{"segments": [...]}` 형태의 Clova STT segment 목록이며, 도착한 순서대로 이어 붙여 분석한다.
+    `offset` query parameter로 본문의 첫 segment가 전체에서 몇 번째 segment인지(지금까지 보낸 segment 수) 보내야 하며,
+    순서가 맞지 않으면(누락, 중복 전송 등) 409를 반환한다. 첫 요청의 offset은 0이다.
+    확정되지 않은 뒷부분 문장들만 다시 분석하고, 중간 결과는 `analysis/partial/` 아래에 업로드한다.
+    모든 segment를 보낸 뒤에는 `/analysis-2/segments/complete`를 호출해야 최종 결과가 저장된다.
+    점진 분석 상태는 process memory에 있으므로, 같은 speech의 요청은 같은 process로 보내야 한다. (sticky routing)
+    """
+    check_incremental_analysis_enabled()
+    stt_body = await read_stt_body(request)
+    try:
+        segments = decode_stt_segments(stt_body).segments
+    except msgspec.DecodeError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid STT payload: {e}")
+
+    key = (presentation_id, speech_id)
+    with incremental_sessions_lock:
+        expire_incremental_sessions()
+        session = incremental_sessions.get(key)
+    if session is None:
+        # 만료되었거나 다른 worker process에서 시작된 점진 분석은 이어갈 수 없음
+        if offset != 0:
+            raise HTTPException(status_code=409, detail="Expected segment offset 0")
+        target_speech: Speech = await get_object_or_404_async(
+            async_speech_db_client,
+            [
+                Speech.presentation_id.bool_op("=")(presentation_id),
+                Speech.id.bool_op("=")(speech_id),
+            ],
+        )
+        with incremental_sessions_lock:
+            if key not in incremental_sessions:
+                expire_incremental_sessions(reserve=1)
+            session = incremental_sessions.setdefault(
+                key,
+                IncrementalAnalysis2Session(
+                    target_speech,
+                    extract_traceparent(request.headers, request.query_params),
+                ),
+            )
+            incremental_sessions_gauge.set(value=len(incremental_sessions))
+
+    # 문장 분리 / 분석은 CPU 작업이므로 event loop 밖에서 수행
+    append_count, sentence_count, analysis_result = await run_in_threadpool(
+        append_incremental_segments, session, segments, offset
     )
-    analysis_record_service.save_analysis_result(
+    background_tasks.add_task(
+        publish_partial_analysis_2,
         presentation_id,
         speech_id,
-        AnalysisRecordType.SPEECH_CORRECTION,
-        speech_correction_result,
+        session,
+        append_count,
+        analysis_result,
     )
-    speech_service.update_analysis_info(
-        target_speech,
-        "feedback_count",
-        reduce(lambda acc, cur: acc + len(cur), speech_correction_result.values(), 0),
-    )
-    print("[LOG] 4. 서버 교정 부호 생성 완료")
 
+    return {
+        "sentence_count": sentence_count,
+        "speech_info": analysis_result.speech_info,
+    }
 
-@app.post("/{presentation_id}/speech/{speech_id}/analysis-2")
-def trigger_analysis_2(
-    presentation_id: int, speech_id: int, background_tasks: BackgroundTasks
+
+@pipeline_metrics.track_job("analysis-2")
+def complete_incremental_analysis_2(
+    presentation_id: int,
+    speech_id: int,
+    session: IncrementalAnalysis2Session,
+    stt_metadata: Optional[Dict[str, Any]],
+    traceparent: Optional[str] = None,
 ):
-    background_tasks.add_task(analysis2_async_wrapper, presentation_id, speech_id)
+    try:
+        with tracer.start_trace(
+            "analysis-2",
+            traceparent,
+            presentation_id=presentation_id,
+            speech_id=speech_id,
+        ):
+            with session.lock:
+                analysis_result = session.analysis.finish(stt_metadata)
+
+            save_analysis_2_result(
+                presentation_id, speech_id, analysis_result, session.target_speech
+            )
+    except Exception:
+        # 지금까지 받은 segment들을 잃지 않도록 상태를 남겨두어 완료를 다시 요청할 수 있게 함
+        session.completing = False
+        session.touch()
+        raise
+
+    remove_incremental_session((presentation_id, speech_id), session)
+
+
+@app.post("/{presentation_id}/speech/{speech_id}/analysis-2/segments/complete")
+def complete_stt_segments(
+    presentation_id: int,
+    speech_id: int,
+    request: Request,
+    background_tasks: BackgroundTasks,
+    stt_metadata: Optional[Dict[str, Any]] = Body(default=None),
+):
+    """
+    ## 점진 분석 완료
+    남은 문장들을 확정하여 최종 결과를 저장한다. 결과는 STT 결과 전체로 analysis-2를 수행한 결과와 같다.
+    본문으로 STT 결과의 segments 외의 값들(result, token 등)을 보내면 STT 결과와 함께 저장한다. (text, segments는 무시)
+    완료 처리가 실패하면 점진 분석 상태가 남아 있으므로 다시 요청할 수 있다.
+    평균 LPM은 Clova의 전체 텍스트("text") 대신 받은 segment 텍스트들의 글자 수로 계산하므로,
+    전체 텍스트가 segment 텍스트들을 이어 붙인 것과 다른 STT 결과는 `/analysis-2/stt`로 분석한 결과와 평균 LPM이 다르다.
+    """
+    check_incremental_analysis_enabled()
+    with incremental_sessions_lock:
+        expire_incremental_sessions()
+        session = incremental_sessions.get((presentation_id, speech_id))
+        if session is None:
+            raise HTTPException(
+                status_code=404, detail="Incremental analysis not found"
+            )
+        if session.completing:
+            raise HTTPException(
+                status_code=409, detail="Analysis completion already in progress"
+            )
+        session.completing = True
+        session.touch()
+
+    pipeline_metrics.enqueue("analysis-2")
+    background_tasks.add_task(
+        complete_incremental_analysis_2,
+        presentation_id,
+        speech_id,
+        session,
+        stt_metadata,
+        extract_traceparent(request.headers, request.query_params)
+        or session.traceparent,
+    )
     return "success"
@@ -0,0 +1,106 @@
+from typing import Any, Dict, List, Optional, TypeVar
+from sqlalchemy import BinaryExpression, select, update
+from sqlalchemy.exc import NoResultFound
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+
+from api.configs import db
+from api.data.engine import engine_registry
+from api.data.tables import AnalysisRecord, AudioSegment, Speech
+
+
+T = TypeVar("T")
+
+
+class AsyncDatabaseClient:
+    """
+    `DatabaseClient`의 asyncio 버전 (aiomysql 사용)
+    이벤트 루프 위에서 동작하는 request handler에서 threadpool을 점유하지 않고 DB에 접근할 때 사용한다.
+    """
+
+    def __init__(self, table_class: T) -> None:
+        self.config: db.DatabaseConfigs = db.config
+        self.table_class = table_class
+
+    @property
+    def engine(self) -> AsyncEngine:
+        return engine_registry.get_async_engine()
+
+    def get_session(self) -> AsyncSession:
+        return engine_registry.get_async_session()
+
+    async def select_all(self) -> List[T]:
+        async with self.get_session() as session:
+            result = await session.execute(select(self.table_class))
+            return list(result.scalars().all())
+
+    async def conditional_select_all(
+        self, conditions: List[BinaryExpression[bool]]
+    ) -> List[T]:
+        async with self.get_session() as session:
+            result = await session.execute(select(self.table_class).where(*conditions))
+            return list(result.scalars().all())
+
+    async def get_single(self, conditions: List[BinaryExpression[bool]]) -> Optional[T]:
+        async with self.get_session() as session:
+            result = await session.execute(select(self.table_class).where(*conditions))
+            try:
+                return result.scalars().one()
+            except NoResultFound:
+                return None
+
+    async def insert(self, vo: T) -> T:
+        vo.id = None
+
+        async with self.get_session() as session:
+            session.add(vo)
+            await session.commit()
+
+        return vo
+
+    async def update_columns(
+        self, conditions: List[BinaryExpression[bool]], values: Dict[str, Any]
+    ) -> int:
+        if not values:
+            return 0
+
+        for column in values:
+            if not hasattr(self.table_class, column):
+                raise ValueError(
+                    f"{self.table_class.__name__} has no column named '{column}'"
+                )
+
+        async with self.get_session() as session:
+            result = await session.execute(
+                update(self.table_class).where(*conditions).values(**values)
+            )
+            await session.commit()
+
+        return result.rowcount
+
+    async def update(self, vo: T) -> T:
+        async with self.get_session() as session:
+            await session.merge(vo)
+            await session.commit()
+
+        return vo
+
+
+class AsyncSpeechDatabaseClient(AsyncDatabaseClient):
+    def __init__(self) -> None:
+        super().__init__(Speech)
+
+
+class AsyncAudioSegmentDatabaseClient(AsyncDatabaseClient):
+    def __init__(self) -> None:
+        super().__init__(AudioSegment)
+
+    async def select_audio_segments_of(self, speech: Speech) -> List[AudioSegment]:
+        return await super().conditional_select_all(
+            [AudioSegment.speech_id.bool_op("=")(speech.id)]
+        )
+
+
+class AsyncAnalysisRecordDatabaseClient(AsyncDatabaseClient):
+    def __init__(self) -> None:
+        super().__init__(AnalysisRecord)
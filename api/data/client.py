@@ -1,10 +1,11 @@
-from typing import List, TypeVar, Optional
-from sqlalchemy import BinaryExpression, Engine, create_engine
+from typing import Any, Dict, Iterator, List, TypeVar, Optional
+from sqlalchemy import BinaryExpression, Engine, Select, delete, insert, select, update
 from sqlalchemy.exc import NoResultFound
-from sqlalchemy.orm import Session, scoped_session, sessionmaker
+from sqlalchemy.orm import Session
 
 
 from api.configs import db
+from api.data.engine import engine_registry
 from api.data.tables import AnalysisRecord, AudioSegment, Speech
 
 
@@ -14,13 +15,16 @@ T = TypeVar("T")
 class DatabaseClient:
     def __init__(self, table_class: T) -> None:
         self.config: db.DatabaseConfigs = db.config
-        self.engine: Engine = create_engine(
-            self.config.get_full_url(), pool_size=20, pool_recycle=500, max_overflow=20
-        )
         self.table_class = table_class
 
+    # engine과 session factory는 프로세스 내의 모든 client가 공유한다.
+    # (fork된 worker에서는 registry가 새 engine을 만들어주므로 인스턴스에 저장하지 않음)
+    @property
+    def engine(self) -> Engine:
+        return engine_registry.get_engine()
+
     def get_session(self) -> Session:
-        return scoped_session(sessionmaker(bind=self.engine))()
+        return engine_registry.get_session()
 
     def select_all(self) -> List[T]:
         session = self.get_session()
@@ -44,6 +48,103 @@ class DatabaseClient:
 
         return result
 
+    def _get_select(
+        self,
+        conditions: Optional[List[BinaryExpression[bool]]],
+        columns: Optional[List[str]],
+    ) -> Select:
+        if columns:
+            stmt = select(*[getattr(self.table_class, column) for column in columns])
+        else:
+            stmt = select(self.table_class)
+
+        if conditions:
+            stmt = stmt.where(*conditions)
+        return stmt
+
+    def iter_all(
+        self,
+        conditions: Optional[List[BinaryExpression[bool]]] = None,
+        page_size: int = 1000,
+        columns: Optional[List[str]] = None,
+    ) -> Iterator[Any]:
+        """
+        _summary_
+            server-side cursor(yield_per)로 조회 결과를 page_size개씩 받아오며 하나씩 반환한다.
+            결과 전체를 메모리에 올리지 않으므로 큰 테이블을 순회할 때 사용한다.
+            * 주의 * 순회가 끝날 때까지 커넥션 하나를 점유한다. 오래 걸리는 작업이라면 `iter_pages`를 사용할 것.
+
+        Args:
+            conditions (Optional[List[BinaryExpression[bool]]]): 조회 조건
+            page_size (int): 한 번에 DB에서 받아올 row 수
+            columns (Optional[List[str]]): 지정하면 ORM 객체 대신 해당 column들만 담은 Row를 반환
+
+        Yields:
+            T 또는 Row: 조회된 객체
+        """
+        stmt = self._get_select(conditions, columns).execution_options(
+            yield_per=page_size
+        )
+
+        session = self.get_session()
+        try:
+            result = session.execute(stmt)
+            if columns:
+                yield from result
+            else:
+                yield from result.scalars()
+        finally:
+            session.close()
+
+    def iter_pages(
+        self,
+        conditions: Optional[List[BinaryExpression[bool]]] = None,
+        page_size: int = 1000,
+        columns: Optional[List[str]] = None,
+        after_id: Optional[int] = None,
+    ) -> Iterator[List[Any]]:
+        """
+        _summary_
+            primary key(id) 기준 keyset pagination으로 조회 결과를 page 단위로 반환한다.
+            page마다 새 세션을 사용하므로 순회 중 커넥션을 점유하지 않는다.
+
+        Args:
+            conditions (Optional[List[BinaryExpression[bool]]]): 조회 조건
+            page_size (int): page 하나의 최대 row 수
+            columns (Optional[List[str]]): 지정하면 ORM 객체 대신 해당 column들만 담은 Row를 반환 ("id"는 항상 포함됨)
+            after_id (Optional[int]): 지정하면 id가 이 값보다 큰 row부터 조회 (중단된 순회를 재개할 때 사용)
+
+        Yields:
+            List[T] 또는 List[Row]: id 오름차순으로 정렬된 page
+        """
+        if columns and "id" not in columns:
+            columns = ["id", *columns]
+
+        pk = self.table_class.id
+        last_id = after_id
+
+        while True:
+            stmt = self._get_select(conditions, columns)
+            if last_id is not None:
+                stmt = stmt.where(pk > last_id)
+            stmt = stmt.order_by(pk).limit(page_size)
+
+            session = self.get_session()
+            try:
+                result = session.execute(stmt)
+                page = list(result) if columns else list(result.scalars())
+            finally:
+                session.close()
+
+            if not page:
+                return
+
+            yield page
+
+            if len(page) < page_size:
+                return
+            last_id = page[-1].id
+
     def get_single(self, conditions: List[BinaryExpression[bool]]) -> Optional[T]:
         session = self.get_session()
         _query = session.query(self.table_class)
@@ -70,6 +171,40 @@ class DatabaseClient:
 
         return vo
 
+    def bulk_insert(
+        self,
+        rows: List[Dict[str, Any]],
+        replace_conditions: Optional[List[BinaryExpression[bool]]] = None,
+    ) -> int:
+        """
+        _summary_
+            여러 row를 하나의 transaction 안에서 multi-row INSERT로 저장한다.
+
+        Args:
+            rows (List[Dict[str, Any]]): column(attribute) 이름과 값으로 구성된 row 목록
+            replace_conditions (Optional[List[BinaryExpression[bool]]]):
+                전달된 경우, 같은 transaction 안에서 해당 조건의 row를 먼저 삭제한 뒤 삽입한다. (upsert)
+
+        Returns:
+            int: 삽입된 row 수
+        """
+        if not rows:
+            return 0
+
+        session = self.get_session()
+        try:
+            with session.begin():
+                if replace_conditions:
+                    session.execute(
+                        delete(self.table_class).where(*replace_conditions),
+                        execution_options={"synchronize_session": False},
+                    )
+                session.execute(insert(self.table_class), rows)
+        finally:
+            session.close()
+
+        return len(rows)
+
     def update(self, vo: T) -> T:
         session = self.get_session()
         session.merge(vo)
@@ -78,6 +213,88 @@ class DatabaseClient:
 
         return vo
 
+    def update_columns(
+        self, conditions: List[BinaryExpression[bool]], values: Dict[str, Any]
+    ) -> int:
+        """
+        _summary_
+            조건에 맞는 row들의 특정 column들만 하나의 UPDATE 문으로 갱신한다.
+            `update`와 달리 merge를 위한 SELECT를 수행하지 않는다.
+
+        Args:
+            conditions (List[BinaryExpression[bool]]): 갱신 대상 row 조건
+            values (Dict[str, Any]): column 이름과 갱신할 값
+
+        Returns:
+            int: 갱신된 row 수
+        """
+        if not values:
+            return 0
+
+        for column in values:
+            if not hasattr(self.table_class, column):
+                raise ValueError(
+                    f"{self.table_class.__name__} has no column named '{column}'"
+                )
+
+        # 실패하면 rollback하고, 어떤 경우에도 session(과 connection)을 반환한다.
+        session = self.get_session()
+        try:
+            with session.begin():
+                result = session.execute(
+                    update(self.table_class).where(*conditions).values(**values)
+                )
+        finally:
+            session.close()
+
+        return result.rowcount
+
+    def unit_of_work(self, vo: T) -> "ColumnUpdateUnitOfWork":
+        return ColumnUpdateUnitOfWork(self, vo)
+
+
+class ColumnUpdateUnitOfWork:
+    """
+    하나의 row에 대한 column 변경 사항을 모아 두었다가 한 번의 UPDATE로 반영한다.
+
+    with 구문으로 사용하면 블록이 정상 종료될 때 flush되고, 예외가 발생하면 변경 사항은 버려진다.
+    ```
+    with client.unit_of_work(speech) as uow:
+        uow.set("avglpm", 350.0)
+        uow.set("pause_ratio", 12.5)
+    ```
+    """
+
+    def __init__(self, db_client: DatabaseClient, vo: T) -> None:
+        self.db_client = db_client
+        self.vo = vo
+        self.changes: Dict[str, Any] = {}
+
+    def set(self, column: str, value: Any) -> None:
+        # 호출자가 들고 있는 객체에도 즉시 반영하여 기존 update 방식과 동일하게 사용할 수 있도록 함
+        setattr(self.vo, column, value)
+        self.changes[column] = value
+
+    def flush(self) -> int:
+        if not self.changes:
+            return 0
+
+        table_class = self.db_client.table_class
+        updated = self.db_client.update_columns(
+            [table_class.id == self.vo.id], self.changes
+        )
+        self.changes = {}
+        return updated
+
+    def __enter__(self) -> "ColumnUpdateUnitOfWork":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is None:
+            self.flush()
+        else:
+            self.changes = {}
+
 
 class SpeechDatabaseClient(DatabaseClient):
     def __init__(self) -> None:
@@ -1,5 +1,6 @@
 from fastapi import HTTPException
 
+from api.data.async_client import AsyncDatabaseClient
 from api.data.client import DatabaseClient
 
 
@@ -10,3 +11,12 @@ def get_object_or_404(client: DatabaseClient, conditions: list):
         raise HTTPException(status_code=404, detail=f"{object_type_name} not found")
     else:
         return result
+
+
+async def get_object_or_404_async(client: AsyncDatabaseClient, conditions: list):
+    result = await client.get_single(conditions)
+    if result is None:
+        object_type_name = client.table_class().__class__.__name__
+        raise HTTPException(status_code=404, detail=f"{object_type_name} not found")
+    else:
+        return result
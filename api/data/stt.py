@@ -0,0 +1,130 @@
+from typing import Any, Dict, Iterator, Tuple, Union
+
+import msgspec
+from typing_extensions import Annotated
+
+"""
+Clova STT 결과 schema
+JSON bytes를 dict / list 대신 고정된 field를 갖는 struct로 바로 역직렬화하며, 이 과정에서 형식을 검증한다.
+분석 코드에서 사용하지 않는 field(segment의 confidence, speaker 등)는 읽지 않는다.
+
+기존 dict 기반 분석 코드와 함께 사용할 수 있도록,
+SttSegment / SttScript는 `segment["words"]`와 같이, SttWord는 `[start, end, word]` list와 같이 접근할 수 있다.
+"""
+
+Millisecond = Annotated[int, msgspec.Meta(ge=0)]
+
+
+class SttWord(msgspec.Struct, array_like=True, frozen=True, gc=False):
+    """
+    JSON에서는 [시작 millisecond, 끝 millisecond, 단어] 형태의 배열
+    """
+
+    start: Millisecond
+    end: Millisecond
+    word: str
+
+    def __post_init__(self) -> None:
+        if self.end < self.start:
+            raise ValueError(f"Word '{self.word}' ends before it starts")
+
+    def __getitem__(self, index):
+        return (self.start, self.end, self.word)[index]
+
+    def __iter__(self) -> Iterator[Union[int, str]]:
+        return iter((self.start, self.end, self.word))
+
+    def __len__(self) -> int:
+        return 3
+
+
+class _DictLikeStruct(msgspec.Struct, frozen=True):
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+
+class SttSegment(_DictLikeStruct, frozen=True, gc=False):
+    start: Millisecond
+    end: Millisecond
+    text: str
+    words: Tuple[SttWord, ...]
+
+    def __post_init__(self) -> None:
+        if self.end < self.start:
+            raise ValueError("Segment ends before it starts")
+
+
+class SttScript(_DictLikeStruct, frozen=True):
+    """
+    Clova STT 결과 (analysis-2가 문장 단위로 재조합한 결과도 같은 형식)
+    """
+
+    text: str
+    segments: Tuple[SttSegment, ...]
+
+    # 분석에는 사용하지 않지만 재조합 결과를 저장할 때 그대로 유지하는 값들
+    result: Union[str, msgspec.UnsetType] = msgspec.UNSET
+    message: Union[str, msgspec.UnsetType] = msgspec.UNSET
+    token: Union[str, msgspec.UnsetType] = msgspec.UNSET
+    version: Union[str, msgspec.UnsetType] = msgspec.UNSET
+    params: Union[Dict[str, Any], msgspec.UnsetType] = msgspec.UNSET
+    progress: Union[int, msgspec.UnsetType] = msgspec.UNSET
+    keywords: Union[Dict[str, Any], msgspec.UnsetType] = msgspec.UNSET
+    confidence: Union[float, msgspec.UnsetType] = msgspec.UNSET
+    speakers: Union[list, msgspec.UnsetType] = msgspec.UNSET
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        _summary_
+            JSON에 포함되어 있던 field들만 담은 dict로 변환한다. (segments는 struct 그대로)
+        """
+        return {
+            field: getattr(self, field)
+            for field in self.__struct_fields__
+            if getattr(self, field) is not msgspec.UNSET
+        }
+
+
+class SttSegments(msgspec.Struct, frozen=True):
+    """
+    점진 분석(analysis-2 segments)에서 받는 STT 결과의 일부
+    """
+
+    segments: Tuple[SttSegment, ...]
+
+
+_decoder = msgspec.json.Decoder(SttScript)
+_segments_decoder = msgspec.json.Decoder(SttSegments)
+
+
+def decode_stt_script(data: bytes) -> SttScript:
+    """
+    _summary_
+        Clova STT 결과 JSON을 검증하며 SttScript로 역직렬화한다.
+
+    Args:
+        data (bytes): STT 결과 JSON
+
+    Raises:
+        msgspec.ValidationError: 필수 field가 없거나 형식이 다른 경우
+        msgspec.DecodeError: JSON 형식이 아닌 경우
+
+    Returns:
+        SttScript: 역직렬화된 STT 결과
+    """
+    return _decoder.decode(data)
+
+
+def decode_stt_segments(data: bytes) -> SttSegments:
+    """
+    _summary_
+        `{"segments": [...]}` 형태의 STT segment 목록 JSON을 검증하며 역직렬화한다.
+
+    Raises:
+        msgspec.ValidationError: 필수 field가 없거나 형식이 다른 경우
+        msgspec.DecodeError: JSON 형식이 아닌 경우
+    """
+    return _segments_decoder.decode(data)
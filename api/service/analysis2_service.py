@@ -0,0 +1,320 @@
+from functools import reduce
+from itertools import chain
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+from api.configs.analysis import config as analysis_config
+from api.data.enums import AnalysisRecordType, SpeechCorrectionType
+from api.data.stt import SttScript
+from api.service.metrics_service import pipeline_metrics
+from api.service.speech import SpeechService
+from api.service.stt_metrics_service import SttMetrics, get_stt_metrics
+
+"""
+STT 결과가 필요한 음성 분석(analysis-2) 모듈
+S3 / DB 접근 없이 분석만 수행하므로 API와 재분석 배치 작업에서 함께 사용한다.
+
+STT 결과 전체를 한 번에 분석하는 analyze_stt_script와,
+STT segment가 도착하는 대로 이어서 분석하는 IncrementalAnalysis2를 제공한다.
+"""
+
+
+class Analysis2Result:
+    def __init__(self) -> None:
+        # 저장할 분석 결과 목록 (분석 종류, 분석 결과)
+        self.records: List[Tuple[AnalysisRecordType, Any]] = []
+        # Speech에 반영할 분석 정보 (column 이름, 값)
+        self.speech_info: Dict[str, Union[int, float]] = {}
+
+
+def _get_feedback_count(speech_correction: Dict[str, list]) -> int:
+    return reduce(lambda acc, cur: acc + len(cur), speech_correction.values(), 0)
+
+
+def analyze_stt_script(
+    stt_script: Union[dict, SttScript],
+    speech_service: SpeechService,
+    alignment_cache_key: Optional[str] = None,
+) -> Analysis2Result:
+    """
+    _summary_
+        STT 결과를 문장 단위로 재조합한 뒤 휴지, LPM, 교정 부호 분석을 수행한다.
+
+    Args:
+        stt_script (Union[dict, SttScript]): Clova에서 받은 STT 결과
+        speech_service (SpeechService): 문장 분리에 사용할 SpeechService
+        alignment_cache_key (Optional[str]): 문장 재조합 결과를 저장 / 재사용할 object key
+
+    Returns:
+        Analysis2Result: 저장할 분석 결과 목록과 Speech에 반영할 분석 정보
+    """
+    result = Analysis2Result()
+
+    # 2. STT 결과를 kiwi를 이용하여 문장 별로 분할하여 재조합한다.
+    with pipeline_metrics.stage("analysis-2", "align"):
+        concatenated_script = speech_service.get_aligned_script(
+            stt_script, alignment_cache_key
+        )
+    result.records.append((AnalysisRecordType.STT, concatenated_script))
+
+    # 3 ~ 4. 휴지 / LPM 분석 및 서버 교정 부호 생성 (재조합된 STT 결과를 한 번만 순회)
+    with pipeline_metrics.stage("analysis-2", "metrics"):
+        metrics = get_stt_metrics(
+            concatenated_script, lpm_correction=analysis_config.speech_correction_lpm
+        )
+
+    # 3-1. 문장 간 휴지 분석 수행
+    result.records.append((AnalysisRecordType.PAUSE, metrics.ptl_by_sentence))
+    print("[LOG] 3-1. 문장 간 휴지 분석 수행 완료")
+
+    # 3-2. LPM 분석 수행
+    result.records.append((AnalysisRecordType.LPM, metrics.word_speed))
+    print("[LOG] 3-2. LPM 분석 수행 완료")
+
+    # 3-3. 휴지 비율 분석 수행
+    result.records.append((AnalysisRecordType.PAUSE_RATIO, metrics.ptl_ratio))
+    result.speech_info["pause_ratio"] = metrics.ptl_ratio
+    print("[LOG] 3-3. 휴지 비율 분석 수행 완료")
+
+    # 3-4. Average LPM 분석 수행
+    result.records.append((AnalysisRecordType.LPM_AVG, metrics.average_lpm))
+    result.speech_info["avglpm"] = metrics.average_lpm
+    print("[LOG] 3-4. Average LPM 분석 수행 완료")
+
+    # 4. 서버 교정 부호 생성
+    result.records.append(
+        (AnalysisRecordType.SPEECH_CORRECTION, metrics.speech_correction)
+    )
+    result.speech_info["feedback_count"] = _get_feedback_count(
+        metrics.speech_correction
+    )
+    print("[LOG] 4. 서버 교정 부호 생성 완료")
+
+    return result
+
+
+# [첫 단어 index, 마지막 단어 index] 형태로 표시하는 교정 부호
+_RANGE_CORRECTION_TYPES = (
+    SpeechCorrectionType.TOO_FAST.value,
+    SpeechCorrectionType.TOO_SLOW.value,
+)
+
+
+def _get_paused_time_in_segment(segment: dict) -> int:
+    words = segment["words"]
+    return sum(words[i + 1][0] - words[i][1] for i in range(len(words) - 1))
+
+
+class _SentenceMetrics:
+    """
+    문장 단위로 재조합된 segment들과 그 분석 결과를 누적한다.
+    문장을 이어 붙일 때는 기존의 마지막 문장을 문맥으로 포함하여 새 문장들만 분석하므로,
+    결과는 전체 문장을 한 번에 get_stt_metrics로 분석한 결과와 같다. (평균 LPM 제외)
+    """
+
+    def __init__(self, lpm_correction: bool) -> None:
+        self.lpm_correction = lpm_correction
+        self.segments: List[dict] = []
+        self.word_count = 0
+
+        self.ptl_by_sentence: List[int] = []
+        self.word_speed: List[int] = []
+        self.paused_time = 0
+        self.speech_correction: Dict[str, list] = {
+            correction_type.value: [] for correction_type in SpeechCorrectionType
+        }
+
+    def extend(self, segments: List[dict]) -> "_SentenceMetrics":
+        """
+        _summary_
+            문장들을 이어 붙인 새 누적 결과를 반환한다. (기존 누적 결과는 수정하지 않음)
+        """
+        if not segments:
+            return self
+
+        ret = _SentenceMetrics(self.lpm_correction)
+        ret.segments = self.segments + segments
+        ret.word_count = self.word_count + sum(len(s["words"]) for s in segments)
+
+        # 직전 문장과의 휴지, 단어가 하나뿐인 문장의 휴지를 계산하기 위해 마지막 문장을 문맥으로 포함
+        context = self.segments[-1:]
+        context_word_count = len(context[0]["words"]) if context else 0
+        metrics: SttMetrics = get_stt_metrics(
+            {"text": "", "segments": context + segments}, self.lpm_correction
+        )
+
+        ret.ptl_by_sentence = self.ptl_by_sentence + metrics.ptl_by_sentence
+        ret.word_speed = self.word_speed + metrics.word_speed[context_word_count:]
+        ret.paused_time = self.paused_time + metrics.paused_time
+        if context:
+            ret.paused_time -= _get_paused_time_in_segment(context[0])
+
+        # 교정 부호의 단어 index를 전체 기준으로 옮기고, 문맥 문장의 속도 교정 부호는 이미 있으므로 제외
+        offset = self.word_count - context_word_count
+        ret.speech_correction = {}
+        for correction_type, marks in metrics.speech_correction.items():
+            if correction_type in _RANGE_CORRECTION_TYPES:
+                shifted = [
+                    [start + offset, end + offset]
+                    for start, end in marks
+                    if start >= context_word_count
+                ]
+            else:
+                shifted = [index + offset for index in marks]
+            ret.speech_correction[correction_type] = (
+                self.speech_correction[correction_type] + shifted
+            )
+
+        return ret
+
+
+class IncrementalAnalysis2:
+    """
+    STT segment가 도착하는 대로 이어서 analysis-2를 수행하는 speech 별 상태
+
+    문장 분리는 새 segment가 이어질 때 뒤쪽 문장의 경계가 바뀔 수 있으므로,
+    마지막 `tail_sentence_count`개 문장은 확정하지 않고 다음 segment가 도착하면 다시 분리한다.
+    확정된 문장들의 분석 결과는 누적해 두고, 매번 확정되지 않은 뒷부분만 다시 분석한다.
+    `finish` 결과는 전체 STT 결과를 analyze_stt_script로 분석한 결과와 같다.
+    단 STT 결과의 전체 텍스트는 segment 텍스트들을 공백으로 이어 붙인 것으로 보므로, 평균 LPM의 글자 수는
+    Clova의 전체 텍스트("text") 대신 segment 텍스트들에서 센다. (둘의 글자가 다르면 analyze_stt_script와 평균 LPM이 다름)
+    """
+
+    def __init__(
+        self,
+        speech_service: SpeechService,
+        lpm_correction: Optional[bool] = None,
+        tail_sentence_count: Optional[int] = None,
+    ) -> None:
+        if lpm_correction is None:
+            lpm_correction = analysis_config.speech_correction_lpm
+        if tail_sentence_count is None:
+            tail_sentence_count = analysis_config.incremental_tail_sentence_count
+
+        self.speech_service = speech_service
+        self.tail_sentence_count = tail_sentence_count
+
+        # 지금까지 도착한 segment들의 텍스트 / 단어
+        self.texts: List[str] = []
+        self.words: List[Any] = []
+        self.letter_count = 0
+
+        # 확정된 문장들의 분석 결과, 다음 문장에서 처리할 단어 index와 다음 문장 앞에 붙일 부분
+        self.finalized = _SentenceMetrics(lpm_correction)
+        self.word_index = 0
+        self.carry = ""
+        # 확정되지 않은 문장들의 텍스트 (전체 텍스트의 뒷부분)
+        self.tail_text = ""
+
+        self.finished = False
+
+    @property
+    def sentence_count(self) -> int:
+        return len(self.finalized.segments)
+
+    def append_segments(self, segments: Sequence[Any]) -> Analysis2Result:
+        """
+        _summary_
+            STT segment들을 이어 붙이고, 확정되지 않은 뒷부분을 다시 분석한 중간 결과를 반환한다.
+
+        Args:
+            segments (Sequence[Any]): 새로 도착한 Clova STT 결과의 segment 목록
+
+        Returns:
+            Analysis2Result: 지금까지 도착한 segment들의 중간 분석 결과
+        """
+        texts = [s["text"] for s in segments]
+        self.texts.extend(texts)
+        self.words.extend(chain.from_iterable(map(lambda s: s["words"], segments)))
+        # 전체 텍스트는 segment 텍스트들을 공백으로 이어 붙인 것이므로 글자 수도 segment 별로 합산
+        self.letter_count += sum(
+            len(text.replace(" ", "").replace(".", "")) for text in texts
+        )
+
+        if texts:
+            self.tail_text = " ".join(
+                ([self.tail_text] if self.tail_text else []) + texts
+            )
+
+        spans = self.speech_service._get_splitted_sentence_spans(self.tail_text)
+        boundary = len(spans) - self.tail_sentence_count
+        if boundary > 0:
+            sentences = [self.tail_text[start:end] for start, end in spans[:boundary]]
+            self._finalize(sentences)
+            self.tail_text = self.tail_text[spans[boundary][0] :]
+            spans = [
+                (start - spans[boundary][0], end - spans[boundary][0])
+                for start, end in spans[boundary:]
+            ]
+
+        tail_sentences = [self.tail_text[start:end] for start, end in spans]
+        tail_segments = []
+        # 뒷부분에 배정할 단어가 아직 도착하지 않은 경우(단어 없이 텍스트만 있는 segment 등), 확정된 문장들의 결과만 반환
+        if tail_sentences and self.word_index < len(self.words):
+            tail_segments, _, _ = self.speech_service._align_sentences(
+                self.words, tail_sentences, self.word_index, self.carry
+            )
+
+        return self._get_result(self.finalized.extend(tail_segments))
+
+    def finish(self, stt_metadata: Optional[Dict[str, Any]] = None) -> Analysis2Result:
+        """
+        _summary_
+            남은 문장들을 모두 확정하고 최종 분석 결과를 반환한다.
+
+        Args:
+            stt_metadata (Optional[Dict[str, Any]]): STT 결과에 함께 저장할 값들 (text, segments는 무시)
+
+        Returns:
+            Analysis2Result: 저장할 분석 결과 목록과 Speech에 반영할 분석 정보
+        """
+        if self.tail_text:
+            self._finalize(self.speech_service._get_splitted_sentences(self.tail_text))
+            self.tail_text = ""
+        self.finished = True
+
+        return self._get_result(self.finalized, stt_metadata)
+
+    def _finalize(self, sentences: List[str]) -> None:
+        segments, self.word_index, self.carry = self.speech_service._align_sentences(
+            self.words, sentences, self.word_index, self.carry
+        )
+        self.finalized = self.finalized.extend(segments)
+
+    def _get_result(
+        self,
+        sentence_metrics: _SentenceMetrics,
+        stt_metadata: Optional[Dict[str, Any]] = None,
+    ) -> Analysis2Result:
+        result = Analysis2Result()
+
+        # 요청으로 받은 값이 이어 붙인 텍스트 / 재조합된 segment를 덮어쓰지 않도록 먼저 펼침
+        concatenated_script = {
+            **(stt_metadata or {}),
+            "text": " ".join(self.texts),
+            "segments": sentence_metrics.segments,
+        }
+        result.records.append((AnalysisRecordType.STT, concatenated_script))
+
+        ptl_ratio, average_lpm = 100.0, 0.0
+        if sentence_metrics.segments:
+            end = sentence_metrics.segments[-1]["end"]
+            ptl_ratio = sentence_metrics.paused_time / end * 100
+            average_lpm = self.letter_count / (end / 1000 / 60)
+
+        result.records.append(
+            (AnalysisRecordType.PAUSE, sentence_metrics.ptl_by_sentence)
+        )
+        result.records.append((AnalysisRecordType.LPM, sentence_metrics.word_speed))
+        result.records.append((AnalysisRecordType.PAUSE_RATIO, ptl_ratio))
+        result.records.append((AnalysisRecordType.LPM_AVG, average_lpm))
+        result.records.append(
+            (AnalysisRecordType.SPEECH_CORRECTION, sentence_metrics.speech_correction)
+        )
+
+        result.speech_info["pause_ratio"] = ptl_ratio
+        result.speech_info["avglpm"] = average_lpm
+        result.speech_info["feedback_count"] = _get_feedback_count(
+            sentence_metrics.speech_correction
+        )
+
+        return result
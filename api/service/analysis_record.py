@@ -1,18 +1,34 @@
 import datetime
-from typing import Any
-import json
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, List, Tuple
 from api.data.client import AnalysisRecordDatabaseClient
 
 from api.data.enums import AnalysisRecordType
 from api.data.tables import AnalysisRecord
-from api.service.aws.s3 import S3Service
+from api.configs.aws.s3 import config as s3_config
+from api.service.aws.s3 import (
+    get_analysis_result_save_url,
+    get_partial_analysis_result_save_url,
+)
+from api.service.storage import get_storage_service
 
 
 class AnalysisRecordService:
     def __init__(self) -> None:
-        self.s3_service = S3Service()
+        self.storage_service = get_storage_service()
         self.db_client = AnalysisRecordDatabaseClient()
 
+    def _upload_result(
+        self, result_key: str, record_type: AnalysisRecordType, result: Any
+    ) -> str:
+        content_encoding, level = s3_config.get_json_compression(record_type.value)
+        return self.storage_service.upload_json_object(
+            result_key,
+            result,
+            content_encoding=content_encoding,
+            compression_level=level,
+        )
+
     def save_analysis_result(
         self,
         presentation_id: int,
@@ -21,9 +37,7 @@ class AnalysisRecordService:
         result: Any,
     ) -> None:
         result_key = f"{presentation_id}/{speech_id}/analysis/{record_type.value}.json"
-        url = self.s3_service.upload_json_object(
-            result_key, json.dumps(result, ensure_ascii=False)
-        )
+        url = self._upload_result(result_key, record_type, result)
 
         vo = AnalysisRecord()
         vo.speech_id = speech_id
@@ -32,3 +46,92 @@ class AnalysisRecordService:
         vo.created_date = datetime.datetime.now()
 
         self.db_client.insert(vo)
+
+    def save_analysis_results(
+        self,
+        presentation_id: int,
+        speech_id: int,
+        results: List[Tuple[AnalysisRecordType, Any]],
+        upsert: bool = False,
+    ) -> List[str]:
+        """
+        _summary_
+            여러 분석 결과를 S3에 동시에 업로드한 뒤, AnalysisRecord들을 하나의 transaction으로 저장한다.
+
+        Args:
+            presentation_id (int): presentation id
+            speech_id (int): speech id
+            results (List[Tuple[AnalysisRecordType, Any]]): (분석 종류, 분석 결과) 목록
+            upsert (bool): True면 같은 speech의 같은 종류 record를 삭제 후 삽입한다. (재분석 시 사용)
+
+        Returns:
+            List[str]: results와 같은 순서의 업로드된 파일 URL 목록
+        """
+        if not results:
+            return []
+
+        def upload(item: Tuple[AnalysisRecordType, Any]) -> str:
+            record_type, result = item
+            result_key = get_analysis_result_save_url(
+                presentation_id, speech_id, record_type
+            )
+            return self._upload_result(result_key, record_type, result)
+
+        with ThreadPoolExecutor(max_workers=len(results)) as executor:
+            urls = list(executor.map(upload, results))
+
+        now = datetime.datetime.now()
+        rows = [
+            {
+                "speech_id": speech_id,
+                "url": url,
+                "record_type": record_type,
+                "created_date": now,
+            }
+            for (record_type, _), url in zip(results, urls)
+        ]
+
+        replace_conditions = None
+        if upsert:
+            replace_conditions = [
+                AnalysisRecord.speech_id == speech_id,
+                AnalysisRecord.record_type.in_(
+                    [record_type for record_type, _ in results]
+                ),
+            ]
+
+        self.db_client.bulk_insert(rows, replace_conditions=replace_conditions)
+
+        return urls
+
+    def publish_partial_results(
+        self,
+        presentation_id: int,
+        speech_id: int,
+        results: List[Tuple[AnalysisRecordType, Any]],
+    ) -> List[str]:
+        """
+        _summary_
+            점진 분석의 중간 결과들을 S3의 partial 경로에 덮어써서 업로드한다.
+            최종 결과가 아니므로 AnalysisRecord는 저장하지 않는다.
+
+        Args:
+            presentation_id (int): presentation id
+            speech_id (int): speech id
+            results (List[Tuple[AnalysisRecordType, Any]]): (분석 종류, 분석 결과) 목록
+
+        Returns:
+            List[str]: results와 같은 순서의 업로드된 파일 URL 목록
+        """
+        if not results:
+            return []
+
+        def upload(item: Tuple[AnalysisRecordType, Any]) -> str:
+            record_type, result = item
+            result_key = get_partial_analysis_result_save_url(
+                presentation_id, speech_id, record_type
+            )
+            return self._upload_result(result_key, record_type, result)
+
+        with ThreadPoolExecutor(max_workers=len(results)) as executor:
+            return list(executor.map(upload, results))
@@ -1,15 +1,47 @@
 from pathlib import Path
-import librosa
-import librosa.display
-import matplotlib.pyplot as plt
 import numpy as np
-import pandas as pd
 
 """
 서비스에서 사용할 음성 분석 모듈
+librosa는 import 비용이 크므로(numba 등) 분석 함수를 처음 호출할 때 import한다.
 """
 
 
+def get_centered_moving_average(
+    values: np.ndarray, window: int, min_periods: int = 1
+) -> np.ndarray:
+    """
+    _summary_
+        NaN을 제외한 중앙 이동 평균을 구한다.
+        `pd.Series(values).rolling(window, min_periods=min_periods, center=True).mean()`과 같은 구간을 사용한다.
+
+    Args:
+        values (np.ndarray): 평균을 구할 값 (NaN 포함 가능)
+        window (int): 이동 평균 구간의 크기
+        min_periods (int): 구간 안에 NaN이 아닌 값이 이보다 적으면 결과는 NaN
+
+    Returns:
+        np.ndarray: values와 같은 길이의 이동 평균
+    """
+    values = np.asarray(values, dtype=np.float64)
+    valid = ~np.isnan(values)
+
+    # 누적 합으로 구간 합을 구함 (NaN은 0으로 두고 개수에서 제외)
+    cumsum = np.concatenate(([0.0], np.cumsum(np.where(valid, values, 0.0))))
+    cumcount = np.concatenate(([0], np.cumsum(valid)))
+
+    # i번째 값의 구간은 [i + (window - 1) // 2 - window + 1, i + (window - 1) // 2]
+    index = np.arange(len(values))
+    end = index + (window - 1) // 2 + 1
+    start = np.maximum(end - window, 0)
+    end = np.minimum(end, len(values))
+
+    count = cumcount[end] - cumcount[start]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        average = (cumsum[end] - cumsum[start]) / count
+    return np.where(count >= max(min_periods, 1), average, np.nan)
+
+
 def get_f0_analysis(audio_file_path: Path):
     """
     _summary_
@@ -19,12 +51,14 @@ def get_f0_analysis(audio_file_path: Path):
         audio_file_path (Path): 분석할 음성 파일 경로
 
     Returns:
-        Dict: pitch track 분석 결과
+        Dict: pitch track 분석 결과 (값은 np.ndarray)
             {
                 "times": [0.0, 0.01, ...],
                 "f0_smoothed": [0.0, 0.01, ...]
             }
     """
+    import librosa
+
     # Load the wav file with librosa
     audio_data, sample_rate = librosa.load(audio_file_path)
 
@@ -44,9 +78,7 @@ def get_f0_analysis(audio_file_path: Path):
 
     # Calculate moving average with a window size of 50
     # f0_smoothed = pd.Series(f0_interpolated).rolling(window=12, min_periods=1, center=True).mean()
-    f0_smoothed = (
-        pd.Series(f0_interpolated).rolling(window=50, min_periods=1, center=True).mean()
-    )
+    f0_smoothed = get_centered_moving_average(f0_interpolated, window=50, min_periods=1)
     # f0_smoothed = f0
 
     times = librosa.times_like(f0)
@@ -63,7 +95,8 @@ def get_f0_analysis(audio_file_path: Path):
     # plt.show()
 
     # FIXME: noisereduce 하면 너무 소리가 띄엄띄엄되고, 안하면 들쭉날쭉함
-    return {"times": times.tolist(), "f0_smoothed": f0_smoothed.tolist()}
+    # NumPy 배열은 api.utils.serialization에서 그대로 직렬화되므로 list로 변환하지 않음
+    return {"times": times, "f0_smoothed": f0_smoothed}
 
 
 def get_f0_average_analysis(audio_file_path: Path) -> float:
@@ -77,6 +110,8 @@ def get_f0_average_analysis(audio_file_path: Path) -> float:
     Returns:
         float: 평균 f0 값 반환 / ex) 남자 목소리: 120, 여자 목소리: 220
     """
+    import librosa
+
     audio_data, sample_rate = librosa.load(audio_file_path)
 
     # Use pYIN to estimate the fundamental frequency (pitch track)
@@ -100,12 +135,14 @@ def get_db_analysis(audio_file_path: Path):
         audio_file_path (Path): 분석할 음성 파일 경로
 
     Returns:
-        Dict: voice db 분석 결과
+        Dict: voice db 분석 결과 (값은 np.ndarray)
             {
                 "times": [0.0, 0.01, ...],
                 "loudness": [0.0, 0.01, ...]
             }
     """
+    import librosa
+
     # Load the audio file
     y, sr = librosa.load(audio_file_path)
 
@@ -124,7 +161,7 @@ def get_db_analysis(audio_file_path: Path):
     # Create an array of time points
     time = librosa.frames_to_time(range(loudness.shape[0]), sr=sr)
 
-    return {"times": time.tolist(), "loudness": loudness.tolist()}
+    return {"times": time, "loudness": loudness}
 
     # [DEV]
     # Plot the results
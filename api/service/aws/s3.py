@@ -1,10 +1,14 @@
-import json
-from typing import Any, Tuple
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, BinaryIO, Dict, Optional, Tuple
 
-import boto3
-
-from api.configs.aws.s3 import config as s3_config
+from api.configs.aws.s3 import S3Config, config as s3_config
 from api.data.enums import AnalysisRecordType
+from api.service.storage import StorageService
+from api.service.tracing_service import tracer
+from api.utils import compression
 
 
 def get_analysis_result_save_url(
@@ -15,10 +19,156 @@ def get_analysis_result_save_url(
     return f"{presentation_id}/{speech_id}/analysis/{analysis_type.value}.json"
 
 
-class S3Service:
+def get_partial_analysis_result_save_url(
+    presentation_id: int,
+    speech_id: int,
+    analysis_type: AnalysisRecordType,
+):
+    return f"{presentation_id}/{speech_id}/analysis/partial/{analysis_type.value}.json"
+
+
+def get_raw_stt_save_url(presentation_id: int, speech_id: int):
+    # analysis-2가 STT.json을 문장 단위로 재조합한 결과로 덮어쓰므로, 원본은 별도 key에 보관
+    return f"{presentation_id}/{speech_id}/analysis/STT_RAW.json"
+
+
+def get_aligned_script_cache_url(presentation_id: int, speech_id: int):
+    # 문장 재조합 결과 cache (STT 결과와 같은 위치에 저장)
+    return f"{presentation_id}/{speech_id}/analysis/STT_ALIGNED.json"
+
+
+class S3Metrics:
+    """
+    S3 요청 종류(operation) 별 호출 수, 소요 시간, 전송 byte 수를 기록한다.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._operations: Dict[str, Dict[str, float]] = {}
+
+    def record(
+        self, operation: str, elapsed: float, transferred: int, failed: bool
+    ) -> None:
+        with self._lock:
+            stats = self._operations.setdefault(
+                operation,
+                {
+                    "count": 0,
+                    "error_count": 0,
+                    "total_seconds": 0.0,
+                    "max_seconds": 0.0,
+                    "bytes": 0,
+                },
+            )
+            stats["count"] += 1
+            stats["error_count"] += int(failed)
+            stats["total_seconds"] += elapsed
+            stats["max_seconds"] = max(stats["max_seconds"], elapsed)
+            stats["bytes"] += transferred
+
+    @contextmanager
+    def measure(self, operation: str):
+        """
+        with 블록의 소요 시간을 기록한다. 블록 안에서 반환된 dict의 "bytes"에 전송량을 기록하면 함께 집계된다.
+        """
+        counter = {"bytes": 0}
+        started_at = time.perf_counter()
+        failed = True
+        with tracer.span(f"s3.{operation}") as span:
+            try:
+                yield counter
+                failed = False
+            finally:
+                self.record(
+                    operation,
+                    time.perf_counter() - started_at,
+                    counter["bytes"],
+                    failed,
+                )
+                if span is not None:
+                    span.set_attribute("bytes", counter["bytes"])
+
+    def get_stats(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            return {
+                operation: dict(stats) for operation, stats in self._operations.items()
+            }
+
+
+class _CountingReader:
+    def __init__(self, stream: BinaryIO) -> None:
+        self.stream = stream
+        self.bytes_read = 0
+
+    def read(self, size: int = -1) -> bytes:
+        data = self.stream.read(size)
+        self.bytes_read += len(data)
+        return data
+
+
+class S3ClientFactory:
+    """
+    프로세스 전역에서 하나의 boto3 S3 client와 TransferConfig를 공유하도록 한다.
+    (boto3 client는 thread-safe하지만 fork 이후에는 재사용하면 안 되므로 pid가 바뀌면 새로 생성)
+    boto3는 import 비용이 크므로 client / TransferConfig를 처음 사용할 때 import한다.
+    """
+
+    def __init__(self, config: S3Config) -> None:
+        self.config = config
+        self.metrics = S3Metrics()
+        self._lock = threading.Lock()
+        self._pid = None
+        self._client = None
+        self._transfer_config = None
+
+    @property
+    def transfer_config(self):
+        if self._transfer_config is None:
+            from boto3.s3.transfer import TransferConfig
+
+            self._transfer_config = TransferConfig(
+                multipart_threshold=self.config.s3_multipart_threshold,
+                multipart_chunksize=self.config.s3_multipart_chunksize,
+                max_concurrency=self.config.s3_max_concurrency,
+            )
+        return self._transfer_config
+
+    def get_client(self):
+        import boto3
+        from botocore.config import Config
+
+        with self._lock:
+            if self._client is None or self._pid != os.getpid():
+                self._client = boto3.session.Session().client(
+                    "s3",
+                    region_name=self.config.aws_region,
+                    config=Config(
+                        max_pool_connections=self.config.s3_max_pool_connections,
+                        retries={
+                            "mode": self.config.s3_retry_mode,
+                            "max_attempts": self.config.s3_max_attempts,
+                        },
+                    ),
+                )
+                self._pid = os.getpid()
+            return self._client
+
+
+s3_client_factory = S3ClientFactory(s3_config)
+
+
+class S3Service(StorageService):
     def __init__(self) -> None:
-        self.client = boto3.client("s3")
         self.config = s3_config
+        self.metrics = s3_client_factory.metrics
+
+    @property
+    def client(self):
+        return s3_client_factory.get_client()
+
+    @property
+    def transfer_config(self):
+        return s3_client_factory.transfer_config
 
     def _get_url(self, object_key: str) -> str:
         bucket_name = s3_config.audio_bucket_name
@@ -41,41 +191,99 @@ class S3Service:
         Returns:
             str: 업로드된 파일의 URL
         """
-        object_path = "/".join(map(str, path))
-        key = f"{object_path}/{object_key}" if path else object_key
+        key = self._get_key(object_key, *path)
         bucket_name = self.get_default_bucket_name()
 
-        self.client.upload_file(upload_file_path, bucket_name, key)
+        with self.metrics.measure("upload_file") as counter:
+            self.client.upload_file(
+                str(upload_file_path), bucket_name, key, Config=self.transfer_config
+            )
+            counter["bytes"] = os.path.getsize(upload_file_path)
 
         full_path = self._get_url(key)
         return full_path
 
+    def upload_stream(
+        self,
+        stream: BinaryIO,
+        object_key: str,
+        content_type: Optional[str] = None,
+        part_size: int = 5 * 1024 * 1024,
+    ) -> str:
+        """stream을 읽는 대로 part 단위로 나누어 버킷에 multipart 업로드한다.
+        (stream 전체를 파일로 저장하거나 메모리에 올리지 않음)
+
+        Args:
+            stream (BinaryIO): 업로드할 데이터를 읽을 stream (read 시 EOF 전까지는 요청한 크기만큼 반환해야 함)
+            object_key (str): 저장할 파일의 이름
+            content_type (Optional[str]): 저장할 파일의 Content-Type
+            part_size (int): part 하나의 크기 (S3 제약으로 마지막 part를 제외하고 5MB 이상이어야 함)
+
+        Returns:
+            str: 업로드된 파일의 URL (stream이 닫히고 업로드가 완료된 후 반환)
+        """
+        from boto3.s3.transfer import TransferConfig
+
+        transfer_config = TransferConfig(
+            multipart_threshold=part_size,
+            multipart_chunksize=part_size,
+            max_concurrency=self.config.s3_max_concurrency,
+        )
+        extra_args = {"ContentType": content_type} if content_type else None
+
+        with self.metrics.measure("upload_stream") as counter:
+            counting_stream = _CountingReader(stream)
+            self.client.upload_fileobj(
+                counting_stream,
+                self.get_default_bucket_name(),
+                object_key,
+                ExtraArgs=extra_args,
+                Config=transfer_config,
+            )
+            counter["bytes"] = counting_stream.bytes_read
+
+        return self._get_url(object_key)
+
     def upload_json_object(
-        self, object_key: str, json_object: Any, *path: Tuple[Any]
+        self,
+        object_key: str,
+        json_object: Any,
+        *path: Tuple[Any],
+        content_encoding: str = compression.IDENTITY,
+        compression_level: int = 0,
     ) -> str:
         """버킷에 JSON object를 업로드한다.
 
         Args:
             object_key (str): 저장할 파일의 이름
-            json_object (Any): JSON object
+            json_object (Any): JSON으로 직렬화할 객체 (bytes인 경우 이미 직렬화된 JSON으로 간주하여 그대로 업로드)
             *path (Tuple[Any]): 파일의 앞에 붙을 prefix를 나열
+            content_encoding (str): 압축 방식 ("identity", "gzip", "zstd")
+            compression_level (int): 압축 레벨
 
         Returns:
             str: 업로드된 파일의 URL
         """
-        object_path = "/".join(map(str, path))
-        key = f"{object_path}/{object_key}" if path else object_key
-
-        if not (isinstance(json_object, bytes) or isinstance(json_object, bytearray)):
-            json_object = json.dumps(json_object, ensure_ascii=False)
+        key = self._get_key(object_key, *path)
 
-        self.client.put_object(
-            Bucket=self.get_default_bucket_name(),
-            Key=key,
-            Body=json_object,
-            ContentType="application/json",
+        json_object, applied_encoding = self._encode_json(
+            json_object, content_encoding, compression_level
         )
 
+        extra_args = {}
+        if applied_encoding != compression.IDENTITY:
+            extra_args["ContentEncoding"] = applied_encoding
+
+        with self.metrics.measure("put_object") as counter:
+            self.client.put_object(
+                Bucket=self.get_default_bucket_name(),
+                Key=key,
+                Body=json_object,
+                ContentType="application/json",
+                **extra_args,
+            )
+            counter["bytes"] = len(json_object)
+
         return self._get_url(key)
 
     def download_json_object(self, object_key: str) -> Any:
@@ -86,11 +294,21 @@ class S3Service:
 
         Returns:
             Any(정상적으로 stt 결과 로드되었다면 dict): 다운로드된 JSON object
+            (이전 버전에서 이중으로 인코딩되어 저장된 object도 한 번에 디코딩됨)
+            (gzip, zstd로 압축된 object는 Content-Encoding에 따라 압축 해제됨)
         """
         bucket_name = self.get_default_bucket_name()
-        response = self.client.get_object(Bucket=bucket_name, Key=object_key)
-        str_result = response["Body"].read().decode("utf-8")
-        return json.loads(str_result)
+        with self.metrics.measure("get_object") as counter:
+            response = self.client.get_object(Bucket=bucket_name, Key=object_key)
+            body = response["Body"].read()
+            counter["bytes"] = len(body)
+        return self._decode_json(body, response.get("ContentEncoding"))
+
+    def download_json_object_if_exists(self, object_key: str) -> Optional[Any]:
+        try:
+            return self.download_json_object(object_key)
+        except self.client.exceptions.NoSuchKey:
+            return None
 
     def download_object(self, obj_full_path: str, dest_path: str) -> str:
         """특정 S3 object 하나를 파일 시스템에 다운로드한다.
@@ -103,5 +321,9 @@ class S3Service:
             str: 다운로드된 파일의 경로
         """
         bucket_name = self.get_default_bucket_name()
-        self.client.download_file(bucket_name, obj_full_path, dest_path)
+        with self.metrics.measure("download_file") as counter:
+            self.client.download_file(
+                bucket_name, obj_full_path, str(dest_path), Config=self.transfer_config
+            )
+            counter["bytes"] = os.path.getsize(dest_path)
         return dest_path
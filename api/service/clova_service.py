@@ -1,26 +1,193 @@
 import os
+import random
+import threading
+import time
+from typing import Dict, Optional
+
 import requests
-from pathlib import Path
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import NewConnectionError
+
+from api.configs.clova import ClovaSpeechConfigs, clova_speech_config
+from api.service.tracing_service import tracer
+
+"""
+Clova Speech STT 요청 모듈
+connection pool을 재사용하며, 5xx / 429 응답과 연결 수립 실패는 jitter를 둔 backoff로 제한된 횟수만큼 재시도한다.
+요청을 보낸 뒤의 실패(응답 대기 중 timeout, 연결 끊김)는 Clova가 이미 STT 작업을 접수했을 수 있으므로 재시도하지 않는다.
+(재시도하면 같은 STT 작업이 중복 접수되어 callback으로 analysis-2가 두 번 수행될 수 있음)
+"""
 
-from api.configs.clova import clova_speech_config
+RETRY_STATUS_CODES = frozenset([429, 500, 502, 503, 504])
 
 
-def clova_stt_send(s3_audio_file_path: str, response_callback_url: str):
-    request_body = {
-        "url": s3_audio_file_path,  # 분석할 음성 파일 URL
-        "language": "ko-KR",
-        "callback": response_callback_url,  # 결과 송신받을 콜백 URL
-    }
+class ClovaMetrics:
+    """
+    STT 요청의 호출 수, 실패 수, 재시도 수, 소요 시간(재시도 대기 포함)을 기록한다.
+    """
 
-    headers = {"X-CLOVASPEECH-API-KEY": clova_speech_config.clova_secret_key}
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._stats: Dict[str, float] = {
+            "count": 0,
+            "error_count": 0,
+            "retry_count": 0,
+            "total_seconds": 0.0,
+            "max_seconds": 0.0,
+        }
 
-    response: requests.Response = requests.post(
-        clova_speech_config.clova_stt_target_url, json=request_body, headers=headers
-    )
+    def record(self, elapsed: float, attempts: int, failed: bool) -> None:
+        with self._lock:
+            self._stats["count"] += 1
+            self._stats["error_count"] += int(failed)
+            self._stats["retry_count"] += attempts - 1
+            self._stats["total_seconds"] += elapsed
+            self._stats["max_seconds"] = max(self._stats["max_seconds"], elapsed)
 
-    if response.status_code == 200:
+    def get_stats(self) -> Dict[str, float]:
+        with self._lock:
+            return dict(self._stats)
+
+
+def _failed_before_sending(e: requests.ConnectionError) -> bool:
+    """
+    _summary_
+        요청을 보내기 전(연결 수립 단계)에 실패했는지 여부
+        연결 후 끊긴 경우(RemoteDisconnected 등 ProtocolError)는 요청이 이미 전달되었을 수 있으므로 False
+    """
+    if isinstance(e, requests.ConnectTimeout):
         return True
-    else:
+    reason = getattr(e.args[0], "reason", None) if e.args else None
+    return isinstance(reason, NewConnectionError)
+
+
+class ClovaSpeechClient:
+    """
+    requests.Session으로 connection을 재사용하는 Clova Speech client
+    (Session은 fork 이후 재사용하면 안 되므로 pid가 바뀌면 새로 생성)
+    """
+
+    def __init__(
+        self, config: ClovaSpeechConfigs, metrics: Optional[ClovaMetrics] = None
+    ) -> None:
+        self.config = config
+        self.metrics = metrics if metrics is not None else ClovaMetrics()
+        self._lock = threading.Lock()
+        self._pid = None
+        self._session: Optional[requests.Session] = None
+
+    def _get_request(self, s3_audio_file_path: str, response_callback_url: str):
+        request_body = {
+            "url": s3_audio_file_path,  # 분석할 음성 파일 URL
+            "language": "ko-KR",
+            "callback": response_callback_url,  # 결과 송신받을 콜백 URL
+        }
+        headers = {"X-CLOVASPEECH-API-KEY": self.config.clova_secret_key}
+        return request_body, headers
+
+    def _get_backoff(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """
+        _summary_
+            attempt번째 재시도 전 대기 시간을 반환한다. (full jitter)
+            429 응답에 Retry-After(초)가 있으면 backoff_max 이내에서 그 값을 따른다.
+        """
+        if retry_after is not None:
+            try:
+                return min(float(retry_after), self.config.clova_backoff_max)
+            except ValueError:
+                pass
+
+        cap = min(
+            self.config.clova_backoff_max,
+            self.config.clova_backoff_base * (2**attempt),
+        )
+        return random.uniform(0, cap)
+
+    @staticmethod
+    def _log_failure(status_code: Optional[int], detail: str) -> None:
         # TODO: Error logging
-        print("[DEV] Clova STT Send Failed: ", response.status_code, response.text)
-        return False
+        print("[DEV] Clova STT Send Failed: ", status_code, detail)
+
+    @property
+    def session(self) -> requests.Session:
+        with self._lock:
+            if self._session is None or self._pid != os.getpid():
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=1, pool_maxsize=self.config.clova_pool_maxsize
+                )
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                self._session = session
+                self._pid = os.getpid()
+            return self._session
+
+    def stt_send(self, s3_audio_file_path: str, response_callback_url: str) -> bool:
+        """
+        _summary_
+            Clova Speech에 STT를 요청한다. 결과는 response_callback_url로 전송된다.
+
+        Args:
+            s3_audio_file_path (str): 분석할 음성 파일 URL
+            response_callback_url (str): STT 결과를 전송받을 URL
+
+        Returns:
+            bool: 요청 성공 여부
+        """
+        request_body, headers = self._get_request(
+            s3_audio_file_path, response_callback_url
+        )
+        timeout = (self.config.clova_connect_timeout, self.config.clova_read_timeout)
+
+        started_at = time.perf_counter()
+        attempt = 0
+        success = False
+        try:
+            while True:
+                attempt += 1
+                retry_after = None
+                try:
+                    with tracer.span("clova.stt_send", attempt=attempt) as span:
+                        response = self.session.post(
+                            self.config.clova_stt_target_url,
+                            json=request_body,
+                            headers=headers,
+                            timeout=timeout,
+                        )
+                        if span is not None:
+                            span.set_attribute("status_code", response.status_code)
+                except requests.ConnectionError as e:
+                    # 연결 수립에 실패한 경우(ConnectTimeout 포함)만 재시도
+                    # 요청을 보낸 뒤 연결이 끊긴 경우는 Clova가 요청을 받았을 수 있으므로 재시도하지 않음
+                    if (
+                        not _failed_before_sending(e)
+                        or attempt > self.config.clova_max_retries
+                    ):
+                        self._log_failure(None, repr(e))
+                        return False
+                else:
+                    if response.status_code == 200:
+                        success = True
+                        return True
+                    if (
+                        response.status_code not in RETRY_STATUS_CODES
+                        or attempt > self.config.clova_max_retries
+                    ):
+                        self._log_failure(response.status_code, response.text)
+                        return False
+                    retry_after = response.headers.get("Retry-After")
+
+                time.sleep(self._get_backoff(attempt - 1, retry_after))
+        except requests.RequestException as e:
+            self._log_failure(None, repr(e))
+            return False
+        finally:
+            self.metrics.record(time.perf_counter() - started_at, attempt, not success)
+
+
+clova_metrics = ClovaMetrics()
+clova_client = ClovaSpeechClient(clova_speech_config, clova_metrics)
+
+
+def clova_stt_send(s3_audio_file_path: str, response_callback_url: str) -> bool:
+    return clova_client.stt_send(s3_audio_file_path, response_callback_url)
@@ -1,4 +1,5 @@
 import ffmpeg
+import subprocess
 from pathlib import Path
 from typing import List
 
@@ -126,6 +127,67 @@ def wav_to_mp3(wav_file_path: Path) -> Path:
     return output_mp3_path
 
 
+class FfmpegOutputStream:
+    """
+    ffmpeg 프로세스의 stdout을 읽는 file-like object
+    변환이 끝나기 전에 읽은 만큼 바로 다음 작업(S3 업로드 등)에 넘길 수 있다.
+    with 구문 종료 시 프로세스가 아직 실행 중이라면 종료시킨다.
+    """
+
+    def __init__(self, process: subprocess.Popen) -> None:
+        self.process = process
+        self.bytes_read = 0
+
+    def read(self, size: int = -1) -> bytes:
+        # Popen.stdout은 BufferedReader이므로 EOF 전까지는 항상 size만큼 읽어서 반환한다.
+        data = self.process.stdout.read(size)
+        self.bytes_read += len(data)
+
+        if size < 0 or len(data) < size:
+            # stdout이 닫힌 경우, 변환 도중 실패하여 잘린 결과가 업로드되지 않도록 종료 코드를 확인한다.
+            return_code = self.process.wait()
+            if return_code != 0:
+                raise ffmpeg.Error("ffmpeg", None, None)
+
+        return data
+
+    def readable(self) -> bool:
+        return True
+
+    def close(self) -> None:
+        if self.process.poll() is None:
+            self.process.kill()
+            self.process.wait()
+        self.process.stdout.close()
+
+    def __enter__(self) -> "FfmpegOutputStream":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+
+def wav_to_mp3_stream(wav_file_path: Path) -> FfmpegOutputStream:
+    """_summary_
+    wav 파일을 mp3로 변환하며, 변환 결과를 파일 대신 stream으로 반환한다.
+
+    Args:
+        wav_file_path (Path): wav 파일 경로
+
+    Returns:
+        FfmpegOutputStream: mp3 데이터를 읽을 수 있는 stream
+    """
+
+    process = (
+        ffmpeg.input(str(wav_file_path))
+        .output("pipe:", format="mp3", ar=22050, ab="64k")
+        .global_args("-loglevel", "error")
+        .run_async(pipe_stdout=True)
+    )
+
+    return FfmpegOutputStream(process)
+
+
 if __name__ == "__main__":
     print(
         merge_webm_files_binary_concat(
@@ -0,0 +1,302 @@
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from functools import wraps
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+
+from api.service.tracing_service import tracer
+
+"""
+Prometheus text format(0.0.4)으로 노출할 metric 모듈
+분석 pipeline의 단계 별 소요 시간, 분석 종류 별 작업 수, 대기 / 처리 중인 작업 수를 기록한다.
+기록은 lock 안에서 값 몇 개를 갱신하는 것이 전부이므로 분석 소요 시간에 영향을 주지 않는다.
+"""
+
+# pipeline 단계 소요 시간(초)의 histogram bucket (음성 파일 길이에 따라 수 분까지 걸릴 수 있음)
+DEFAULT_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+    120.0,
+    300.0,
+)
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def format_sample(
+    name: str, label_names: Sequence[str], label_values: Sequence[str], value: float
+) -> str:
+    """
+    _summary_
+        `name{label="value",...} value` 형태의 한 줄을 만든다.
+    """
+    if label_names:
+        labels = ",".join(
+            f'{label}="{_escape(str(label_value))}"'
+            for label, label_value in zip(label_names, label_values)
+        )
+        name = f"{name}{{{labels}}}"
+    if value == float("inf"):
+        return f"{name} +Inf"
+    if float(value).is_integer():
+        return f"{name} {int(value)}"
+    return f"{name} {float(value)!r}"
+
+
+class _Metric:
+    metric_type = "untyped"
+
+    def __init__(
+        self, name: str, documentation: str, label_names: Sequence[str] = ()
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self._lock = threading.Lock()
+        self._values: Dict[LabelValues, float] = {}
+
+    def _get_header(self) -> List[str]:
+        return [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.metric_type}",
+        ]
+
+    def collect(self) -> List[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        return self._get_header() + [
+            format_sample(self.name, self.label_names, label_values, value)
+            for label_values, value in values
+        ]
+
+
+class Counter(_Metric):
+    metric_type = "counter"
+
+    def inc(self, *label_values: str, amount: float = 1) -> None:
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+
+class Gauge(_Metric):
+    metric_type = "gauge"
+
+    def inc(self, *label_values: str, amount: float = 1) -> None:
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def dec(self, *label_values: str, amount: float = 1) -> None:
+        self.inc(*label_values, amount=-amount)
+
+    def set(self, *label_values: str, value: float) -> None:
+        with self._lock:
+            self._values[label_values] = value
+
+
+class Histogram(_Metric):
+    metric_type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        label_names: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, documentation, label_names)
+        self.buckets = tuple(sorted(buckets))
+        # label 값 -> (bucket 별 개수(누적 아님), 합계)
+        self._histograms: Dict[LabelValues, Tuple[List[int], float]] = {}
+
+    def observe(self, value: float, *label_values: str) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            counts, total = self._histograms.get(
+                label_values, ([0] * (len(self.buckets) + 1), 0.0)
+            )
+            counts[index] += 1
+            self._histograms[label_values] = (counts, total + value)
+
+    def collect(self) -> List[str]:
+        with self._lock:
+            histograms = sorted(
+                (label_values, (list(counts), total))
+                for label_values, (counts, total) in self._histograms.items()
+            )
+
+        lines = self._get_header()
+        bucket_label_names = self.label_names + ("le",)
+        for label_values, (counts, total) in histograms:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(float(bound))
+                lines.append(
+                    format_sample(
+                        f"{self.name}_bucket",
+                        bucket_label_names,
+                        label_values + (le,),
+                        cumulative,
+                    )
+                )
+            lines.append(
+                format_sample(f"{self.name}_sum", self.label_names, label_values, total)
+            )
+            lines.append(
+                format_sample(
+                    f"{self.name}_count", self.label_names, label_values, cumulative
+                )
+            )
+        return lines
+
+
+class MetricsRegistry:
+    """
+    metric들과, 다른 모듈이 이미 집계하고 있는 값(S3 / Clova / DB 풀 통계 등)을 metric으로 변환하는 collector들을 모아
+    Prometheus text format으로 출력한다.
+    """
+
+    def __init__(self) -> None:
+        self._metrics: List[_Metric] = []
+        self._collectors: List[Callable[[], Iterable[str]]] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def register_collector(self, collector: Callable[[], Iterable[str]]) -> None:
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.collect())
+        for collector in self._collectors:
+            try:
+                lines.extend(collector())
+            except Exception as e:
+                # 일부 통계를 가져오지 못해도 나머지 metric은 노출
+                print("[ERROR] metric 수집 실패", repr(e))
+        return "\n".join(lines) + "\n"
+
+
+class PipelineMetrics:
+    """
+    분석 pipeline(analysis-1, analysis-2)의 작업 / 단계 별 metric
+    작업은 background task로 등록될 때 queued, 실행되면 in-flight로 집계한다.
+    """
+
+    def __init__(self, registry: MetricsRegistry) -> None:
+        self.stage_seconds: Histogram = registry.register(
+            Histogram(
+                "wasak_pipeline_stage_duration_seconds",
+                "분석 pipeline 단계 별 소요 시간",
+                ("kind", "stage"),
+            )
+        )
+        self.jobs_started: Counter = registry.register(
+            Counter(
+                "wasak_analysis_jobs_started_total", "시작된 분석 작업 수", ("kind",)
+            )
+        )
+        self.jobs_succeeded: Counter = registry.register(
+            Counter(
+                "wasak_analysis_jobs_succeeded_total", "성공한 분석 작업 수", ("kind",)
+            )
+        )
+        self.jobs_failed: Counter = registry.register(
+            Counter(
+                "wasak_analysis_jobs_failed_total", "실패한 분석 작업 수", ("kind",)
+            )
+        )
+        self.jobs_queued: Gauge = registry.register(
+            Gauge(
+                "wasak_analysis_jobs_queued", "실행을 기다리는 분석 작업 수", ("kind",)
+            )
+        )
+        self.jobs_in_flight: Gauge = registry.register(
+            Gauge("wasak_analysis_jobs_in_flight", "실행 중인 분석 작업 수", ("kind",))
+        )
+        self._local = threading.local()
+
+    def enqueue(self, kind: str) -> None:
+        self.jobs_queued.inc(kind)
+
+    @contextmanager
+    def stage(self, kind: str, stage: str):
+        """
+        with 블록의 소요 시간을 kind 작업의 stage 단계 소요 시간으로 기록한다. (예외가 발생해도 기록)
+        진행 중인 trace가 있으면 같은 구간을 span으로도 기록한다.
+        """
+        started_at = time.perf_counter()
+        try:
+            with tracer.span(stage, kind=kind):
+                yield
+        finally:
+            self.stage_seconds.observe(time.perf_counter() - started_at, kind, stage)
+
+    def fail_job(self) -> None:
+        """
+        현재 thread에서 실행 중인 작업을 실패로 기록한다. (작업 함수가 예외를 직접 처리하는 경우 사용)
+        """
+        self._local.failed = True
+
+    def track_job(self, kind: str, queued: bool = True):
+        """
+        _summary_
+            작업 함수의 시작 / 성공 / 실패와 전체 소요 시간을 기록하는 decorator
+            예외가 발생하거나 함수 안에서 fail_job을 호출하면 실패로 기록한다.
+
+        Args:
+            kind (str): 분석 종류 ("analysis-1", "analysis-2")
+            queued (bool): enqueue로 대기 중인 작업으로 기록된 작업인지 여부
+        """
+
+        def decorator(func: Callable) -> Callable:
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                if queued:
+                    self.jobs_queued.dec(kind)
+                self.jobs_started.inc(kind)
+                self.jobs_in_flight.inc(kind)
+
+                previous_failed = getattr(self._local, "failed", False)
+                self._local.failed = False
+                try:
+                    with self.stage(kind, "total"):
+                        result = func(*args, **kwargs)
+                except BaseException:
+                    self._local.failed = True
+                    raise
+                finally:
+                    self.jobs_in_flight.dec(kind)
+                    if self._local.failed:
+                        self.jobs_failed.inc(kind)
+                    else:
+                        self.jobs_succeeded.inc(kind)
+                    self._local.failed = previous_failed
+                return result
+
+            return wrapper
+
+        return decorator
+
+
+registry = MetricsRegistry()
+pipeline_metrics = PipelineMetrics(registry)
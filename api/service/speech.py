@@ -1,13 +1,123 @@
-from functools import reduce
-from typing import Any, List, Literal, Tuple, Union
-from copy import deepcopy
+import hashlib
+from collections import OrderedDict
+from itertools import chain
+from threading import Lock
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    List,
+    Literal,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
 
-from kiwipiepy import Kiwi
-from api.data.client import SpeechDatabaseClient
+from api.configs.analysis import config as analysis_config
+from api.configs.aws.s3 import config as s3_config
+from api.data.client import ColumnUpdateUnitOfWork, SpeechDatabaseClient
+from api.data.enums import AnalysisRecordType
+from api.data.stt import SttScript
 
 from api.data.tables import Speech
 
-kiwi = Kiwi()
+if TYPE_CHECKING:
+    from kiwipiepy import Kiwi
+
+_kiwi: Optional["Kiwi"] = None
+_kiwi_lock = Lock()
+
+
+def get_kiwi() -> "Kiwi":
+    """
+    _summary_
+        문장 분리에 사용할 kiwi를 반환한다.
+        모델 로드에 시간이 오래 걸리므로 처음 사용할 때 생성하며, 프로세스 내에서 공유한다.
+    """
+    global _kiwi
+
+    if _kiwi is None:
+        with _kiwi_lock:
+            if _kiwi is None:
+                from kiwipiepy import Kiwi
+
+                _kiwi = Kiwi(num_workers=analysis_config.kiwi_num_workers)
+    return _kiwi
+
+
+# 문장 분리 / 재조합 로직이 바뀌면 올려서 이전 cache를 사용하지 않도록 함
+ALIGNMENT_VERSION = 1
+
+
+def get_segments_hash(segments: Sequence[Any]) -> str:
+    """
+    _summary_
+        STT segment들의 텍스트와 단어로 문장 재조합 결과의 cache key를 만든다.
+        재조합 결과는 segment들의 텍스트와 단어, kiwi 버전에 의해서만 결정된다.
+    """
+    import kiwipiepy
+
+    parts = [f"{ALIGNMENT_VERSION}\x1f{kiwipiepy.__version__}"]
+    for segment in segments:
+        parts.append(segment["text"])
+        parts.extend(
+            f"{start}\x1f{end}\x1f{word}" for start, end, word in segment["words"]
+        )
+        # segment 경계 구분
+        parts.append("\x1d")
+
+    return hashlib.blake2b(
+        "\x1e".join(parts).encode("utf-8"), digest_size=16
+    ).hexdigest()
+
+
+class AlignedSegmentsCache:
+    """
+    문장 재조합 결과를 최근에 사용한 순서로 maxsize개까지 보관하는 LRU cache
+    cache된 segment들은 여러 분석 결과가 공유하므로 수정하면 안 된다.
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self._segments: "OrderedDict[str, List[dict]]" = OrderedDict()
+        self._lock = Lock()
+
+        self.hit_count = 0
+        self.miss_count = 0
+
+    def get(self, key: str) -> Optional[List[dict]]:
+        with self._lock:
+            segments = self._segments.get(key)
+            if segments is None:
+                self.miss_count += 1
+                return None
+
+            self._segments.move_to_end(key)
+            self.hit_count += 1
+            return segments
+
+    def put(self, key: str, segments: List[dict]) -> None:
+        if self.maxsize <= 0:
+            return
+
+        with self._lock:
+            self._segments[key] = segments
+            self._segments.move_to_end(key)
+            while len(self._segments) > self.maxsize:
+                self._segments.popitem(last=False)
+
+    def get_stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "size": len(self._segments),
+                "maxsize": self.maxsize,
+                "hit_count": self.hit_count,
+                "miss_count": self.miss_count,
+            }
+
+
+aligned_segments_cache = AlignedSegmentsCache(analysis_config.alignment_cache_size)
 
 
 class AlignedSttElement:
@@ -29,83 +139,291 @@ class AlignedSttElement:
 class SpeechService:
     def __init__(self) -> None:
         self.db_client = SpeechDatabaseClient()
+        self._storage_service = None
+        # 저장소에 저장한 재조합 결과 수 (재분석 배치 작업의 업로드 수 제한에 사용)
+        self.alignment_cache_write_count = 0
+
+    def get_aligned_script(
+        self, stt_script: Union[dict, SttScript], cache_key: Optional[str] = None
+    ) -> Any:
+        """
+        _summary_
+            STT 결과를 kiwi로 문장 분리한 뒤, 문장 단위 segment들로 재조합한다.
+            같은 segment들의 재조합 결과는 memory(LRU)와, 설정 시 cache_key 위치의 저장소에서 재사용한다.
 
-    def get_aligned_script(self, stt_script: dict) -> Any:
+        Args:
+            stt_script (Union[dict, SttScript]): Clova에서 받은 STT 결과
+            cache_key (Optional[str]): 재조합 결과를 저장할 object key (ALIGNMENT_CACHE_PERSIST 설정 시 사용)
+
+        Returns:
+            Any: segments만 재조합 결과로 바꾼 STT 결과 (segments는 cache와 공유하므로 수정하면 안 됨)
+        """
         segments = stt_script["segments"]
+        if not analysis_config.alignment_cache_persist:
+            cache_key = None
 
-        concatenated_text = " ".join(map(lambda s: s["text"], segments))
-        concatenated_words = list(
-            reduce(lambda acc, cur: acc + cur["words"], segments, [])
-        )
+        segments_hash = None
+        aligned_segments = None
+        if aligned_segments_cache.maxsize > 0 or cache_key is not None:
+            segments_hash = get_segments_hash(segments)
+            aligned_segments = self._get_cached_aligned_segments(
+                segments_hash, cache_key
+            )
 
-        splitted_sentences = self._get_splitted_sentences(concatenated_text)
+        if aligned_segments is None:
+            concatenated_words = list(
+                chain.from_iterable(map(lambda s: s["words"], segments))
+            )
 
-        aligned_segments = self._get_aligned_segments(
-            concatenated_words, splitted_sentences
-        )
+            splitted_sentences = self._get_splitted_sentences_of_segments(
+                list(map(lambda s: s["text"], segments))
+            )
+
+            aligned_segments = self._get_aligned_segments(
+                concatenated_words, splitted_sentences
+            )
 
-        ret = deepcopy(stt_script)
+            if segments_hash is not None:
+                aligned_segments_cache.put(segments_hash, aligned_segments)
+                if cache_key is not None:
+                    self._save_aligned_segments(
+                        segments_hash, aligned_segments, cache_key
+                    )
+
+        # segments 외의 값은 수정하지 않으므로 얕은 복사로 충분함
+        if isinstance(stt_script, SttScript):
+            ret = stt_script.to_dict()
+        else:
+            ret = dict(stt_script)
         ret["segments"] = aligned_segments
 
         return ret
 
+    def _get_storage_service(self):
+        if self._storage_service is None:
+            from api.service.storage import get_storage_service
+
+            self._storage_service = get_storage_service()
+        return self._storage_service
+
+    def _get_cached_aligned_segments(
+        self, segments_hash: str, cache_key: Optional[str]
+    ) -> Optional[List[dict]]:
+        aligned_segments = aligned_segments_cache.get(segments_hash)
+        if aligned_segments is not None or cache_key is None:
+            return aligned_segments
+
+        try:
+            cached = self._get_storage_service().download_json_object(cache_key)
+        except Exception:
+            # 아직 저장된 재조합 결과가 없는 경우
+            return None
+
+        # 다른 STT 결과(재녹음 등)의 재조합 결과인 경우 사용하지 않음
+        if not isinstance(cached, dict) or cached.get("hash") != segments_hash:
+            return None
+
+        aligned_segments = cached["segments"]
+        for segment in aligned_segments:
+            segment["words"] = list(map(tuple, segment["words"]))
+        aligned_segments_cache.put(segments_hash, aligned_segments)
+        return aligned_segments
+
+    def _save_aligned_segments(
+        self, segments_hash: str, aligned_segments: List[dict], cache_key: str
+    ) -> None:
+        try:
+            content_encoding, level = s3_config.get_json_compression(
+                AnalysisRecordType.STT.value
+            )
+            self._get_storage_service().upload_json_object(
+                cache_key,
+                {"hash": segments_hash, "segments": aligned_segments},
+                content_encoding=content_encoding,
+                compression_level=level,
+            )
+            self.alignment_cache_write_count += 1
+        except Exception as e:
+            # cache 저장 실패는 분석 결과에 영향이 없으므로 기록만 함
+            print("[ERROR] 문장 재조합 결과 저장 실패", cache_key, repr(e))
+
     def _get_splitted_sentences(self, text: str) -> List[str]:
-        return list(map(lambda x: x.text, kiwi.split_into_sents(text)))
+        return list(map(lambda x: x.text, get_kiwi().split_into_sents(text)))
+
+    def _get_splitted_sentence_spans(self, text: str) -> List[Tuple[int, int]]:
+        return list(map(lambda x: (x.start, x.end), get_kiwi().split_into_sents(text)))
+
+    @staticmethod
+    def _get_chunks(texts: List[str], chunk_size: int) -> List[Tuple[int, str]]:
+        """
+        _summary_
+            segment 텍스트들을 순서대로 chunk_size 글자 이내로 묶는다. (segment 하나가 더 길면 단독 chunk)
+
+        Returns:
+            List[Tuple[int, str]]: (`" ".join(texts)` 에서의 chunk 시작 위치, chunk 텍스트) 목록
+        """
+        chunks = []
+        chunk_start, chunk_texts, chunk_length = 0, [], 0
+
+        position = 0
+        for text in texts:
+            if chunk_texts and chunk_length + 1 + len(text) > chunk_size:
+                chunks.append((chunk_start, " ".join(chunk_texts)))
+                chunk_start, chunk_texts, chunk_length = position, [], 0
+
+            chunk_length += len(text) + (1 if chunk_texts else 0)
+            chunk_texts.append(text)
+            position += len(text) + 1
+
+        if chunk_texts:
+            chunks.append((chunk_start, " ".join(chunk_texts)))
+
+        return chunks
+
+    @staticmethod
+    def _reconcile_chunk_edge(
+        text: str, start: int, chunk_spans: List[Tuple[int, int]]
+    ) -> Tuple[List[Tuple[int, int]], List[Tuple[int, int]]]:
+        """
+        _summary_
+            앞 chunk의 마지막 문장(start부터)과 뒤 chunk의 앞 문장들을 이어 붙여 다시 분리한다.
+            뒤 chunk의 앞 부분은 앞 문맥 없이 분리되었으므로, 이어 붙여 분리한 결과가 뒤 chunk의 문장 경계와
+            일치하는 지점이 나올 때까지 뒤 chunk의 문장을 하나씩 늘려가며 다시 분리한다.
+
+        Returns:
+            Tuple[List[Tuple[int, int]], List[Tuple[int, int]]]: (경계가 확정된 문장들, 이후 그대로 사용할 뒤 chunk의 문장들)
+        """
+        for count in range(1, len(chunk_spans) + 1):
+            end = chunk_spans[count - 1][1]
+            resplitted = [
+                (start + s.start, start + s.end)
+                for s in get_kiwi().split_into_sents(text[start:end])
+            ]
+
+            # 마지막 문장의 끝은 잘라낸 위치이므로 그 앞의 경계들만 비교
+            chunk_ends = {e: i for i, (_, e) in enumerate(chunk_spans[:count])}
+            for r_idx, (_, e) in enumerate(resplitted[:-1]):
+                if e in chunk_ends:
+                    return resplitted[: r_idx + 1], chunk_spans[chunk_ends[e] + 1 :]
+
+        return resplitted, []
+
+    def _get_splitted_sentences_of_segments(
+        self, texts: List[str], chunk_size: Optional[int] = None
+    ) -> List[str]:
+        """
+        _summary_
+            STT segment 텍스트들을 이어 붙인 전체 텍스트를 문장 단위로 분리한다.
+            전체 텍스트가 길면 segment 경계에서 chunk로 나누어 kiwi의 worker들로 동시에 분리한 뒤,
+            chunk 경계에 걸친 문장들은 이어 붙여 다시 분리한다. (`_reconcile_chunk_edge` 참고)
+            결과는 `_get_splitted_sentences(" ".join(texts))`와 같다.
+
+        Args:
+            texts (List[str]): STT segment 텍스트 목록
+            chunk_size (Optional[int]): chunk의 최대 글자 수 (없으면 설정값 사용, 0이면 나누지 않음)
+
+        Returns:
+            List[str]: 분리된 문장 목록
+        """
+        if chunk_size is None:
+            chunk_size = analysis_config.sentence_split_chunk_size
+
+        text = " ".join(texts)
+        # kiwi가 single thread 모드이면 여러 텍스트를 동시에 처리할 수 없음
+        if chunk_size <= 0 or get_kiwi().num_workers <= 1:
+            return self._get_splitted_sentences(text)
+
+        chunks = self._get_chunks(texts, chunk_size)
+        if len(chunks) <= 1:
+            return self._get_splitted_sentences(text)
+
+        # 전체 텍스트에서의 (시작 위치, 끝 위치) 목록
+        spans: List[Tuple[int, int]] = []
+        chunk_results = get_kiwi().split_into_sents(map(lambda c: c[1], chunks))
+        for (offset, _), sentences in zip(chunks, chunk_results):
+            chunk_spans = [(offset + s.start, offset + s.end) for s in sentences]
+            if spans and chunk_spans:
+                spans_of_edge, chunk_spans = self._reconcile_chunk_edge(
+                    text, spans.pop()[0], chunk_spans
+                )
+                spans.extend(spans_of_edge)
+            spans.extend(chunk_spans)
+
+        return [text[start:end] for start, end in spans]
 
     def _get_aligned_segments(
         self, words: Tuple[int, int, str], splitted_sentences: List[str]
     ) -> List[dict]:
-        # 처리할 단어의 인덱스 (Queue의 역할을 수행하며, 증가하기만 한다.)
-        c_idx = 0
+        reconstructed_segments, _, _ = self._align_sentences(words, splitted_sentences)
+        return reconstructed_segments
 
-        # 문장 앞뒤로 남아 있을 수 있는 whitespace를 전처리
-        splitted_sentences = list(map(str.strip, splitted_sentences))
+    def _align_sentences(
+        self,
+        words: Tuple[int, int, str],
+        splitted_sentences: List[str],
+        c_idx: int = 0,
+        carry: str = "",
+    ) -> Tuple[List[dict], int, str]:
+        """
+        _summary_
+            문장들에 단어들을 배정한다. 앞선 문장들의 재조합 결과에 이어서 재조합할 수 있도록,
+            시작할 단어 index와 직전 문장에서 넘어온 부분(carry)을 받고 다음에 이어갈 값들을 함께 반환한다.
 
+        Returns:
+            Tuple[List[dict], int, str]: (재조합된 문장들, 다음에 처리할 단어 index, 다음 문장 앞에 붙일 부분)
+        """
         # 스피치를 구성하는 단어를 앞에서부터 하나씩 빼서 문장을 재구성한다.
         # 이때 kiwi와 STT 결과가 서로 단어를 다른 단위로 인식한다면(예: kiwi는 '안녕하세요'를 하나의 단어로 인식하고, STT는 '안녕'과 '하세요'로 인식한다면)
         # STT의 결과를 우선적으로 사용한다.
+        # 문자열을 잘라내지 않고, 문장 안에서 현재 처리할 위치(pos)만 앞으로 옮겨가며 비교한다.
 
         # 재조합된 문장들을 담을 리스트 (element는 아래 `current`를 참고)
         reconstructed_segments = []
-        for s_idx, sentence in enumerate(splitted_sentences):
+        for sentence in splitted_sentences:
+            # 문장 앞뒤로 남아 있을 수 있는 whitespace를 전처리
+            sentence = sentence.strip()
+            if carry:
+                sentence = carry + sentence
+                carry = ""
+
             current = {
                 "start": None,
                 "end": None,
-                "text": sentence[:],
+                "text": sentence,
                 "words": [],
             }
 
-            # 원본 문자열을 수정하지 않도록 하기 위해 사용
-            processing_sentence = sentence[:]
+            pos = 0
+            length = len(sentence)
 
             # 해당 문장이 STT 결과와 kiwi 결과가 달라 깨져 있는지 여부
             broken = False
 
-            # 종료 조건: 문장이 빈 문자열이 되면 종료
+            # 종료 조건: 문장을 끝까지 처리하면 종료
             while True:
-                processing_sentence = processing_sentence.lstrip()
-                # 단 문장의 맨 앞에 현재 처리해야 할 단어가 있는지 확인하므로, 앞에 포함된 공백을 삭제함
-                if not processing_sentence:
+                # 단 문장의 맨 앞에 현재 처리해야 할 단어가 있는지 확인하므로, 앞에 포함된 공백을 건너뜀
+                while pos < length and sentence[pos].isspace():
+                    pos += 1
+                if pos == length:
                     break
 
                 # 현재 처리해야 할 단어에 대해,
                 start, end, word = words[c_idx]
-                # 현재 처리할 단어로 현재 처리할 문장이 시작된다면
-                if processing_sentence.startswith(word):
+                # 현재 처리할 단어로 현재 처리할 위치가 시작된다면
+                if sentence.startswith(word, pos):
                     # 해당 문장을 구성하는 단어로 추가하고
                     current["words"].append((start, end, word))
-                    # 해당 단어 부분만큼 삭제해줌
-                    processing_sentence = processing_sentence[len(word) :]
+                    # 해당 단어 부분만큼 위치를 옮겨줌
+                    pos += len(word)
                     # 다음 단어를 처리하기 위해 인덱스를 증가시킴
                     c_idx += 1
                 # 처리해야 할 문자가 남았으나 word로 시작되지 않는 경우, STT 결과와 kiwi 결과가 다른 깨진 문장임
                 else:
-                    # 깨져 있는 문장의 앞 부분을 삭제하고 (`안녕` + `하세요` 중 `안녕`만 현 문장에 포함된 것이므로, `안녕`을 뒤의 문장으로 붙여주는 것)
-                    current["text"] = current["text"][: -len(word)]
+                    # 현재 문장에는 배정된 단어들까지만 남기고 (`안녕` + `하세요` 중 `안녕`만 현 문장에 포함된 것이므로, `안녕`을 뒤의 문장으로 붙여주는 것)
+                    # 재조합 결과를 다시 재조합해도 같은 결과가 되도록, 텍스트는 배정된 단어들과 일치해야 함
+                    current["text"] = sentence[:pos].rstrip()
                     # 남은 부분을 다음 문장의 앞에 붙여줌
-                    splitted_sentences[s_idx + 1] = (
-                        processing_sentence + splitted_sentences[s_idx + 1]
-                    )
+                    carry = sentence[pos:]
                     # 현재 문장이 깨져 있음을 표시하고, 다음 문장으로 넘어감 (word는 아직 처리되지 않았으므로 c_idx는 그대로)
                     broken = True
                     break
@@ -115,25 +433,46 @@ class SpeechService:
             current["end"] = current["words"][-1][1]
             reconstructed_segments.append(current)
 
-        return reconstructed_segments
+        return reconstructed_segments, c_idx, carry
+
+    def begin_update(self, speech: Speech) -> ColumnUpdateUnitOfWork:
+        """
+        _summary_
+            speech의 column 변경 사항을 모았다가 한 번의 UPDATE로 반영하는 unit of work를 생성한다.
+            `update_full_audio_s3_url`, `update_analysis_info`에 전달하면 즉시 반영되지 않고 모아진다.
 
-    def update_full_audio_s3_url(self, speech: Speech, s3_url: str) -> None:
-        speech.full_audios3url = s3_url
-        self.db_client.update(speech)
+        Args:
+            speech (Speech): 갱신할 speech
+
+        Returns:
+            ColumnUpdateUnitOfWork: with 구문 종료 시(또는 flush 호출 시) 반영되는 unit of work
+        """
+        return self.db_client.unit_of_work(speech)
+
+    def update_full_audio_s3_url(
+        self,
+        speech: Speech,
+        s3_url: str,
+        unit_of_work: Optional[ColumnUpdateUnitOfWork] = None,
+    ) -> None:
+        uow = unit_of_work or self.begin_update(speech)
+        uow.set("full_audios3url", s3_url)
+
+        if unit_of_work is None:
+            uow.flush()
 
     def update_analysis_info(
         self,
         speech: Speech,
         analysis_type: Literal["avgf0", "avglpm", "feedback_count", "pause_ratio"],
         data: Union[float, int],
+        unit_of_work: Optional[ColumnUpdateUnitOfWork] = None,
     ) -> None:
-        if analysis_type == "avgf0":
-            speech.avgf0 = data
-        elif analysis_type == "avglpm":
-            speech.avglpm = data
-        elif analysis_type == "feedback_count":
-            speech.feedback_count = data
-        elif analysis_type == "pause_ratio":
-            speech.pause_ratio = data
-
-        self.db_client.update(speech)
+        if analysis_type not in ("avgf0", "avglpm", "feedback_count", "pause_ratio"):
+            return
+
+        uow = unit_of_work or self.begin_update(speech)
+        uow.set(analysis_type, data)
+
+        if unit_of_work is None:
+            uow.flush()
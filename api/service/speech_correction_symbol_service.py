@@ -1,5 +1,5 @@
 import json
-from itertools import zip_longest
+from typing import List, Optional, Tuple
 from api.data.enums import SpeechCorrectionType
 
 
@@ -10,17 +10,38 @@ class SpeechCorrectionBreakpointValue:
     PAUSE_SHORT = 400
 
 
+def get_sentence_word_ranges(concatenated_script: dict) -> List[Tuple[int, int]]:
+    """
+    _summary_
+        문장 별 (첫 단어 index, 마지막 단어 index)를 계산한다. (단어 index는 전체 스피치에서의 순서)
+
+    Args:
+        concatenated_script (dict): 문장 단위로 재조합된 STT 결과
+
+    Returns:
+        List[Tuple[int, int]]: 문장 별 (첫 단어 index, 마지막 단어 index)
+    """
+    ranges = []
+    word_index = 0
+    for segment in concatenated_script["segments"]:
+        word_count = len(segment["words"])
+        ranges.append((word_index, word_index + word_count - 1))
+        word_index += word_count
+    return ranges
+
+
 def get_speech_correction(
-    lpm_by_sentence: list, ptl_by_sentence: list, concatenated_script: list
+    lpm_by_sentence: Optional[list], ptl_by_sentence: list, concatenated_script: dict
 ):
     """
     _summary_
     속도 분석, 휴지 분석 완료 후 해당 결과를 바탕으로 교정 부호를 생성한다.
+    concatenated_script는 수정하지 않으므로 여러 분석에서 같은 객체를 공유해도 된다.
 
     Args:
-        lpm_by_sentence: list
-        ptl_by_sentence: list
-        concatenated_script: list
+        lpm_by_sentence: 문장 별 LPM (get_lpm_by_sentence의 결과, None이면 속도 교정 부호를 생성하지 않음)
+        ptl_by_sentence: 문장 간 휴지 시간 (get_ptl_by_sentence의 결과)
+        concatenated_script: 문장 단위로 재조합된 STT 결과
 
     Returns:
         {
@@ -43,34 +64,24 @@ def get_speech_correction(
     if not concatenated_script["segments"]:
         return speech_correction_list
 
-    # 원본 concatenated_script에 word index 추가
-    word_index = 0
-    for s_idx, segment in enumerate(concatenated_script["segments"]):
-        for w_idx in range(len(segment["words"])):
-            concatenated_script["segments"][s_idx]["words"][w_idx] = (
-                *concatenated_script["segments"][s_idx]["words"][w_idx],
-                word_index,
-            )
-            word_index += 1
-
-    # PTL 분석의 경우 마지막 문장 뒤에는 휴지가 없기 때문에 zip_longest를 사용한다.
-    for idx, ptl in enumerate(ptl_by_sentence):
-        # for idx, (lpm, ptl) in enumerate(zip_longest(lpm_by_sentence, ptl_by_sentence)):
-        curr_line_start_word_idx = concatenated_script["segments"][idx]["words"][0][3]
-        curr_line_end_word_idx = concatenated_script["segments"][idx]["words"][-1][3]
-
-        # LPM 분석
-        # TODO: Window 방식으로 LPM 바꿨으므로 추후 어떻게 분석 결과 넘겨줘야할지 결정해야 함.
-        # if lpm >= SpeechCorrectionBreakpointValue.LPM_FAST:
-        #     speech_correction_list[SpeechCorrectionType.TOO_FAST.value].append(
-        #         [curr_line_start_word_idx, curr_line_end_word_idx]
-        #     )
-        # elif lpm < SpeechCorrectionBreakpointValue.LPM_SLOW:
-        #     speech_correction_list[SpeechCorrectionType.TOO_SLOW.value].append(
-        #         [curr_line_start_word_idx, curr_line_end_word_idx]
-        #     )
-
-        # PTL 분석
+    sentence_word_ranges = get_sentence_word_ranges(concatenated_script)
+
+    # LPM 분석 (마지막 문장까지 모든 문장에 대해 수행)
+    if lpm_by_sentence is not None:
+        for lpm, (start_word_idx, end_word_idx) in zip(
+            lpm_by_sentence, sentence_word_ranges
+        ):
+            if lpm >= SpeechCorrectionBreakpointValue.LPM_FAST:
+                speech_correction_list[SpeechCorrectionType.TOO_FAST.value].append(
+                    [start_word_idx, end_word_idx]
+                )
+            elif lpm < SpeechCorrectionBreakpointValue.LPM_SLOW:
+                speech_correction_list[SpeechCorrectionType.TOO_SLOW.value].append(
+                    [start_word_idx, end_word_idx]
+                )
+
+    # PTL 분석의 경우 마지막 문장 뒤에는 휴지가 없으므로 마지막 문장은 제외된다.
+    for ptl, (_, curr_line_end_word_idx) in zip(ptl_by_sentence, sentence_word_ranges):
         if ptl and ptl >= SpeechCorrectionBreakpointValue.PAUSE_LONG:
             speech_correction_list[SpeechCorrectionType.PAUSE_TOO_LONG.value].append(
                 curr_line_end_word_idx
@@ -84,17 +95,27 @@ def get_speech_correction(
 
 
 if __name__ == "__main__":
-    with open(
-        "/Users/cyh/cyh/programming/wasak/research/samples/kss_concatenated_script_sample.json",
-        "r",
-    ) as f1, open(
-        "/Users/cyh/cyh/programming/wasak/research/samples/Analysis_LPM_sample.json",
-        "r",
-    ) as f2, open(
-        "/Users/cyh/cyh/programming/wasak/research/samples/Analysis_PAUSE_sample.json",
-        "r",
-    ) as f3:
-        stt = json.load(f1)
-        lpm = json.load(f2)
-        ptl = json.load(f3)
-        print(json.dumps(get_speech_correction(lpm, ptl, stt)))
+    from pathlib import Path
+
+    from api.service.stt_analysis_service import (
+        get_lpm_by_sentence,
+        get_ptl_by_sentence,
+    )
+
+    sample_path = (
+        Path(__file__).parent.parent.parent
+        / "research"
+        / "samples"
+        / "kss_concatenated_script_sample.json"
+    )
+    with open(sample_path, "r") as f:
+        stt = json.load(f)
+
+    # 문장 별 LPM / 휴지는 재조합된 STT 결과에서 계산 (stt는 수정되지 않음)
+    print(
+        json.dumps(
+            get_speech_correction(
+                get_lpm_by_sentence(stt), get_ptl_by_sentence(stt), stt
+            )
+        )
+    )
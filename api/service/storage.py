@@ -0,0 +1,259 @@
+import io
+import shutil
+import tempfile
+import threading
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Optional, Tuple
+
+from api.configs.aws.s3 import config as s3_config
+from api.configs.storage import StorageConfig, config as storage_config
+from api.utils import compression, serialization
+
+"""
+파일 저장소 추상화 모듈
+설정(STORAGE_BACKEND)에 따라 S3, 로컬 파일 시스템, 메모리 중 하나를 사용한다.
+"""
+
+
+class StorageService(ABC):
+    """
+    음성 파일과 분석 결과 JSON을 저장하는 저장소의 공통 interface
+    """
+
+    @staticmethod
+    def _get_key(object_key: str, *path: Tuple[Any]) -> str:
+        object_path = "/".join(map(str, path))
+        return f"{object_path}/{object_key}" if path else object_key
+
+    @staticmethod
+    def _encode_json(
+        json_object: Any, content_encoding: str, compression_level: int
+    ) -> Tuple[bytes, str]:
+        """
+        Returns:
+            Tuple[bytes, str]: (저장할 데이터, 실제로 적용된 Content-Encoding)
+        """
+        if not (isinstance(json_object, bytes) or isinstance(json_object, bytearray)):
+            json_object = serialization.dumps(json_object)
+
+        if (
+            content_encoding == compression.IDENTITY
+            or len(json_object) < s3_config.s3_json_compression_min_size
+        ):
+            return bytes(json_object), compression.IDENTITY
+
+        return (
+            compression.compress(json_object, content_encoding, compression_level),
+            content_encoding,
+        )
+
+    @staticmethod
+    def _decode_json(body: bytes, content_encoding: Optional[str] = None) -> Any:
+        return serialization.loads(compression.decompress(body, content_encoding))
+
+    @abstractmethod
+    def upload_object(
+        self, upload_file_path: str, object_key: str, *path: Tuple[Any]
+    ) -> str:
+        """파일을 업로드하고 URL을 반환한다."""
+
+    @abstractmethod
+    def upload_stream(
+        self, stream: BinaryIO, object_key: str, content_type: Optional[str] = None
+    ) -> str:
+        """stream을 EOF까지 읽어 업로드하고 URL을 반환한다."""
+
+    @abstractmethod
+    def upload_json_object(
+        self,
+        object_key: str,
+        json_object: Any,
+        *path: Tuple[Any],
+        content_encoding: str = compression.IDENTITY,
+        compression_level: int = 0,
+    ) -> str:
+        """객체를 JSON으로 직렬화(및 압축)하여 업로드하고 URL을 반환한다."""
+
+    @abstractmethod
+    def download_json_object(self, object_key: str) -> Any:
+        """JSON object를 다운로드하여 역직렬화한 결과를 반환한다."""
+
+    @abstractmethod
+    def download_object(self, obj_full_path: str, dest_path: str) -> str:
+        """object 하나를 파일 시스템에 다운로드하고 저장된 경로를 반환한다."""
+
+    def download_json_object_if_exists(self, object_key: str) -> Optional[Any]:
+        """JSON object를 다운로드한다. object가 없으면 None을 반환한다. (그 외의 오류는 그대로 발생)"""
+        try:
+            return self.download_json_object(object_key)
+        except FileNotFoundError:
+            return None
+
+
+class LocalStorageService(StorageService):
+    """
+    로컬 파일 시스템의 root 디렉토리 아래에 object key 경로 그대로 저장한다.
+    (AWS 없이 전체 파이프라인을 실행하거나, 중간 산출물을 로컬 디스크에 둘 때 사용)
+    """
+
+    def __init__(self, root: str, base_url: Optional[str] = None) -> None:
+        self.root = Path(root).resolve()
+        self.base_url = base_url.rstrip("/") if base_url else None
+
+    def _get_path(self, key: str) -> Path:
+        path = (self.root / key).resolve()
+        # object key에 '..' 등이 포함되어 root 밖을 가리키는 경우 방지
+        if self.root != path and self.root not in path.parents:
+            raise ValueError(f"Invalid object key: {key}")
+        return path
+
+    def _get_url(self, key: str) -> str:
+        if self.base_url:
+            return f"{self.base_url}/{key}"
+        return self._get_path(key).as_uri()
+
+    def _write(self, key: str, stream: BinaryIO) -> None:
+        path = self._get_path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        # 쓰는 도중 실패하면 이전 파일이 남아 있도록 임시 파일에 쓴 뒤 교체
+        with tempfile.NamedTemporaryFile(dir=path.parent, delete=False) as f:
+            tmp_path = Path(f.name)
+            try:
+                shutil.copyfileobj(stream, f, 1024 * 1024)
+            except BaseException:
+                f.close()
+                tmp_path.unlink()
+                raise
+        tmp_path.replace(path)
+
+    def upload_object(
+        self, upload_file_path: str, object_key: str, *path: Tuple[Any]
+    ) -> str:
+        key = self._get_key(object_key, *path)
+        with open(upload_file_path, "rb") as f:
+            self._write(key, f)
+        return self._get_url(key)
+
+    def upload_stream(
+        self, stream: BinaryIO, object_key: str, content_type: Optional[str] = None
+    ) -> str:
+        self._write(object_key, stream)
+        return self._get_url(object_key)
+
+    def upload_json_object(
+        self,
+        object_key: str,
+        json_object: Any,
+        *path: Tuple[Any],
+        content_encoding: str = compression.IDENTITY,
+        compression_level: int = 0,
+    ) -> str:
+        key = self._get_key(object_key, *path)
+        # 압축 여부는 읽을 때 magic number로 판단
+        body, _ = self._encode_json(json_object, content_encoding, compression_level)
+        self._write(key, io.BytesIO(body))
+        return self._get_url(key)
+
+    def download_json_object(self, object_key: str) -> Any:
+        return self._decode_json(self._get_path(object_key).read_bytes())
+
+    def download_object(self, obj_full_path: str, dest_path: str) -> str:
+        shutil.copyfile(self._get_path(obj_full_path), dest_path)
+        return dest_path
+
+
+class MemoryStorageService(StorageService):
+    """
+    프로세스 메모리에 object를 저장한다. (테스트 / 벤치마크용, 프로세스 종료 시 사라짐)
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        # key: (data, Content-Encoding)
+        self.objects: Dict[str, Tuple[bytes, str]] = {}
+
+    def _put(self, key: str, data: bytes, content_encoding: str) -> str:
+        with self._lock:
+            self.objects[key] = (data, content_encoding)
+        return f"memory://{key}"
+
+    def _get(self, key: str) -> Tuple[bytes, str]:
+        with self._lock:
+            if key not in self.objects:
+                raise FileNotFoundError(f"Object {key} is not found.")
+            return self.objects[key]
+
+    def upload_object(
+        self, upload_file_path: str, object_key: str, *path: Tuple[Any]
+    ) -> str:
+        with open(upload_file_path, "rb") as f:
+            data = f.read()
+        return self._put(self._get_key(object_key, *path), data, compression.IDENTITY)
+
+    def upload_stream(
+        self, stream: BinaryIO, object_key: str, content_type: Optional[str] = None
+    ) -> str:
+        chunks = []
+        while chunk := stream.read(1024 * 1024):
+            chunks.append(chunk)
+        return self._put(object_key, b"".join(chunks), compression.IDENTITY)
+
+    def upload_json_object(
+        self,
+        object_key: str,
+        json_object: Any,
+        *path: Tuple[Any],
+        content_encoding: str = compression.IDENTITY,
+        compression_level: int = 0,
+    ) -> str:
+        body, applied_encoding = self._encode_json(
+            json_object, content_encoding, compression_level
+        )
+        return self._put(self._get_key(object_key, *path), body, applied_encoding)
+
+    def download_json_object(self, object_key: str) -> Any:
+        return self._decode_json(*self._get(object_key))
+
+    def download_object(self, obj_full_path: str, dest_path: str) -> str:
+        data, _ = self._get(obj_full_path)
+        with open(dest_path, "wb") as f:
+            f.write(data)
+        return dest_path
+
+
+_storage_service: Optional[StorageService] = None
+_storage_service_lock = threading.Lock()
+
+
+def create_storage_service(config: StorageConfig) -> StorageService:
+    if config.storage_backend == "s3":
+        from api.service.aws.s3 import S3Service
+
+        return S3Service()
+    elif config.storage_backend == "local":
+        return LocalStorageService(
+            config.local_storage_root, config.local_storage_base_url
+        )
+    elif config.storage_backend == "memory":
+        return MemoryStorageService()
+    else:
+        raise ValueError(f"Unsupported storage backend: {config.storage_backend}")
+
+
+def get_storage_service() -> StorageService:
+    """
+    _summary_
+        설정된 저장소를 반환한다. 프로세스 내에서는 같은 객체를 공유한다.
+        (memory 저장소의 경우 controller와 AnalysisRecordService가 같은 object들을 봐야 하므로)
+
+    Returns:
+        StorageService: 설정(STORAGE_BACKEND)에 맞는 저장소
+    """
+    global _storage_service
+
+    with _storage_service_lock:
+        if _storage_service is None:
+            _storage_service = create_storage_service(storage_config)
+        return _storage_service
@@ -1,9 +1,14 @@
 from collections import Counter
 import json
-from typing import Tuple, List
+from typing import Iterable, List, Literal, Tuple, Union
 
+import numpy as np
 
-def get_average_lpm(stt_json: dict) -> int:
+from api.data.stt import SttScript
+from api.service.stt_metrics_service import WordTable
+
+
+def get_average_lpm(stt_json: Union[dict, SttScript]) -> int:
     """
     _summary_
         STT 결과를 분석하여 LPM (Letters per minute)을 계산한다.
@@ -26,7 +31,7 @@ def get_average_lpm(stt_json: dict) -> int:
     return len(only_letters_text) / (stt_json["segments"][-1]["end"] / 1000 / 60)
 
 
-def get_lpm_by_sentence(stt_json: dict) -> List[Tuple[int, int, str]]:
+def get_lpm_by_sentence(stt_json: Union[dict, SttScript]) -> List[Tuple[int, int, str]]:
     """
     _summary_
         모든 segments 들을 순회하며 words 별로 걸린 시간 및 글자 수를 합산, '.'를 만나면 문장의 끝으로 판단하여 lpm_by_sentence를 계산한다.
@@ -49,7 +54,7 @@ def get_lpm_by_sentence(stt_json: dict) -> List[Tuple[int, int, str]]:
     return lpm_by_sentence
 
 
-def get_lpm_by_sentence_v2(stt_json: dict) -> List[int]:
+def get_lpm_by_sentence_v2(stt_json: Union[dict, SttScript]) -> List[int]:
     """
     _summary_
         모든 segments 들을 순회하며 words 별로 걸린 시간 및 글자 수를 합산, '.'를 만나면 문장의 끝으로 판단하여 lpm_by_sentence를 계산한다.
@@ -94,7 +99,7 @@ def get_lpm_by_sentence_v2(stt_json: dict) -> List[int]:
     return word_speed_list
 
 
-def get_lpm_by_word(stt_json: dict) -> List[int]:
+def get_lpm_by_word(stt_json: Union[dict, SttScript]) -> List[int]:
     """
     _summary_
         단어 별로 lpm 계산
@@ -118,86 +123,135 @@ def get_lpm_by_word(stt_json: dict) -> List[int]:
     return lpm_by_word
 
 
-def get_lpm_heatmap(stt_json: dict) -> List[int]:
+# 단어 속도 구간 window의 양 끝 처리 방식
+# - "legacy": 기존 방식 (앞 부분 window는 다음 단어의 끝 시각까지를 구간으로 보고 450 LPM 기준 적용, 마지막 온전한 window 제외)
+# - "symmetric": 앞 / 뒤 끝에서 잘린 window를 모두 적용하여 모든 단어가 같은 수(window size)의 window에 포함됨
+# - "full": 잘리지 않은 window만 적용 (양 끝의 단어는 더 적은 수의 window에 포함됨)
+EdgePolicy = Literal["legacy", "symmetric", "full"]
+
+LPM_HEATMAP_FAST = 400
+LPM_HEATMAP_SLOW = 300
+LPM_HEATMAP_LEGACY_HEAD_FAST = 450
+
+
+def _get_heatmap_windows(
+    word_count: int, window_size: int, edge_policy: EdgePolicy
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+            window 별 (첫 단어 index, 마지막 단어 index + 1, 끝 시각으로 사용할 단어 index, 빠름 기준 LPM)
+    """
+    n, w = word_count, window_size
+    head = np.arange(1, w)
+    full = np.arange(0, n - w + 1)
+    tail = np.arange(n - w + 1, n)
+
+    if edge_policy == "legacy":
+        full = full[:-1]
+        tail = np.arange(n - w, n)
+        begins = [np.zeros_like(head), full, tail]
+        ends = [head, full + w, np.full_like(tail, n)]
+        end_words = [head, full + w - 1, np.full_like(tail, n - 1)]
+        fast = [
+            np.full(len(head), LPM_HEATMAP_LEGACY_HEAD_FAST),
+            np.full(len(full) + len(tail), LPM_HEATMAP_FAST),
+        ]
+    elif edge_policy == "symmetric":
+        begins = [np.zeros_like(head), full, tail]
+        ends = [head, full + w, np.full_like(tail, n)]
+        end_words = [end - 1 for end in ends]
+        fast = [np.full(len(head) + len(full) + len(tail), LPM_HEATMAP_FAST)]
+    elif edge_policy == "full":
+        begins, ends, end_words = [full], [full + w], [full + w - 1]
+        fast = [np.full(len(full), LPM_HEATMAP_FAST)]
+    else:
+        raise ValueError(f"Unsupported edge policy: {edge_policy}")
+
+    return tuple(map(np.concatenate, (begins, ends, end_words, fast)))
+
+
+def get_lpm_heatmaps(
+    stt_json: Union[dict, SttScript],
+    window_sizes: Iterable[int],
+    edge_policy: EdgePolicy = "legacy",
+) -> List[dict]:
     """
     _summary_
+        여러 window size에 대해 get_lpm_heatmap을 한 번에 계산한다.
+        글자 수의 누적 합으로 window 별 LPM을 구하고, window 별 +1 / -1을 차분 배열로 누적하므로
+        window size와 관계 없이 단어 수에 비례하는 시간이 걸린다.
 
     Args:
         stt_json (dict): Clova에서 받은 STT 결과를 reconstruct한 json
+        window_sizes (Iterable[int]): window에 포함할 단어 수 목록
+        edge_policy (EdgePolicy): 양 끝 window 처리 방식 (EdgePolicy 참고)
 
     Returns:
-        List[int]: 단어별 속도를 -10 ~ +10으로 분석
+        List[dict]: window_sizes 순서대로 {"WINDOW_SIZE": window size, "speed_list": 단어별 속도}
     """
-    # FIXME: 앞 뒤로 공평하게 선택되도록 초반과 후반의 item들에게 중복 window 적용 필요
-    WINDOW_SIZE_CONSTANT = 5
-
-    def get_lpm(start_time: int, end_time: int, letter_count: int):
-        return letter_count / (end_time - start_time) * 1000 * 60
-
-    words = []
-
-    # 모든 단어에 word_index를 붙여서 unpack
-    word_index = 0
-    for s_idx, segment in enumerate(stt_json["segments"]):
-        for w_idx in range(len(segment["words"])):
-            words.append(
-                (
-                    *stt_json["segments"][s_idx]["words"][w_idx],
-                    word_index,
-                )
+    table = WordTable(stt_json)
+    n = len(table)
+    letter_prefix_sum = np.concatenate(([0], np.cumsum(table.letter_count)))
+
+    results = []
+    for window_size in window_sizes:
+        if window_size < 1:
+            raise ValueError(f"Invalid window size: {window_size}")
+
+        # Window Size 보다 word length가 짧으면 에러나서 수정
+        window_size = min(window_size, n)
+        if window_size == 0:
+            results.append({"WINDOW_SIZE": 0, "speed_list": []})
+            continue
+
+        begins, ends, end_words, fast = _get_heatmap_windows(
+            n, window_size, edge_policy
+        )
+
+        letter_count = letter_prefix_sum[ends] - letter_prefix_sum[begins]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            lpm = (
+                letter_count / (table.end[end_words] - table.start[begins]) * 1000 * 60
             )
-            word_index += 1
+        delta = np.where(lpm > fast, 1, np.where(lpm < LPM_HEATMAP_SLOW, -1, 0))
 
-    word_speed = [0] * len(words)
+        # window 범위 [begin, end)에 delta를 더하는 것을 차분 배열로 한 번에 처리
+        diff = np.zeros(n + 1, dtype=np.int64)
+        np.add.at(diff, begins, delta)
+        np.add.at(diff, ends, -delta)
 
-    # Window Size 보다 word length가 짧으면 에러나서 수정
-    WINDOW_SIZE = min(WINDOW_SIZE_CONSTANT, len(words))
+        results.append(
+            {
+                "WINDOW_SIZE": window_size,
+                "speed_list": np.cumsum(diff[:-1]).tolist(),
+            }
+        )
 
-    # 앞에서 잘리는 부분 따로 window 선택해줌
-    for idx in range(WINDOW_SIZE - 1):
-        start_time = words[0][0]
-        end_time = words[idx + 1][1]
-        letter_count = sum([len(w[2]) for w in words[: idx + 1]])
+    return results
 
-        lpm = get_lpm(start_time, end_time, letter_count)
-        if lpm > 450:
-            word_speed[: idx + 1] = [x + 1 for x in word_speed[: idx + 1]]
-        elif lpm < 300:
-            word_speed[: idx + 1] = [x - 1 for x in word_speed[: idx + 1]]
 
-    # 앞 뒤 제외 동일한 비중으로 선택되는 window 선택지
-    for idx in range(len(words) - WINDOW_SIZE):
-        start_time = words[idx][0]
-        end_time = words[idx + WINDOW_SIZE - 1][1]
-        letter_count = sum([len(w[2]) for w in words[idx : idx + WINDOW_SIZE]])
-
-        lpm = get_lpm(start_time, end_time, letter_count)
-        if lpm > 400:
-            word_speed[idx : idx + WINDOW_SIZE] = [
-                x + 1 for x in word_speed[idx : idx + WINDOW_SIZE]
-            ]
-        elif lpm < 300:
-            word_speed[idx : idx + WINDOW_SIZE] = [
-                x - 1 for x in word_speed[idx : idx + WINDOW_SIZE]
-            ]
-
-    # 뒤에서 잘리는 부분 따로 window 선택해줌
-    for idx in range(len(words) - WINDOW_SIZE, len(words)):
-        start_time = words[idx][0]
-        end_time = words[-1][1]
-        letter_count = sum([len(w[2]) for w in words[idx:]])
+def get_lpm_heatmap(
+    stt_json: Union[dict, SttScript],
+    window_size: int = 5,
+    edge_policy: EdgePolicy = "legacy",
+) -> dict:
+    """
+    _summary_
+        연속된 window_size개의 단어 구간마다 LPM을 계산하여, 빠른 구간에 포함된 단어는 +1, 느린 구간에 포함된 단어는 -1 한다.
 
-        lpm = get_lpm(start_time, end_time, letter_count)
-        if lpm > 400:
-            word_speed[idx:] = [x + 1 for x in word_speed[idx:]]
-        elif lpm < 300:
-            word_speed[idx:] = [x - 1 for x in word_speed[idx:]]
+    Args:
+        stt_json (dict): Clova에서 받은 STT 결과를 reconstruct한 json
+        window_size (int): window에 포함할 단어 수
+        edge_policy (EdgePolicy): 양 끝 window 처리 방식 (EdgePolicy 참고)
 
-    result = {"WINDOW_SIZE": WINDOW_SIZE, "speed_list": word_speed}
-    return result
+    Returns:
+        dict: {"WINDOW_SIZE": window size, "speed_list": 단어별 속도를 -10 ~ +10으로 분석}
+    """
+    return get_lpm_heatmaps(stt_json, [window_size], edge_policy)[0]
 
 
-def get_ptl_by_sentence(stt_json: dict):
+def get_ptl_by_sentence(stt_json: Union[dict, SttScript]):
     """
     _summary_
         마침표 등의 기호로 문장의 끝을 판단하고 이후 이어지는 문장까지
@@ -219,7 +273,7 @@ def get_ptl_by_sentence(stt_json: dict):
     return ptl_by_sentence
 
 
-def get_ptl_ratio(stt_json: dict):
+def get_ptl_ratio(stt_json: Union[dict, SttScript]):
     """
     _summary_
         ptl (pause time length) 계산 함수
@@ -0,0 +1,223 @@
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+
+from api.data.enums import SpeechCorrectionType
+from api.data.stt import SttScript
+from api.service.speech_correction_symbol_service import (
+    SpeechCorrectionBreakpointValue,
+)
+
+"""
+문장 단위로 재조합된 STT 결과의 휴지 / LPM / 교정 부호 분석 모듈
+재조합된 STT 결과를 한 번만 순회하여 단어 / 문장 별 배열(WordTable)로 만든 뒤, 모든 분석을 배열 연산으로 수행한다.
+결과는 stt_analysis_service의 각 함수 및 get_speech_correction의 결과와 같다.
+"""
+
+
+class WordTable:
+    """
+    재조합된 STT 결과를 단어 / 문장 별 NumPy 배열로 표현한다.
+    i번째 문장의 단어들은 `sentence_offsets[i]` 부터 `sentence_offsets[i + 1]` 전까지의 index를 갖는다.
+    """
+
+    def __init__(self, stt_json: Union[dict, SttScript]) -> None:
+        segments = stt_json["segments"]
+        words = [w for s in segments for w in s["words"]]
+
+        # 단어 별 시작 / 끝 millisecond, 공백을 제외한 글자 수, 속한 문장의 index
+        if isinstance(stt_json, SttScript):
+            starts = (w.start for w in words)
+            ends = (w.end for w in words)
+            letter_counts = (len(w.word.replace(" ", "")) for w in words)
+        else:
+            starts = (w[0] for w in words)
+            ends = (w[1] for w in words)
+            letter_counts = (len(w[2].replace(" ", "")) for w in words)
+
+        self.start: np.ndarray = np.fromiter(starts, dtype=np.int64, count=len(words))
+        self.end: np.ndarray = np.fromiter(ends, dtype=np.int64, count=len(words))
+        self.letter_count: np.ndarray = np.fromiter(
+            letter_counts, dtype=np.int64, count=len(words)
+        )
+
+        sentence_word_count = np.fromiter(
+            (len(s["words"]) for s in segments), dtype=np.int64, count=len(segments)
+        )
+        self.sentence_offsets: np.ndarray = np.concatenate(
+            ([0], np.cumsum(sentence_word_count))
+        )
+        self.sentence_id: np.ndarray = np.repeat(
+            np.arange(len(segments)), sentence_word_count
+        )
+
+        # 문장 별 시작 / 끝 millisecond, 공백과 마침표를 제외한 글자 수
+        self.sentence_start: np.ndarray = np.fromiter(
+            (s["start"] for s in segments), dtype=np.int64, count=len(segments)
+        )
+        self.sentence_end: np.ndarray = np.fromiter(
+            (s["end"] for s in segments), dtype=np.int64, count=len(segments)
+        )
+        self.sentence_letter_count: np.ndarray = np.fromiter(
+            (len(s["text"].replace(" ", "").replace(".", "")) for s in segments),
+            dtype=np.int64,
+            count=len(segments),
+        )
+
+        # 전체 텍스트의 공백과 마침표를 제외한 글자 수
+        self.total_letter_count = len(
+            stt_json["text"].replace(" ", "").replace(".", "")
+        )
+
+    def __len__(self) -> int:
+        return len(self.start)
+
+    @property
+    def sentence_count(self) -> int:
+        return len(self.sentence_start)
+
+
+class SttMetrics:
+    def __init__(self) -> None:
+        # 문장 간 휴지 시간 (get_ptl_by_sentence)
+        self.ptl_by_sentence: List[int] = []
+        # 문장 별 LPM (get_lpm_by_sentence)
+        self.lpm_by_sentence: List[float] = []
+        # 단어 별 속도 구분 -2 ~ 2 (get_lpm_by_sentence_v2)
+        self.word_speed: List[int] = []
+        # 휴지로 판단한 시간의 합 (ms)
+        self.paused_time: int = 0
+        # 휴지 비율 (get_ptl_ratio)
+        self.ptl_ratio: float = 100.0
+        # 평균 LPM (get_average_lpm)
+        self.average_lpm: float = 0.0
+        # 교정 부호 (get_speech_correction)
+        self.speech_correction: Dict[str, list] = {}
+
+
+def _get_lpm(letter_count: np.ndarray, start: np.ndarray, end: np.ndarray):
+    # 기존 함수들과 같은 순서로 계산하여 float 결과가 같도록 함
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return letter_count / (end - start) * 1000 * 60
+
+
+def get_word_speed(table: WordTable, lpm_by_sentence: np.ndarray) -> np.ndarray:
+    """
+    _summary_
+        get_lpm_by_sentence_v2와 같이 LPM이 400을 넘는 문장의 단어는 2(단어 LPM 400 초과) / 1,
+        300 미만인 문장의 단어는 -2(단어 LPM 300 미만) / -1, 이외 문장의 단어는 0으로 구분한다.
+    """
+    sentence_lpm = lpm_by_sentence[table.sentence_id]
+    word_lpm = _get_lpm(table.letter_count, table.start, table.end)
+
+    fast_sentence = sentence_lpm > 400
+    slow_sentence = ~fast_sentence & (sentence_lpm < 300)
+
+    word_speed = np.zeros(len(table), dtype=np.int64)
+    word_speed[fast_sentence] = np.where(word_lpm[fast_sentence] > 400, 2, 1)
+    word_speed[slow_sentence] = np.where(word_lpm[slow_sentence] < 300, -2, -1)
+    return word_speed
+
+
+def get_paused_time(table: WordTable) -> int:
+    """
+    _summary_
+        stt_analysis_service.get_ptl_ratio와 같이 같은 문장 안의 단어 사이 시간을 모두 합산하고,
+        단어가 하나뿐인 문장은 직전 문장의 마지막 단어와의 사이 시간도 합산한다.
+    """
+    gaps = table.start[1:] - table.end[:-1]
+    same_sentence = table.sentence_id[1:] == table.sentence_id[:-1]
+
+    sentence_word_count = np.diff(table.sentence_offsets)
+    single_word_sentence = sentence_word_count[table.sentence_id[1:]] == 1
+
+    return int(gaps[same_sentence | single_word_sentence].sum())
+
+
+def get_ptl_ratio(table: WordTable) -> float:
+    if table.sentence_count == 0:
+        return 100.0
+    return get_paused_time(table) / int(table.sentence_end[-1]) * 100
+
+
+def get_speech_correction(
+    table: WordTable,
+    ptl_by_sentence: np.ndarray,
+    lpm_by_sentence: Optional[np.ndarray] = None,
+) -> Dict[str, list]:
+    """
+    _summary_
+        speech_correction_symbol_service.get_speech_correction과 같이 문장 간 휴지가 너무 길거나 짧은 문장의
+        마지막 단어 index를, 문장 별 LPM이 주어지면 너무 빠르거나 느린 문장의 [첫 단어 index, 마지막 단어 index]를
+        교정 부호로 반환한다. (휴지가 0인 경우 제외)
+    """
+    speech_correction_list = {
+        SpeechCorrectionType.TOO_FAST.value: [],
+        SpeechCorrectionType.TOO_SLOW.value: [],
+        SpeechCorrectionType.PAUSE_TOO_LONG.value: [],
+        SpeechCorrectionType.PAUSE_TOO_SHORT.value: [],
+    }
+
+    if table.sentence_count == 0:
+        return speech_correction_list
+
+    if lpm_by_sentence is not None:
+        word_ranges = np.stack(
+            (table.sentence_offsets[:-1], table.sentence_offsets[1:] - 1), axis=1
+        )
+        fast = lpm_by_sentence >= SpeechCorrectionBreakpointValue.LPM_FAST
+        slow = ~fast & (lpm_by_sentence < SpeechCorrectionBreakpointValue.LPM_SLOW)
+        too_fast, too_slow = word_ranges[fast].tolist(), word_ranges[slow].tolist()
+        speech_correction_list[SpeechCorrectionType.TOO_FAST.value] = too_fast
+        speech_correction_list[SpeechCorrectionType.TOO_SLOW.value] = too_slow
+
+    end_word_index = table.sentence_offsets[1 : len(ptl_by_sentence) + 1] - 1
+    paused = ptl_by_sentence != 0
+
+    speech_correction_list[SpeechCorrectionType.PAUSE_TOO_LONG.value] = end_word_index[
+        paused & (ptl_by_sentence >= SpeechCorrectionBreakpointValue.PAUSE_LONG)
+    ].tolist()
+    speech_correction_list[SpeechCorrectionType.PAUSE_TOO_SHORT.value] = end_word_index[
+        paused & (ptl_by_sentence < SpeechCorrectionBreakpointValue.PAUSE_SHORT)
+    ].tolist()
+
+    return speech_correction_list
+
+
+def get_stt_metrics(
+    stt_json: Union[dict, SttScript], lpm_correction: bool = False
+) -> SttMetrics:
+    """
+    _summary_
+        재조합된 STT 결과로 휴지, LPM, 교정 부호 분석을 한 번에 수행한다.
+        입력은 수정하지 않으므로 같은 STT 결과를 여러 분석에서 공유해도 된다.
+
+    Args:
+        stt_json (Union[dict, SttScript]): Clova에서 받은 STT 결과를 reconstruct한 json
+        lpm_correction (bool): 문장 별 LPM으로 속도 교정 부호(TOO_FAST / TOO_SLOW)를 생성할지 여부
+
+    Returns:
+        SttMetrics: 분석 결과
+    """
+    table = WordTable(stt_json)
+    metrics = SttMetrics()
+
+    ptl_by_sentence = table.sentence_start[1:] - table.sentence_end[:-1]
+    lpm_by_sentence = _get_lpm(
+        table.sentence_letter_count, table.sentence_start, table.sentence_end
+    )
+
+    metrics.ptl_by_sentence = ptl_by_sentence.tolist()
+    metrics.lpm_by_sentence = lpm_by_sentence.tolist()
+    metrics.word_speed = get_word_speed(table, lpm_by_sentence).tolist()
+    metrics.paused_time = get_paused_time(table)
+    metrics.ptl_ratio = get_ptl_ratio(table)
+    if table.sentence_count:
+        metrics.average_lpm = table.total_letter_count / (
+            int(table.sentence_end[-1]) / 1000 / 60
+        )
+    metrics.speech_correction = get_speech_correction(
+        table, ptl_by_sentence, lpm_by_sentence if lpm_correction else None
+    )
+
+    return metrics
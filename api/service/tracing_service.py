@@ -0,0 +1,291 @@
+import json
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from sqlalchemy import Engine, event
+
+from api.configs.tracing import TracingConfig
+from api.configs.tracing import config as tracing_config
+
+"""
+분석 pipeline의 trace span 기록 모듈
+하나의 speech에 대한 analysis-1 -> Clova STT -> analysis-2 처리는 서로 다른 요청에서 수행되므로,
+trace context를 W3C traceparent(`00-{trace id}-{span id}-01`) 형식으로 callback_url에 실어 보내고
+analysis-2 요청의 traceparent header(또는 query parameter)로 이어받아 같은 trace로 기록한다.
+
+S3 요청, Clova STT 요청, SQL 문(SQLAlchemy event)도 진행 중인 작업의 span으로 기록한다.
+span은 작업(background task) 단위로 모았다가 작업이 끝나면 JSON Lines 파일에 한 번에 기록한다.
+기록된 파일은 research/trace_report.py로 speech 별 처리 시간과 critical path를 확인할 수 있다.
+"""
+
+TRACEPARENT = "traceparent"
+
+_TRACEPARENT_PATTERN = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-[0-9a-f]{2}$")
+
+_current_span: ContextVar[Optional["Span"]] = ContextVar("current_span", default=None)
+
+
+def parse_traceparent(traceparent: Optional[str]) -> Optional[Tuple[str, str]]:
+    """
+    _summary_
+        traceparent 값을 (trace id, parent span id)로 변환한다. 형식이 잘못된 경우 None을 반환한다.
+    """
+    if not traceparent:
+        return None
+    match = _TRACEPARENT_PATTERN.match(traceparent.strip().lower())
+    if match is None or set(match.group(1)) == {"0"} or set(match.group(2)) == {"0"}:
+        return None
+    return match.group(1), match.group(2)
+
+
+def inject_traceparent(url: str, traceparent: Optional[str]) -> str:
+    """
+    _summary_
+        url의 query parameter에 traceparent를 추가한다. (이미 있으면 교체, traceparent가 없으면 url 그대로 반환)
+    """
+    if not traceparent:
+        return url
+    parts = urlsplit(url)
+    query = [
+        (k, v)
+        for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if k != TRACEPARENT
+    ]
+    query.append((TRACEPARENT, traceparent))
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+
+def extract_traceparent(headers: Any, query_params: Any) -> Optional[str]:
+    """
+    _summary_
+        요청의 traceparent header를, 없으면 traceparent query parameter를 반환한다.
+    """
+    return headers.get(TRACEPARENT) or query_params.get(TRACEPARENT)
+
+
+class Span:
+    def __init__(
+        self,
+        trace: "_Trace",
+        name: str,
+        parent_id: Optional[str],
+        attributes: Dict[str, Any],
+    ) -> None:
+        self.trace = trace
+        self.name = name
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent_id
+        self.attributes = attributes
+        self.start_time = time.time()
+        self._started_at = time.perf_counter()
+        self.duration: Optional[float] = None
+        self.error: Optional[str] = None
+
+    @property
+    def traceparent(self) -> str:
+        return f"00-{self.trace.trace_id}-{self.span_id}-01"
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def record_exception(self, e: BaseException) -> None:
+        self.error = repr(e)
+
+    def end(self) -> None:
+        if self.duration is not None:
+            return
+        self.duration = time.perf_counter() - self._started_at
+        self.trace.add(self)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "trace_id": self.trace.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start": self.start_time,
+            "duration": self.duration,
+            "status": "error" if self.error is not None else "ok",
+            "error": self.error,
+            "attributes": {**self.trace.attributes, **self.attributes},
+            "pid": os.getpid(),
+        }
+
+
+class _Trace:
+    """
+    한 작업에서 기록한 span들
+    작업 단위 attribute(presentation_id, speech_id 등)는 모든 span에 함께 기록한다.
+    """
+
+    def __init__(self, trace_id: str, attributes: Dict[str, Any]) -> None:
+        self.trace_id = trace_id
+        self.attributes = attributes
+        self._lock = threading.Lock()
+        self.spans: List[Span] = []
+
+    def add(self, span: Span) -> None:
+        with self._lock:
+            self.spans.append(span)
+
+
+class JsonlSpanExporter:
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+
+    def export(self, spans: List[Span]) -> None:
+        data = "".join(
+            json.dumps(span.to_dict(), ensure_ascii=False) + "\n" for span in spans
+        ).encode()
+        with self._lock:
+            # O_APPEND로 한 번에 기록하여 prefork worker들이 같은 파일에 기록해도 줄이 섞이지 않도록 함
+            fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.write(fd, data)
+            finally:
+                os.close(fd)
+
+
+class Tracer:
+    """
+    작업의 root span은 start_trace로, 그 안의 단계 / S3 / DB / Clova 요청은 span으로 기록한다.
+    tracing이 꺼져 있거나 진행 중인 trace가 없으면 span은 아무것도 기록하지 않는다.
+    """
+
+    def __init__(
+        self, config: TracingConfig, exporter: Optional[JsonlSpanExporter] = None
+    ) -> None:
+        self.config = config
+        self._exporter = exporter
+
+    @property
+    def exporter(self) -> JsonlSpanExporter:
+        if self._exporter is None:
+            self._exporter = JsonlSpanExporter(self.config.tracing_export_path)
+        return self._exporter
+
+    @contextmanager
+    def start_trace(self, name: str, traceparent: Optional[str] = None, **attributes):
+        """
+        _summary_
+            작업의 root span을 시작한다. with 블록이 끝나면 작업에서 기록한 span들을 내보낸다.
+
+        Args:
+            name (str): span 이름 (예: "analysis-1")
+            traceparent (Optional[str]): 이어받을 trace context (없거나 잘못된 값이면 새 trace 시작)
+            **attributes: 작업의 모든 span에 기록할 값 (presentation_id, speech_id 등)
+        """
+        if not self.config.tracing_enabled:
+            yield None
+            return
+
+        trace_context = parse_traceparent(traceparent)
+        if trace_context is None:
+            trace_context = (os.urandom(16).hex(), None)
+        trace_id, parent_id = trace_context
+
+        trace = _Trace(trace_id, attributes)
+        span = Span(trace, name, parent_id, {})
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.record_exception(e)
+            raise
+        finally:
+            _current_span.reset(token)
+            span.end()
+            try:
+                self.exporter.export(trace.spans)
+            except Exception as e:
+                print("[ERROR] trace 기록 실패", repr(e))
+
+    def start_span(self, name: str, **attributes) -> Optional[Span]:
+        """
+        _summary_
+            현재 span의 하위 span을 만든다. 끝낼 때 end를 직접 호출해야 하며, 현재 span은 바뀌지 않는다.
+            (SQLAlchemy event처럼 시작과 끝이 서로 다른 callback인 경우 사용)
+        """
+        parent = _current_span.get()
+        if parent is None:
+            return None
+        return Span(parent.trace, name, parent.span_id, attributes)
+
+    @contextmanager
+    def span(self, name: str, **attributes):
+        """
+        with 블록을 현재 span의 하위 span으로 기록한다.
+        """
+        span = self.start_span(name, **attributes)
+        if span is None:
+            yield None
+            return
+
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.record_exception(e)
+            raise
+        finally:
+            _current_span.reset(token)
+            span.end()
+
+    def get_current_span(self) -> Optional[Span]:
+        return _current_span.get()
+
+    def get_traceparent(self) -> Optional[str]:
+        """
+        _summary_
+            다른 요청으로 이어지는 작업에 전달할 현재 span의 traceparent (진행 중인 trace가 없으면 None)
+        """
+        span = _current_span.get()
+        return span.traceparent if span is not None else None
+
+    def record_exception(self, e: BaseException) -> None:
+        """
+        _summary_
+            현재 span을 실패로 기록한다. (작업 함수가 예외를 직접 처리하는 경우 사용)
+        """
+        span = _current_span.get()
+        if span is not None:
+            span.record_exception(e)
+
+
+tracer = Tracer(tracing_config)
+
+
+def _on_before_cursor_execute(
+    conn, cursor, statement, parameters, context, executemany
+) -> None:
+    # parameter 값은 기록하지 않고 SQL 문만 기록
+    context._trace_span = tracer.start_span("db.query", statement=statement[:200])
+
+
+def _on_after_cursor_execute(
+    conn, cursor, statement, parameters, context, executemany
+) -> None:
+    span = getattr(context, "_trace_span", None)
+    if span is not None:
+        span.set_attribute("rowcount", cursor.rowcount)
+        span.end()
+
+
+def _on_handle_error(exception_context) -> None:
+    span = getattr(exception_context.execution_context, "_trace_span", None)
+    if span is not None:
+        span.record_exception(exception_context.original_exception)
+        span.end()
+
+
+# 모든 engine(AsyncEngine의 sync_engine 포함)에서 실행되는 SQL 문을 기록
+event.listen(Engine, "before_cursor_execute", _on_before_cursor_execute)
+event.listen(Engine, "after_cursor_execute", _on_after_cursor_execute)
+event.listen(Engine, "handle_error", _on_handle_error)
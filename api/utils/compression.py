@@ -0,0 +1,75 @@
+import gzip
+from typing import Optional
+
+"""
+S3에 저장하는 object의 압축 / 해제 모듈
+Content-Encoding 헤더 값("gzip", "zstd")을 압축 방식의 이름으로 사용한다.
+"""
+
+IDENTITY = "identity"
+GZIP = "gzip"
+ZSTD = "zstd"
+
+GZIP_MAGIC = b"\x1f\x8b"
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+
+def compress(data: bytes, content_encoding: str, level: int) -> bytes:
+    """
+    _summary_
+        data를 content_encoding 방식으로 압축한다.
+
+    Args:
+        data (bytes): 압축할 데이터
+        content_encoding (str): "identity", "gzip", "zstd" 중 하나
+        level (int): 압축 레벨 (gzip: 1 ~ 9, zstd: 1 ~ 22)
+
+    Raises:
+        ValueError: 지원하지 않는 content_encoding인 경우
+
+    Returns:
+        bytes: 압축된 데이터
+    """
+    if content_encoding == IDENTITY:
+        return data
+    elif content_encoding == GZIP:
+        # mtime을 고정하여 같은 데이터는 항상 같은 결과가 나오도록 함
+        return gzip.compress(data, compresslevel=level, mtime=0)
+    elif content_encoding == ZSTD:
+        import zstandard
+
+        return zstandard.ZstdCompressor(level=level).compress(data)
+    else:
+        raise ValueError(f"Unsupported content encoding: {content_encoding}")
+
+
+def decompress(data: bytes, content_encoding: Optional[str] = None) -> bytes:
+    """
+    _summary_
+        압축된 data를 해제한다.
+        content_encoding이 없는 경우 magic number로 압축 방식을 판단하며, 압축되지 않은 데이터는 그대로 반환한다.
+
+    Args:
+        data (bytes): 압축된 데이터
+        content_encoding (Optional[str]): S3 object의 Content-Encoding
+
+    Returns:
+        bytes: 압축 해제된 데이터
+    """
+    if not content_encoding or content_encoding == IDENTITY:
+        if data.startswith(GZIP_MAGIC):
+            content_encoding = GZIP
+        elif data.startswith(ZSTD_MAGIC):
+            content_encoding = ZSTD
+        else:
+            return data
+
+    if content_encoding == GZIP:
+        return gzip.decompress(data)
+    elif content_encoding == ZSTD:
+        import zstandard
+
+        # 압축 시 content size가 기록되므로 별도 크기 지정 없이 해제 가능
+        return zstandard.ZstdDecompressor().decompress(data)
+    else:
+        raise ValueError(f"Unsupported content encoding: {content_encoding}")
@@ -0,0 +1,56 @@
+import json
+from typing import Any, Union
+
+import orjson
+
+"""
+분석 결과 JSON 직렬화 / 역직렬화 모듈
+S3에 저장하는 모든 JSON object는 이 모듈을 통해 한 번만 인코딩한다.
+"""
+
+
+def dumps(obj: Any) -> bytes:
+    """
+    _summary_
+        객체를 UTF-8 JSON bytes로 직렬화한다.
+        NumPy 배열 / scalar는 `.tolist()` 없이 그대로 직렬화되며, NaN / Infinity는 null로 저장된다.
+
+    Args:
+        obj (Any): 직렬화할 객체
+
+    Returns:
+        bytes: UTF-8로 인코딩된 JSON
+    """
+    return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY)
+
+
+def _loads(data: Union[bytes, str]) -> Any:
+    try:
+        return orjson.loads(data)
+    except orjson.JSONDecodeError:
+        # 이전 버전에서 저장된 객체에는 표준 JSON이 아닌 NaN 등이 포함되어 있을 수 있음
+        return json.loads(data)
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """
+    _summary_
+        JSON을 역직렬화한다.
+        이전 버전에서 이중으로 인코딩되어 저장된 객체(JSON 문자열로 감싸진 JSON)도 함께 처리한다.
+
+    Args:
+        data (Union[bytes, str]): JSON bytes 또는 문자열
+
+    Returns:
+        Any: 역직렬화된 객체
+    """
+    result = _loads(data)
+
+    if isinstance(result, str):
+        try:
+            result = _loads(result)
+        except ValueError:
+            # JSON 문자열이 아닌 단순 문자열 값인 경우 그대로 반환
+            pass
+
+    return result
@@ -3,7 +3,15 @@ from fastapi import FastAPI
 app = FastAPI()
 
 from api.controller.info import app as info_app
+from api.controller.metrics import app as metrics_app
 from api.controller.speech import app as speech_app
+from api.data.engine import engine_registry
 
 app.mount("/api/v1/info", info_app)
+app.mount("/api/v1/metrics", metrics_app)
 app.mount("/api/v1/presentations", speech_app)
+
+
+@app.on_event("shutdown")
+async def dispose_engines():
+    await engine_registry.dispose()
@@ -0,0 +1,132 @@
+import argparse
+import json
+import time
+from copy import deepcopy
+from functools import reduce
+from pathlib import Path
+from typing import Callable, List
+
+from api.service.speech import SpeechService
+
+"""
+SpeechService.get_aligned_script의 문장 재조합 성능 비교
+이전 구현(단어마다 문자열을 잘라내는 방식)과 현재 구현(문장 내 위치만 옮기는 방식)의 결과가 같은지 확인하고 소요 시간을 비교한다.
+긴 스피치를 흉내내기 위해 sample의 segment들을 시간을 밀어가며 반복해서 이어 붙인다.
+
+* 사용 예시 *
+python -m research.benchmark_alignment --repeat 1 10 60
+"""
+
+SAMPLE_DIR = Path(__file__).parent / "samples"
+SAMPLES = ["지식브런치_stt.json", "kss_concatenated_script_sample.json"]
+
+
+def legacy_get_aligned_segments(words, splitted_sentences: List[str]) -> List[dict]:
+    c_idx = 0
+    splitted_sentences = list(map(str.strip, splitted_sentences))
+
+    reconstructed_segments = []
+    for s_idx, sentence in enumerate(splitted_sentences):
+        current = {"start": None, "end": None, "text": sentence[:], "words": []}
+        processing_sentence = sentence[:]
+        broken = False
+
+        while True:
+            processing_sentence = processing_sentence.lstrip()
+            if not processing_sentence:
+                break
+
+            start, end, word = words[c_idx]
+            if processing_sentence.startswith(word):
+                current["words"].append((start, end, word))
+                processing_sentence = processing_sentence[len(word) :]
+                c_idx += 1
+            else:
+                current["text"] = current["text"][: -len(word)]
+                splitted_sentences[s_idx + 1] = (
+                    processing_sentence + splitted_sentences[s_idx + 1]
+                )
+                broken = True
+                break
+
+        current["broken"] = broken
+        current["start"] = current["words"][0][0]
+        current["end"] = current["words"][-1][1]
+        reconstructed_segments.append(current)
+
+    return reconstructed_segments
+
+
+def repeat_script(stt_script: dict, repeat: int) -> dict:
+    segments = stt_script["segments"]
+    duration = segments[-1]["end"]
+
+    repeated = []
+    for i in range(repeat):
+        offset = i * duration
+        for segment in segments:
+            repeated.append(
+                {
+                    **segment,
+                    "start": segment["start"] + offset,
+                    "end": segment["end"] + offset,
+                    "words": [
+                        [start + offset, end + offset, word]
+                        for start, end, word in segment["words"]
+                    ],
+                }
+            )
+
+    return {**stt_script, "segments": repeated}
+
+
+def measure(func: Callable, number: int) -> float:
+    best = float("inf")
+    for _ in range(number):
+        started_at = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started_at)
+    return best
+
+
+def main(args: argparse.Namespace) -> None:
+    speech_service = SpeechService()
+
+    for sample in SAMPLES:
+        with open(SAMPLE_DIR / sample, "r") as f:
+            original = json.load(f)
+
+        for repeat in args.repeat:
+            stt_script = repeat_script(original, repeat)
+            segments = stt_script["segments"]
+            text = " ".join(map(lambda s: s["text"], segments))
+            # kiwi 문장 분리는 두 구현이 같으므로 한 번만 수행
+            sentences = speech_service._get_splitted_sentences(text)
+
+            def legacy():
+                words = list(reduce(lambda acc, cur: acc + cur["words"], segments, []))
+                deepcopy(stt_script)
+                return legacy_get_aligned_segments(words, list(sentences))
+
+            def current():
+                words = [word for segment in segments for word in segment["words"]]
+                dict(stt_script)
+                return speech_service._get_aligned_segments(words, list(sentences))
+
+            assert legacy() == current(), f"{sample} x{repeat}: 결과가 다릅니다."
+
+            word_count = sum(len(s["words"]) for s in segments)
+            legacy_time = measure(legacy, args.number)
+            current_time = measure(current, args.number)
+            print(
+                f"{sample} x{repeat} ({word_count} words, {len(sentences)} sentences): "
+                f"legacy {legacy_time * 1000:.2f}ms, current {current_time * 1000:.2f}ms "
+                f"({legacy_time / current_time:.1f}x)"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, nargs="+", default=[1, 10, 60])
+    parser.add_argument("--number", type=int, default=5)
+    main(parser.parse_args())
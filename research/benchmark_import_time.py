@@ -0,0 +1,122 @@
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+"""
+서버 시작 시 import 시간 측정
+`python -X importtime`으로 module 별 import 시간(자신 / 하위 module 포함)을 기록하고,
+새 process에서 대상 module을 import하는 데 걸리는 전체 시간을 함께 측정한다.
+(librosa, kiwipiepy, boto3, aiohttp 등 무거운 module이 import 시점에 로드되지 않는지 확인할 때 사용)
+
+* 사용 예시 *
+python -m research.benchmark_import_time --module main --number 5 --top 20
+python -m research.benchmark_import_time --output import_time.json
+"""
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+# import 시점에 로드되면 안 되는 module들
+LAZY_MODULES = ["librosa", "matplotlib", "pandas", "kiwipiepy", "boto3", "aiohttp"]
+
+
+def parse_importtime(stderr: str) -> Dict[str, Dict[str, int]]:
+    """
+    _summary_
+        `-X importtime` 출력을 module 별 {"self": us, "cumulative": us}로 변환한다.
+    """
+    times = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, module = line[len("import time:") :].split("|")
+        times[module.strip()] = {
+            "self": int(self_us),
+            "cumulative": int(cumulative_us),
+        }
+    return times
+
+
+def run_import(module: str) -> Dict:
+    code = (
+        "import sys, time\n"
+        "started_at = time.perf_counter()\n"
+        f"import {module}\n"
+        "elapsed = time.perf_counter() - started_at\n"
+        f"loaded = [m for m in {LAZY_MODULES!r} if m in sys.modules]\n"
+        "print(elapsed, ','.join(loaded))\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    elapsed, _, loaded = result.stdout.strip().splitlines()[-1].partition(" ")
+    return {
+        "elapsed": float(elapsed),
+        "loaded_lazy_modules": [m for m in loaded.split(",") if m],
+        "modules": parse_importtime(result.stderr),
+    }
+
+
+def main(args: argparse.Namespace) -> None:
+    runs: List[Dict] = []
+    for _ in range(args.number):
+        started_at = time.perf_counter()
+        run = run_import(args.module)
+        run["process"] = time.perf_counter() - started_at
+        runs.append(run)
+
+    # module 별 중앙값
+    modules = {}
+    for module in runs[0]["modules"]:
+        samples = [run["modules"][module] for run in runs if module in run["modules"]]
+        modules[module] = {
+            key: statistics.median(sample[key] for sample in samples)
+            for key in ("self", "cumulative")
+        }
+
+    elapsed = statistics.median(run["elapsed"] for run in runs)
+    process = statistics.median(run["process"] for run in runs)
+    print(
+        f"import {args.module}: {elapsed * 1000:.1f}ms "
+        f"(process 시작부터 종료까지 {process * 1000:.1f}ms, {args.number}회 중앙값)"
+    )
+    loaded = runs[0]["loaded_lazy_modules"]
+    print(f"import 시점에 로드된 무거운 module: {', '.join(loaded) or '없음'}")
+
+    print(f"{'cumulative(ms)':>15} {'self(ms)':>10}  module")
+    top = sorted(modules.items(), key=lambda m: m[1]["cumulative"], reverse=True)
+    for module, times in top[: args.top]:
+        print(
+            f"{times['cumulative'] / 1000:>15.1f} {times['self'] / 1000:>10.1f}  {module}"
+        )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(
+                {
+                    "module": args.module,
+                    "elapsed": elapsed,
+                    "process": process,
+                    "loaded_lazy_modules": loaded,
+                    "modules": modules,
+                },
+                f,
+                indent=2,
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--module", default="main")
+    parser.add_argument("--number", type=int, default=5)
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--output", type=Path, default=None)
+    main(parser.parse_args())
@@ -0,0 +1,53 @@
+import argparse
+import json
+
+from kiwipiepy import Kiwi
+
+import api.service.speech as speech_module
+from research.benchmark_alignment import SAMPLE_DIR, SAMPLES, measure, repeat_script
+
+"""
+kiwi 문장 분리를 한 번에 수행할 때와 STT segment 단위 chunk로 나누어 병렬 수행할 때의 소요 시간 비교
+(chunk 분리 결과가 한 번에 분리한 결과와 같은지도 함께 확인)
+
+* 사용 예시 *
+python -m research.benchmark_sentence_split --workers 1 2 4 --chunk-size 2000
+"""
+
+
+def main(args: argparse.Namespace) -> None:
+    speech_service = speech_module.SpeechService()
+
+    for workers in args.workers:
+        speech_module._kiwi = Kiwi(num_workers=workers)
+
+        for sample in SAMPLES:
+            with open(SAMPLE_DIR / sample, "r") as f:
+                stt_script = repeat_script(json.load(f), args.repeat)
+            texts = list(map(lambda s: s["text"], stt_script["segments"]))
+
+            def single():
+                return speech_service._get_splitted_sentences(" ".join(texts))
+
+            def chunked():
+                return speech_service._get_splitted_sentences_of_segments(
+                    texts, args.chunk_size
+                )
+
+            assert single() == chunked(), f"{sample}: 결과가 다릅니다."
+
+            single_time = measure(single, args.number)
+            chunked_time = measure(chunked, args.number)
+            print(
+                f"workers={workers} {sample} x{args.repeat} ({len(' '.join(texts))} chars): "
+                f"single {single_time * 1000:.1f}ms, chunked {chunked_time * 1000:.1f}ms"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--chunk-size", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--number", type=int, default=3)
+    main(parser.parse_args())
@@ -0,0 +1,52 @@
+import argparse
+import gc
+import json
+import tracemalloc
+
+from api.data.stt import decode_stt_script
+from api.utils import serialization
+from research.benchmark_alignment import SAMPLE_DIR, SAMPLES, measure, repeat_script
+
+"""
+STT 결과 JSON을 dict로 역직렬화할 때와 SttScript로 역직렬화할 때의 소요 시간 / 메모리 비교
+
+* 사용 예시 *
+python -m research.benchmark_stt_decoding --repeat 1 60
+"""
+
+
+def get_retained_bytes(decode, data: bytes) -> int:
+    gc.collect()
+    tracemalloc.start()
+    result = decode(data)
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return retained
+
+
+def main(args: argparse.Namespace) -> None:
+    for sample in SAMPLES:
+        with open(SAMPLE_DIR / sample, "r") as f:
+            original = json.load(f)
+
+        for repeat in args.repeat:
+            data = serialization.dumps(repeat_script(original, repeat))
+
+            for name, decode in (
+                ("dict", serialization.loads),
+                ("SttScript", decode_stt_script),
+            ):
+                elapsed = measure(lambda: decode(data), args.number)
+                retained = get_retained_bytes(decode, data)
+                print(
+                    f"{sample} x{repeat} ({len(data) / 1024:.0f}KB) {name}: "
+                    f"{elapsed * 1000:.2f}ms, {retained / 1024:.0f}KB"
+                )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, nargs="+", default=[1, 60])
+    parser.add_argument("--number", type=int, default=5)
+    main(parser.parse_args())
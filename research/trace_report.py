@@ -0,0 +1,169 @@
+import argparse
+import json
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+"""
+trace 기록(TRACING_EXPORT_PATH) 분석
+speech 별로 analysis-1 -> Clova STT 대기 -> analysis-2 전체 처리 시간과 critical path(전체 시간을 결정한 구간들)를 출력한다.
+analysis-2는 analysis-1의 clova_submit span의 하위 span으로 기록되므로, clova_submit이 끝난 뒤 analysis-2가 시작되기까지의
+시간은 "clova_submit (이후 대기)" 구간으로 표시된다. (Clova STT 처리 및 callback 전달 시간)
+
+* 사용 예시 *
+python -m research.trace_report traces.jsonl --presentation-id 3 --speech-id 7
+python -m research.trace_report traces.jsonl --slowest 5
+"""
+
+Span = Dict
+
+
+def load_traces(path: Path) -> Dict[str, List[Span]]:
+    traces = defaultdict(list)
+    with open(path) as f:
+        for line in f:
+            if line.strip():
+                span = json.loads(line)
+                span["end"] = span["start"] + span["duration"]
+                traces[span["trace_id"]].append(span)
+    return traces
+
+
+def get_children(spans: List[Span]) -> Dict[Optional[str], List[Span]]:
+    """
+    _summary_
+        parent span id 별 하위 span 목록을 반환한다.
+        parent가 기록에 없는 span(다른 서비스에서 시작된 trace 등)은 None의 하위 span으로 취급한다.
+    """
+    span_ids = {span["span_id"] for span in spans}
+    children = defaultdict(list)
+    for span in spans:
+        parent_id = span["parent_id"] if span["parent_id"] in span_ids else None
+        children[parent_id].append(span)
+    return children
+
+
+def get_critical_path(spans: List[Span]) -> List[Tuple[str, float]]:
+    """
+    _summary_
+        trace의 끝에서부터 거슬러 올라가며, 각 시점에 가장 늦게 끝난 span을 따라간 구간들을 반환한다.
+
+    Returns:
+        List[Tuple[str, float]]: 시간 순서대로 (구간 이름, 초)
+    """
+    children = get_children(spans)
+    effective_end = {}
+
+    def get_effective_end(span: Span) -> float:
+        # 하위 span이 상위 span보다 늦게 끝나는 경우(callback으로 이어진 analysis-2 등)를 포함한 끝 시각
+        if span["span_id"] not in effective_end:
+            effective_end[span["span_id"]] = max(
+                [span["end"]]
+                + [get_effective_end(c) for c in children[span["span_id"]]]
+            )
+        return effective_end[span["span_id"]]
+
+    path = []
+
+    def add_gap(span: Optional[Span], start: float, end: float) -> None:
+        if span is None:
+            if end > start:
+                path.append(("(연결되지 않은 구간)", end - start))
+            return
+        # span이 끝난 이후의 구간은 하위 작업을 기다린 시간
+        if end > span["end"]:
+            path.append((f"{span['name']} (이후 대기)", end - max(start, span["end"])))
+        if min(end, span["end"]) > start:
+            path.append((span["name"], min(end, span["end"]) - start))
+
+    def visit(span: Optional[Span], start: float, end: float) -> None:
+        cursor = end
+        span_id = span["span_id"] if span is not None else None
+        for child in sorted(children[span_id], key=get_effective_end, reverse=True):
+            child_end = get_effective_end(child)
+            # 이미 선택한 구간과 겹치는 span은 critical path가 아님
+            if child_end > cursor:
+                continue
+            add_gap(span, child_end, cursor)
+            visit(child, child["start"], child_end)
+            cursor = child["start"]
+        add_gap(span, start, cursor)
+
+    roots = children[None]
+    visit(
+        None,
+        min(span["start"] for span in roots),
+        max(get_effective_end(span) for span in roots),
+    )
+    path.reverse()
+
+    # 이어진 같은 구간은 하나로 합침
+    merged = []
+    for name, seconds in path:
+        if merged and merged[-1][0] == name:
+            merged[-1] = (name, merged[-1][1] + seconds)
+        else:
+            merged.append((name, seconds))
+    return merged
+
+
+def print_trace(trace_id: str, spans: List[Span]) -> None:
+    children = get_children(spans)
+    trace_start = min(span["start"] for span in spans)
+    trace_end = max(span["end"] for span in spans)
+    attributes = spans[0]["attributes"]
+    print(
+        f"trace {trace_id} (presentation {attributes.get('presentation_id')}, "
+        f"speech {attributes.get('speech_id')}): {trace_end - trace_start:.3f}s"
+    )
+
+    def print_span(span: Span, depth: int) -> None:
+        status = "" if span["status"] == "ok" else f" [{span['error']}]"
+        print(
+            f"  {span['start'] - trace_start:>9.3f}s {span['duration']:>9.3f}s  "
+            f"{'  ' * depth}{span['name']}{status}"
+        )
+        for child in sorted(children[span["span_id"]], key=lambda s: s["start"]):
+            print_span(child, depth + 1)
+
+    for root in sorted(children[None], key=lambda s: s["start"]):
+        print_span(root, 0)
+
+    print("  critical path:")
+    for name, seconds in get_critical_path(spans):
+        # 1ms 미만 구간은 생략
+        if seconds < 0.001:
+            continue
+        print(f"  {seconds:>9.3f}s {seconds / (trace_end - trace_start):>6.1%}  {name}")
+    print()
+
+
+def main(args: argparse.Namespace) -> None:
+    traces = load_traces(args.path)
+
+    def matches(spans: List[Span]) -> bool:
+        attributes = spans[0]["attributes"]
+        return (
+            args.presentation_id is None
+            or attributes.get("presentation_id") == args.presentation_id
+        ) and (args.speech_id is None or attributes.get("speech_id") == args.speech_id)
+
+    selected = [
+        (trace_id, spans) for trace_id, spans in traces.items() if matches(spans)
+    ]
+    # 전체 처리 시간이 긴 순서
+    selected.sort(
+        key=lambda t: max(s["end"] for s in t[1]) - min(s["start"] for s in t[1]),
+        reverse=True,
+    )
+    for trace_id, spans in selected[: args.slowest]:
+        print_trace(trace_id, spans)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("path", type=Path)
+    parser.add_argument("--presentation-id", type=int, default=None)
+    parser.add_argument("--speech-id", type=int, default=None)
+    parser.add_argument("--slowest", type=int, default=10)
+    main(parser.parse_args())
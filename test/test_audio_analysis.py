@@ -0,0 +1,54 @@
+import math
+import unittest
+
+import numpy as np
+
+from api.service.audio_analysis_service import get_centered_moving_average
+
+
+class CenteredMovingAverageTest(unittest.TestCase):
+    def assertSameValues(self, actual, expected):
+        self.assertEqual(len(actual), len(expected))
+        for a, e in zip(actual, expected):
+            if math.isnan(e):
+                self.assertTrue(math.isnan(a))
+            else:
+                self.assertAlmostEqual(a, e)
+
+    def test_odd_window(self):
+        """
+        홀수 구간은 앞뒤로 같은 수의 값을 포함하며, 양 끝은 있는 값들로만 평균을 구함
+        """
+        values = np.array([1.0, 2.0, 4.0, 8.0, 16.0])
+        self.assertSameValues(
+            get_centered_moving_average(values, 3),
+            [1.5, 7 / 3, 14 / 3, 28 / 3, 12.0],
+        )
+
+    def test_even_window(self):
+        """
+        짝수 구간은 pandas의 center=True와 같이 앞쪽 값을 하나 더 포함함
+        """
+        values = np.array([1.0, 2.0, 4.0, 8.0, 16.0, 32.0])
+        self.assertSameValues(
+            get_centered_moving_average(values, 4),
+            [1.5, 7 / 3, 3.75, 7.5, 15.0, 56 / 3],
+        )
+
+    def test_nan(self):
+        """
+        NaN은 평균에서 제외하고, 구간 안의 값이 min_periods보다 적으면 NaN
+        """
+        values = np.array([np.nan, 2.0, np.nan, np.nan, np.nan, 6.0])
+        self.assertSameValues(
+            get_centered_moving_average(values, 3),
+            [2.0, 2.0, 2.0, np.nan, 6.0, 6.0],
+        )
+        self.assertSameValues(
+            get_centered_moving_average(values, 3, min_periods=2),
+            [np.nan] * 6,
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
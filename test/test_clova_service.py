@@ -0,0 +1,119 @@
+import json
+import socket
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from api.configs.clova import ClovaSpeechConfigs
+from api.service.clova_service import ClovaSpeechClient
+
+# 응답하지 않고 연결을 끊는 status (요청은 전달된 상태)
+DROP_CONNECTION = 0
+
+
+class StubClovaHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        self.server.requests.append((dict(self.headers), json.loads(body)))
+
+        status = self.server.statuses.pop(0) if self.server.statuses else 200
+        if status == DROP_CONNECTION:
+            self.close_connection = True
+            return
+        self.send_response(status)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+class ClovaSpeechClientTest(unittest.TestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), StubClovaHandler)
+        self.server.requests = []
+        self.server.statuses = []
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+        self.config = ClovaSpeechConfigs(
+            clova_secret_key="secret",
+            clova_stt_target_url=f"http://127.0.0.1:{self.server.server_port}/stt",
+            clova_max_retries=2,
+            clova_backoff_base=0.01,
+            clova_backoff_max=0.02,
+        )
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_send(self):
+        """
+        요청 본문과 API key header가 전송됨
+        """
+        client = ClovaSpeechClient(self.config)
+        self.assertTrue(client.stt_send("https://audio", "https://callback"))
+
+        headers, body = self.server.requests[0]
+        self.assertEqual(headers["X-CLOVASPEECH-API-KEY"], "secret")
+        self.assertEqual(body["url"], "https://audio")
+        self.assertEqual(body["callback"], "https://callback")
+        self.assertEqual(client.metrics.get_stats()["count"], 1)
+
+    def test_retry_on_5xx_and_429(self):
+        """
+        5xx / 429 응답은 재시도함
+        """
+        self.server.statuses = [503, 429]
+        client = ClovaSpeechClient(self.config)
+        self.assertTrue(client.stt_send("https://audio", "https://callback"))
+
+        self.assertEqual(len(self.server.requests), 3)
+        self.assertEqual(client.metrics.get_stats()["retry_count"], 2)
+
+    def test_retry_limit(self):
+        """
+        재시도 횟수를 넘기면 실패를 반환하고, 4xx 응답은 재시도하지 않음
+        """
+        self.server.statuses = [500, 500, 500, 500]
+        client = ClovaSpeechClient(self.config)
+        self.assertFalse(client.stt_send("https://audio", "https://callback"))
+        self.assertEqual(len(self.server.requests), 3)
+
+        self.server.requests.clear()
+        self.server.statuses = [400]
+        self.assertFalse(client.stt_send("https://audio", "https://callback"))
+        self.assertEqual(len(self.server.requests), 1)
+        self.assertEqual(client.metrics.get_stats()["error_count"], 2)
+
+    def test_retry_connection_refused(self):
+        """
+        연결 수립에 실패한 경우는 요청이 전달되지 않았으므로 재시도함
+        """
+        # 아무도 listen하지 않는 port
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            port = sock.getsockname()[1]
+        config = self.config.model_copy(
+            update={"clova_stt_target_url": f"http://127.0.0.1:{port}/stt"}
+        )
+
+        client = ClovaSpeechClient(config)
+        self.assertFalse(client.stt_send("https://audio", "https://callback"))
+        stats = client.metrics.get_stats()
+        self.assertEqual((stats["retry_count"], stats["error_count"]), (2, 1))
+
+    def test_no_retry_after_sending(self):
+        """
+        요청을 보낸 뒤 연결이 끊긴 경우는 STT 작업이 중복 접수되지 않도록 재시도하지 않음
+        """
+        self.server.statuses = [DROP_CONNECTION]
+        client = ClovaSpeechClient(self.config)
+        self.assertFalse(client.stt_send("https://audio", "https://callback"))
+
+        self.assertEqual(len(self.server.requests), 1)
+        self.assertEqual(client.metrics.get_stats()["retry_count"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,39 @@
+import unittest
+
+from api.utils import compression
+
+
+class TestCompression(unittest.TestCase):
+    def setUp(self):
+        self.data = (
+            '{"text":"안녕하세요. 반갑습니다.","words":[[0,100,"안녕하세요."]]}' * 50
+        ).encode()
+
+    def test_round_trip(self):
+        """
+        gzip, zstd로 압축한 데이터는 Content-Encoding에 맞게 원본으로 복원됨
+        """
+        for content_encoding in (compression.GZIP, compression.ZSTD):
+            compressed = compression.compress(self.data, content_encoding, 6)
+            self.assertLess(len(compressed), len(self.data))
+            self.assertEqual(
+                compression.decompress(compressed, content_encoding), self.data
+            )
+
+    def test_detect_without_content_encoding(self):
+        """
+        Content-Encoding이 없으면 magic number로 판단하고, 압축되지 않은 데이터는 그대로 반환함
+        """
+        for content_encoding in (compression.GZIP, compression.ZSTD):
+            compressed = compression.compress(self.data, content_encoding, 6)
+            self.assertEqual(compression.decompress(compressed), self.data)
+
+        self.assertEqual(compression.decompress(self.data), self.data)
+
+    def test_unsupported_encoding(self):
+        with self.assertRaises(ValueError):
+            compression.compress(self.data, "br", 6)
+
+
+if __name__ == "__main__":
+    unittest.main()
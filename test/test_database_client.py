@@ -0,0 +1,375 @@
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from api.configs.db import DatabaseConfigs
+from sqlalchemy.exc import IntegrityError
+
+from api.data.async_client import AsyncSpeechDatabaseClient
+from api.data.client import AnalysisRecordDatabaseClient, SpeechDatabaseClient
+from api.data.enums import AnalysisRecordType
+from api.data.engine import EngineRegistry
+from api.data.tables import AnalysisRecord, Base, Speech
+
+
+class SqliteConfigs(DatabaseConfigs):
+    path: str
+
+    def get_full_url(self) -> str:
+        return f"sqlite:///{self.path}"
+
+    def get_async_full_url(self) -> str:
+        return f"sqlite+aiosqlite:///{self.path}"
+
+
+class SqliteRegistryMixin:
+    """
+    임시 SQLite 파일을 사용하는 EngineRegistry로 DB client들을 테스트한다.
+    """
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.config = SqliteConfigs(
+            db_username="",
+            db_password="",
+            db_host="",
+            db_port=0,
+            db_name="",
+            path=str(Path(self.tmp_dir.name) / "wasak.db"),
+        )
+        self.registry = EngineRegistry(self.config)
+        Base.metadata.create_all(self.registry.get_engine())
+
+        self.patchers = [
+            mock.patch("api.data.client.engine_registry", self.registry),
+            mock.patch("api.data.async_client.engine_registry", self.registry),
+        ]
+        for patcher in self.patchers:
+            patcher.start()
+
+    def tearDown(self):
+        for patcher in self.patchers:
+            patcher.stop()
+        for engine in self.registry._engines.values():
+            engine.dispose()
+        self.tmp_dir.cleanup()
+
+
+def insert_speech(registry: EngineRegistry, **values) -> int:
+    session = registry.get_session()
+    speech = Speech(presentation_id=1, avgf0=120.0, **values)
+    session.add(speech)
+    session.commit()
+    speech_id = speech.id
+    session.close()
+    return speech_id
+
+
+class EngineRegistryTest(SqliteRegistryMixin, unittest.TestCase):
+    def test_shared_engine(self):
+        """
+        같은 URL에 대해 process 안에서는 하나의 engine / session factory를 공유함
+        """
+        self.assertIs(self.registry.get_engine(), self.registry.get_engine())
+        self.assertIs(
+            self.registry.get_session_factory(), self.registry.get_session_factory()
+        )
+
+    def test_fork_check(self):
+        """
+        fork된 process(pid가 다른 경우)에서는 부모의 engine을 버리고 새 engine을 생성함
+        """
+        engine = self.registry.get_engine()
+        session_factory = self.registry.get_session_factory()
+
+        child_pid = self.registry._pid + 1
+        with mock.patch("os.getpid", return_value=child_pid):
+            self.assertIsNot(self.registry.get_engine(), engine)
+            self.assertIsNot(self.registry.get_session_factory(), session_factory)
+            self.assertEqual(self.registry._pid, child_pid)
+        engine.dispose()
+
+    def test_pool_stats(self):
+        """
+        checkout된 커넥션 수와 checkout 횟수가 URL 별로 기록됨
+        """
+        engine = self.registry.get_engine()
+        with engine.connect():
+            stats = self.registry.get_pool_stats()[self.config.get_full_url()]
+            self.assertEqual(stats["checked_out"], 1)
+
+        stats = self.registry.get_pool_stats()[self.config.get_full_url()]
+        self.assertEqual(stats["checked_out"], 0)
+        self.assertEqual(stats["checked_in"], 1)
+        self.assertGreaterEqual(stats["checkout_count"], 2)
+        self.assertEqual(stats["checkout_timeout_count"], 0)
+
+
+class ColumnUpdateTest(SqliteRegistryMixin, unittest.TestCase):
+    def setUp(self):
+        super().setUp()
+        self.client = SpeechDatabaseClient()
+        self.speech_id = insert_speech(self.registry)
+        self.speech = self.get_speech()
+
+    def get_speech(self) -> Speech:
+        return self.client.get_single([Speech.id == self.speech_id])
+
+    def test_update_columns(self):
+        """
+        지정한 column만 갱신하며, 없는 column 이름은 ValueError
+        """
+        updated = self.client.update_columns(
+            [Speech.id == self.speech_id], {"avglpm": 350.0, "pause_ratio": 12.5}
+        )
+        self.assertEqual(updated, 1)
+
+        speech = self.get_speech()
+        self.assertEqual((speech.avglpm, speech.pause_ratio), (350.0, 12.5))
+        self.assertEqual(speech.avgf0, 120.0)
+
+        with self.assertRaises(ValueError):
+            self.client.update_columns([Speech.id == self.speech_id], {"lpm": 1})
+        self.assertEqual(self.client.update_columns([Speech.id == 0], {}), 0)
+
+    def test_unit_of_work(self):
+        """
+        set한 값은 객체에 바로 반영되고, DB에는 블록이 정상 종료될 때 한 번의 UPDATE로 반영됨
+        """
+        with mock.patch.object(
+            self.client, "update_columns", wraps=self.client.update_columns
+        ) as update_columns:
+            with self.client.unit_of_work(self.speech) as uow:
+                uow.set("avglpm", 350.0)
+                uow.set("feedback_count", 3)
+                self.assertEqual(self.speech.avglpm, 350.0)
+                self.assertIsNone(self.get_speech().avglpm)
+
+            update_columns.assert_called_once()
+
+        speech = self.get_speech()
+        self.assertEqual((speech.avglpm, speech.feedback_count), (350.0, 3))
+        self.assertEqual(uow.flush(), 0)
+
+    def test_unit_of_work_discarded_on_error(self):
+        with self.assertRaises(RuntimeError):
+            with self.client.unit_of_work(self.speech) as uow:
+                uow.set("avglpm", 350.0)
+                raise RuntimeError("analysis failed")
+
+        self.assertIsNone(self.get_speech().avglpm)
+        self.assertEqual(uow.changes, {})
+
+    def spy_sessions(self) -> list:
+        sessions = []
+
+        def get_session():
+            session = self.registry.get_session()
+            session.close = mock.Mock(wraps=session.close)
+            sessions.append(session)
+            return session
+
+        patcher = mock.patch.object(self.client, "get_session", get_session)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        return sessions
+
+    def test_update_columns_failure(self):
+        """
+        UPDATE가 실패해도 session을 닫아 커넥션을 풀에 반환함
+        """
+        sessions = self.spy_sessions()
+        with self.assertRaises(IntegrityError):
+            self.client.update_columns(
+                [Speech.id == self.speech_id],
+                {"avglpm": 350.0, "presentation_id": None},
+            )
+
+        sessions[0].close.assert_called_once()
+        stats = self.registry.get_pool_stats()[self.config.get_full_url()]
+        self.assertEqual(stats["checked_out"], 0)
+        self.assertIsNone(self.get_speech().avglpm)
+
+    def test_unit_of_work_flush_failure(self):
+        """
+        flush가 실패하면 변경 사항을 남겨 다시 flush할 수 있음
+        """
+        sessions = self.spy_sessions()
+        uow = self.client.unit_of_work(self.speech)
+        uow.set("presentation_id", None)
+        with self.assertRaises(IntegrityError):
+            uow.flush()
+
+        sessions[0].close.assert_called_once()
+        self.assertEqual(uow.changes, {"presentation_id": None})
+
+
+class BulkInsertTest(SqliteRegistryMixin, unittest.TestCase):
+    def setUp(self):
+        super().setUp()
+        self.client = AnalysisRecordDatabaseClient()
+
+    def get_rows(self, speech_id: int, prefix: str):
+        return [
+            {
+                "record_type": record_type,
+                "speech_id": speech_id,
+                "url": f"{prefix}/{record_type.value}.json",
+            }
+            for record_type in (AnalysisRecordType.HERTZ, AnalysisRecordType.DECIBEL)
+        ]
+
+    def get_urls(self, speech_id: int):
+        records = self.client.conditional_select_all(
+            [AnalysisRecord.speech_id == speech_id]
+        )
+        return sorted(record.url for record in records)
+
+    def test_replace(self):
+        """
+        replace_conditions에 해당하는 row만 삭제한 뒤 삽입함
+        """
+        self.client.bulk_insert(self.get_rows(1, "old"))
+        self.client.bulk_insert(self.get_rows(2, "other"))
+
+        replace_conditions = [
+            AnalysisRecord.speech_id == 1,
+            AnalysisRecord.record_type.in_([AnalysisRecordType.HERTZ]),
+        ]
+        inserted = self.client.bulk_insert(
+            self.get_rows(1, "new")[:1], replace_conditions=replace_conditions
+        )
+
+        self.assertEqual(inserted, 1)
+        self.assertEqual(self.get_urls(1), ["new/HERTZ.json", "old/DECIBEL.json"])
+        self.assertEqual(self.get_urls(2), ["other/DECIBEL.json", "other/HERTZ.json"])
+        self.assertEqual(self.client.bulk_insert([]), 0)
+
+    def test_rollback_on_failure(self):
+        """
+        삽입에 실패하면 같은 transaction의 삭제도 취소되어 기존 row가 남음
+        """
+        self.client.bulk_insert(self.get_rows(1, "old"))
+
+        rows = self.get_rows(1, "new")
+        rows[1]["url"] = None
+        with self.assertRaises(IntegrityError):
+            self.client.bulk_insert(
+                rows, replace_conditions=[AnalysisRecord.speech_id == 1]
+            )
+
+        self.assertEqual(self.get_urls(1), ["old/DECIBEL.json", "old/HERTZ.json"])
+        # 실패한 경우에도 커넥션은 풀에 반환됨
+        stats = self.registry.get_pool_stats()[self.config.get_full_url()]
+        self.assertEqual(stats["checked_out"], 0)
+
+
+class IterSelectTest(SqliteRegistryMixin, unittest.TestCase):
+    def setUp(self):
+        super().setUp()
+        self.client = SpeechDatabaseClient()
+        self.speech_ids = [
+            insert_speech(self.registry, feedback_count=i % 2) for i in range(7)
+        ]
+
+    def get_page_ids(self, **kwargs):
+        return [
+            [speech.id for speech in page] for page in self.client.iter_pages(**kwargs)
+        ]
+
+    def test_iter_pages_boundaries(self):
+        """
+        page는 id 오름차순이며, 마지막 page가 page_size와 같아도 빈 page를 반환하지 않음
+        """
+        ids = self.speech_ids
+        self.assertEqual(self.get_page_ids(page_size=3), [ids[0:3], ids[3:6], ids[6:7]])
+        self.assertEqual(self.get_page_ids(page_size=7), [ids])
+        self.assertEqual(self.get_page_ids(page_size=10), [ids])
+
+        # 마지막 page가 가득 찬 경우 다음 page 조회 결과가 비어 있으면 종료
+        self.assertEqual(
+            self.get_page_ids(page_size=3, after_id=ids[0]), [ids[1:4], ids[4:7]]
+        )
+
+    def test_iter_pages_resume(self):
+        """
+        after_id로 중단된 순회를 이어서 조회하며, 조건과 column 지정이 함께 적용됨
+        """
+        ids = self.speech_ids
+        first_page = next(self.client.iter_pages(page_size=2))
+        resumed = self.get_page_ids(page_size=2, after_id=first_page[-1].id)
+        self.assertEqual(sum(resumed, []), ids[2:])
+        self.assertEqual(self.get_page_ids(after_id=ids[-1]), [])
+
+        pages = list(
+            self.client.iter_pages(
+                conditions=[Speech.feedback_count == 1],
+                page_size=2,
+                columns=["feedback_count"],
+            )
+        )
+        self.assertEqual([row.id for page in pages for row in page], ids[1::2])
+        self.assertEqual(pages[0][0]._fields, ("id", "feedback_count"))
+
+    def test_iter_all(self):
+        self.assertEqual(
+            sorted(speech.id for speech in self.client.iter_all(page_size=2)),
+            self.speech_ids,
+        )
+        rows = list(
+            self.client.iter_all(
+                conditions=[Speech.feedback_count == 0], columns=["id", "avgf0"]
+            )
+        )
+        self.assertEqual(sorted(row.id for row in rows), self.speech_ids[::2])
+        self.assertTrue(all(row.avgf0 == 120.0 for row in rows))
+
+
+class AsyncDatabaseClientTest(SqliteRegistryMixin, unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        super().setUp()
+        self.client = AsyncSpeechDatabaseClient()
+
+    async def asyncTearDown(self):
+        await self.registry.dispose()
+
+    async def test_select_and_update(self):
+        speech = await self.client.insert(Speech(presentation_id=1, avgf0=120.0))
+        await self.client.insert(Speech(presentation_id=2))
+
+        found = await self.client.get_single([Speech.id == speech.id])
+        self.assertEqual(found.avgf0, 120.0)
+        self.assertIsNone(await self.client.get_single([Speech.id == 0]))
+        self.assertEqual(len(await self.client.select_all()), 2)
+        self.assertEqual(
+            len(
+                await self.client.conditional_select_all([Speech.presentation_id == 2])
+            ),
+            1,
+        )
+
+        found.pause_ratio = 12.5
+        await self.client.update(found)
+
+        updated = await self.client.update_columns(
+            [Speech.id == speech.id], {"avglpm": 350.0}
+        )
+        self.assertEqual(updated, 1)
+        with self.assertRaises(ValueError):
+            await self.client.update_columns([Speech.id == speech.id], {"lpm": 1})
+
+        found = await self.client.get_single([Speech.id == speech.id])
+        self.assertEqual((found.avglpm, found.pause_ratio), (350.0, 12.5))
+
+    async def test_dispose_closes_connections(self):
+        """
+        서버 종료 시 dispose하면 async engine 풀에 반환된 커넥션도 닫힘
+        """
+        await self.client.select_all()
+        pool = self.registry.get_async_engine().pool
+        self.assertEqual(pool.checkedin(), 1)
+
+        await self.registry.dispose()
+        self.assertEqual(pool.checkedin(), 0)
+        self.assertEqual(self.registry.get_pool_stats(), {})
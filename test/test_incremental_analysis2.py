@@ -0,0 +1,138 @@
+import contextlib
+import io
+import json
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from api.configs.analysis import config as analysis_config
+from api.data.enums import AnalysisRecordType
+from api.service.analysis2_service import IncrementalAnalysis2, analyze_stt_script
+from api.service.speech import SpeechService
+
+SAMPLE_PATH = (
+    Path(__file__).parent.parent / "research" / "samples" / "지식브런치_stt.json"
+)
+
+
+class IncrementalAnalysis2Test(unittest.TestCase):
+    def setUp(self):
+        with open(SAMPLE_PATH, "r") as f:
+            self.script = json.load(f)
+        self.speech_service = SpeechService()
+
+    def analyze_incrementally(self, step: int) -> IncrementalAnalysis2:
+        analysis = IncrementalAnalysis2(self.speech_service)
+        segments = self.script["segments"]
+        for i in range(0, len(segments), step):
+            analysis.append_segments(segments[i : i + step])
+        return analysis
+
+    def test_same_as_batch(self):
+        """
+        segment를 나누어 추가한 뒤 완료한 결과는 전체 STT 결과를 한 번에 분석한 결과와 같음
+        """
+        metadata = {k: v for k, v in self.script.items() if k != "segments"}
+
+        for lpm_correction in (False, True):
+            with mock.patch.object(
+                analysis_config, "speech_correction_lpm", lpm_correction
+            ), contextlib.redirect_stdout(io.StringIO()):
+                expected = analyze_stt_script(self.script, self.speech_service)
+
+                for step in (1, 7, len(self.script["segments"])):
+                    result = self.analyze_incrementally(step).finish(metadata)
+                    self.assertEqual(result.records, expected.records)
+                    self.assertEqual(result.speech_info, expected.speech_info)
+
+    def test_partial_result(self):
+        """
+        중간 결과는 확정된 문장들 뒤에 확정되지 않은 문장들을 이어 분석한 결과임
+        """
+        analysis = IncrementalAnalysis2(self.speech_service, tail_sentence_count=2)
+        result = analysis.append_segments(self.script["segments"][:10])
+        records = dict(result.records)
+
+        segments = records[AnalysisRecordType.STT]["segments"]
+        self.assertGreater(analysis.sentence_count, 0)
+        self.assertGreaterEqual(len(segments), analysis.sentence_count)
+        self.assertEqual(len(records[AnalysisRecordType.PAUSE]), len(segments) - 1)
+        self.assertEqual(
+            len(records[AnalysisRecordType.LPM]), sum(len(s["words"]) for s in segments)
+        )
+
+    def test_metadata_does_not_override_script(self):
+        """
+        요청으로 받은 text / segments는 이어 붙인 텍스트 / 재조합된 segment를 덮어쓰지 않음
+        """
+        analysis = self.analyze_incrementally(7)
+        result = analysis.finish(
+            {"text": "", "segments": [], "result": "COMPLETED", "token": "token"}
+        )
+        script = dict(result.records)[AnalysisRecordType.STT]
+
+        self.assertEqual(script["text"], " ".join(analysis.texts))
+        self.assertEqual(len(script["segments"]), analysis.sentence_count)
+        self.assertGreater(analysis.sentence_count, 0)
+        self.assertEqual((script["result"], script["token"]), ("COMPLETED", "token"))
+
+    def test_words_not_arrived(self):
+        """
+        단어 없이 텍스트만 도착한 경우 확정된 문장들의 결과만 반환
+        """
+        analysis = IncrementalAnalysis2(self.speech_service)
+        result = analysis.append_segments([{"text": "안녕하세요", "words": []}])
+        self.assertEqual(dict(result.records)[AnalysisRecordType.STT]["segments"], [])
+
+    def test_retry_failed_finish(self):
+        """
+        완료 처리가 실패해도 상태가 유지되어 다시 완료할 수 있음
+        """
+        analysis = self.analyze_incrementally(7)
+        with mock.patch.object(
+            self.speech_service,
+            "_get_splitted_sentences",
+            side_effect=RuntimeError("kiwi"),
+        ):
+            with self.assertRaises(RuntimeError):
+                analysis.finish()
+        self.assertFalse(analysis.finished)
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            expected = analyze_stt_script(self.script, self.speech_service)
+        result = analysis.finish()
+        self.assertTrue(analysis.finished)
+        self.assertEqual(result.speech_info, expected.speech_info)
+
+    def test_average_lpm_from_segment_texts(self):
+        """
+        평균 LPM은 전체 텍스트("text")가 아닌 segment 텍스트들의 글자 수로 계산함
+        (전체 텍스트가 segment 텍스트들과 다르면 한 번에 분석한 결과와 평균 LPM만 다름)
+        """
+        script = {**self.script, "text": self.script["text"] + " 추가된 텍스트."}
+        with contextlib.redirect_stdout(io.StringIO()):
+            expected = analyze_stt_script(script, self.speech_service)
+        result = self.analyze_incrementally(7).finish()
+
+        letter_count = sum(
+            len(s["text"].replace(" ", "").replace(".", "")) for s in script["segments"]
+        )
+        end = dict(result.records)[AnalysisRecordType.STT]["segments"][-1]["end"]
+        self.assertAlmostEqual(
+            result.speech_info["avglpm"], letter_count / (end / 1000 / 60)
+        )
+        self.assertLess(result.speech_info["avglpm"], expected.speech_info["avglpm"])
+        self.assertEqual(
+            result.speech_info["pause_ratio"], expected.speech_info["pause_ratio"]
+        )
+
+    def test_empty(self):
+        result = IncrementalAnalysis2(self.speech_service).finish()
+        self.assertEqual(
+            result.speech_info,
+            {"pause_ratio": 100.0, "avglpm": 0.0, "feedback_count": 0},
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
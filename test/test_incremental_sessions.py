@@ -0,0 +1,130 @@
+import json
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from fastapi.testclient import TestClient
+
+from api.configs.analysis import config as analysis_config
+from api.controller import speech
+
+SAMPLE_PATH = (
+    Path(__file__).parent.parent / "research" / "samples" / "지식브런치_stt.json"
+)
+
+
+class IncrementalSessionTest(unittest.TestCase):
+    def setUp(self):
+        with open(SAMPLE_PATH, "r") as f:
+            self.segments = json.load(f)["segments"]
+
+        async def get_speech(client, conditions):
+            return mock.Mock(presentation_id=1, id=2)
+
+        patchers = [
+            mock.patch.object(speech, "get_object_or_404_async", get_speech),
+            mock.patch.object(speech, "analysis_record_service"),
+            mock.patch.object(speech, "save_analysis_2_result"),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.addCleanup(speech.incremental_sessions.clear)
+
+        self.client = TestClient(speech.app, raise_server_exceptions=False)
+
+    def append(self, speech_id: int, offset: int, segments: list):
+        return self.client.post(
+            f"/1/speech/{speech_id}/analysis-2/segments",
+            params={"offset": offset},
+            content=json.dumps({"segments": segments}),
+        )
+
+    def complete(self, speech_id: int):
+        return self.client.post(f"/1/speech/{speech_id}/analysis-2/segments/complete")
+
+    def session_gauge(self) -> float:
+        return speech.incremental_sessions_gauge._values[()]
+
+    def test_segment_offset(self):
+        response = self.append(2, 0, self.segments[:7])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json()["sentence_count"],
+            speech.incremental_sessions[(1, 2)].analysis.sentence_count,
+        )
+
+        # 중복 전송, 누락된 segment는 거부
+        for offset in (0, 3, 14):
+            response = self.append(2, offset, self.segments[7:14])
+            self.assertEqual(response.status_code, 409)
+            self.assertEqual(response.json()["detail"], "Expected segment offset 7")
+
+        self.assertEqual(self.append(2, 7, self.segments[7:14]).status_code, 200)
+        self.assertEqual(speech.incremental_sessions[(1, 2)].segment_count, 14)
+
+    def test_offset_required(self):
+        response = self.client.post(
+            "/1/speech/2/analysis-2/segments",
+            content=json.dumps({"segments": self.segments[:7]}),
+        )
+        self.assertEqual(response.status_code, 422)
+
+    def test_unknown_session(self):
+        """
+        만료되었거나 다른 worker에서 시작된 점진 분석은 이어갈 수 없음
+        """
+        self.assertEqual(self.append(2, 7, self.segments[7:14]).status_code, 409)
+        self.assertNotIn((1, 2), speech.incremental_sessions)
+        self.assertEqual(self.complete(2).status_code, 404)
+
+    def test_idle_session_expired(self):
+        self.append(2, 0, self.segments[:1])
+        speech.incremental_sessions[(1, 2)].last_touched -= (
+            analysis_config.incremental_session_ttl + 1
+        )
+
+        self.append(3, 0, self.segments[:1])
+        self.assertEqual(list(speech.incremental_sessions), [(1, 3)])
+        self.assertEqual(self.session_gauge(), 1)
+
+    def test_max_count(self):
+        with mock.patch.object(analysis_config, "incremental_session_max_count", 2):
+            for speech_id in (2, 3, 4):
+                self.append(speech_id, 0, self.segments[:1])
+                time.sleep(0.001)
+            # 가장 오래 요청이 없던 상태부터 제거
+            self.append(3, 1, self.segments[1:2])
+            self.append(5, 0, self.segments[:1])
+
+        self.assertEqual(sorted(speech.incremental_sessions), [(1, 3), (1, 5)])
+        self.assertEqual(self.session_gauge(), 2)
+
+    def test_retry_failed_completion(self):
+        self.append(2, 0, self.segments)
+        speech.save_analysis_2_result.side_effect = [RuntimeError("S3"), None]
+
+        self.assertEqual(self.complete(2).status_code, 200)
+        # 실패하면 상태가 남아 있어 다시 완료할 수 있음
+        session = speech.incremental_sessions[(1, 2)]
+        self.assertFalse(session.completing)
+        self.assertEqual(self.append(2, len(self.segments), []).status_code, 409)
+
+        self.assertEqual(self.complete(2).status_code, 200)
+        self.assertNotIn((1, 2), speech.incremental_sessions)
+        self.assertEqual(speech.save_analysis_2_result.call_count, 2)
+        self.assertEqual(self.session_gauge(), 0)
+
+    def test_disabled(self):
+        """
+        점진 분석을 끈 경우(prefork worker 2개 이상) 503 반환
+        """
+        with mock.patch.object(analysis_config, "incremental_analysis_enabled", False):
+            self.assertEqual(self.append(2, 0, self.segments[:1]).status_code, 503)
+            self.assertEqual(self.complete(2).status_code, 503)
+        self.assertEqual(speech.incremental_sessions, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,116 @@
+import unittest
+
+from api.service.metrics_service import (
+    Counter,
+    Histogram,
+    MetricsRegistry,
+    PipelineMetrics,
+)
+
+
+class MetricsFormatTest(unittest.TestCase):
+    def test_histogram_buckets(self):
+        """
+        bucket 값은 누적 개수이며, 경계값과 같은 값은 해당 bucket에 포함됨
+        """
+        registry = MetricsRegistry()
+        histogram = registry.register(
+            Histogram("stage_seconds", "소요 시간", ("stage",), buckets=(0.1, 1.0))
+        )
+        histogram.observe(0.1, "pyin")
+        histogram.observe(0.5, "pyin")
+        histogram.observe(2.0, "pyin")
+
+        lines = registry.render().splitlines()
+        self.assertEqual(lines[0], "# HELP stage_seconds 소요 시간")
+        self.assertEqual(lines[1], "# TYPE stage_seconds histogram")
+        self.assertEqual(
+            lines[2:],
+            [
+                'stage_seconds_bucket{stage="pyin",le="0.1"} 1',
+                'stage_seconds_bucket{stage="pyin",le="1.0"} 2',
+                'stage_seconds_bucket{stage="pyin",le="+Inf"} 3',
+                'stage_seconds_sum{stage="pyin"} 2.6',
+                'stage_seconds_count{stage="pyin"} 3',
+            ],
+        )
+
+    def test_label_escape_and_collector_error(self):
+        """
+        label 값의 따옴표는 escape하고, 실패한 collector가 있어도 나머지 metric은 출력함
+        """
+        registry = MetricsRegistry()
+        counter = registry.register(Counter("requests_total", "요청 수", ("url",)))
+        counter.inc('a"b')
+
+        def broken_collector():
+            raise RuntimeError("stats unavailable")
+
+        registry.register_collector(broken_collector)
+        registry.register_collector(lambda: ["custom_metric 1"])
+
+        output = registry.render()
+        self.assertIn('requests_total{url="a\\"b"} 1\n', output)
+        self.assertTrue(output.endswith("custom_metric 1\n"))
+
+
+class PipelineMetricsTest(unittest.TestCase):
+    def setUp(self):
+        self.registry = MetricsRegistry()
+        self.metrics = PipelineMetrics(self.registry)
+
+    def get_value(self, metric, *label_values):
+        return metric._values.get(label_values, 0)
+
+    def test_track_job_success(self):
+        @self.metrics.track_job("analysis-1")
+        def job():
+            self.assertEqual(
+                self.get_value(self.metrics.jobs_in_flight, "analysis-1"), 1
+            )
+            with self.metrics.stage("analysis-1", "pyin"):
+                pass
+            return "done"
+
+        self.metrics.enqueue("analysis-1")
+        self.assertEqual(self.get_value(self.metrics.jobs_queued, "analysis-1"), 1)
+        self.assertEqual(job(), "done")
+
+        self.assertEqual(self.get_value(self.metrics.jobs_queued, "analysis-1"), 0)
+        self.assertEqual(self.get_value(self.metrics.jobs_in_flight, "analysis-1"), 0)
+        self.assertEqual(self.get_value(self.metrics.jobs_succeeded, "analysis-1"), 1)
+        self.assertEqual(self.get_value(self.metrics.jobs_failed, "analysis-1"), 0)
+
+        output = self.registry.render()
+        self.assertIn(
+            'wasak_pipeline_stage_duration_seconds_count{kind="analysis-1",stage="pyin"} 1',
+            output,
+        )
+        self.assertIn(
+            'wasak_pipeline_stage_duration_seconds_count{kind="analysis-1",stage="total"} 1',
+            output,
+        )
+
+    def test_track_job_failure(self):
+        """
+        예외가 발생하거나, 작업 함수가 예외를 직접 처리하고 fail_job을 호출하면 실패로 기록됨
+        """
+
+        @self.metrics.track_job("analysis-2", queued=False)
+        def raising_job():
+            raise ValueError("invalid stt result")
+
+        @self.metrics.track_job("analysis-2", queued=False)
+        def handled_job():
+            try:
+                raise ValueError("invalid stt result")
+            except ValueError:
+                self.metrics.fail_job()
+
+        with self.assertRaises(ValueError):
+            raising_job()
+        handled_job()
+
+        self.assertEqual(self.get_value(self.metrics.jobs_failed, "analysis-2"), 2)
+        self.assertEqual(self.get_value(self.metrics.jobs_succeeded, "analysis-2"), 0)
+        self.assertEqual(self.get_value(self.metrics.jobs_in_flight, "analysis-2"), 0)
@@ -0,0 +1,249 @@
+import contextlib
+import io
+import json
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from unittest import mock
+
+from api.command import reanalyze
+from api.configs.analysis import config as analysis_config
+from api.service import speech
+from api.service.aws.s3 import get_aligned_script_cache_url, get_raw_stt_save_url
+from api.service.speech import SpeechService
+from api.service.storage import MemoryStorageService
+
+PRESENTATION_ID = 3
+SPEECH_ID = 7
+STT_KEY = f"{PRESENTATION_ID}/{SPEECH_ID}/analysis/STT.json"
+
+
+def get_broken_script() -> dict:
+    # kiwi와 STT의 단어 단위가 달라 깨진 문장이 생기는 STT 결과 (`먹었습니다.그래서`가 두 문장에 걸침)
+    words = "저는 밥을 먹었습니다.그래서 배가 부릅니다. 오늘은 좋은 날입니다.".split()
+    timestamps = [[i * 500, i * 500 + 400, word] for i, word in enumerate(words)]
+    text = " ".join(words)
+    return {
+        "text": text,
+        "segments": [
+            {"start": 0, "end": timestamps[-1][1], "text": text, "words": timestamps}
+        ],
+    }
+
+
+class AnalyzeSpeechSourceTest(unittest.TestCase):
+    def setUp(self):
+        self.storage_service = MemoryStorageService()
+        patcher = mock.patch.multiple(
+            reanalyze,
+            _worker_storage_service=self.storage_service,
+            _worker_speech_service=mock.Mock(alignment_cache_write_count=0),
+            analyze_stt_script=mock.Mock(return_value="result"),
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def analyzed_script(self):
+        self.assertEqual(
+            reanalyze._analyze_speech(PRESENTATION_ID, SPEECH_ID),
+            (3, 7, "result", 0),
+        )
+        return reanalyze.analyze_stt_script.call_args.args[0]
+
+    def test_prefer_raw_stt(self):
+        self.storage_service.upload_json_object(
+            get_raw_stt_save_url(PRESENTATION_ID, SPEECH_ID), {"source": "raw"}
+        )
+        self.storage_service.upload_json_object(
+            STT_KEY, {"source": "aligned", "segments": []}
+        )
+        self.assertEqual(self.analyzed_script(), {"source": "raw"})
+
+    def test_fall_back_to_stt(self):
+        self.storage_service.upload_json_object(
+            STT_KEY, {"source": "aligned", "segments": []}
+        )
+        self.assertEqual(self.analyzed_script(), {"source": "aligned", "segments": []})
+
+    def test_missing_stt(self):
+        with self.assertRaises(FileNotFoundError):
+            reanalyze._analyze_speech(PRESENTATION_ID, SPEECH_ID)
+
+    def test_not_reanalyzable(self):
+        self.storage_service.upload_json_object(STT_KEY, {"segments": []})
+        reanalyze.analyze_stt_script.side_effect = IndexError("list index")
+        with self.assertRaises(reanalyze.NotReanalyzableError):
+            reanalyze._analyze_speech(PRESENTATION_ID, SPEECH_ID)
+
+
+class AlignmentCacheWriteTest(unittest.TestCase):
+    """
+    ALIGNMENT_CACHE_PERSIST 설정 시 문장 재조합 결과 저장
+    """
+
+    def setUp(self):
+        self.storage_service = MemoryStorageService()
+        self.storage_service.upload_json_object(STT_KEY, get_broken_script())
+        self.speech_service = SpeechService()
+        self.speech_service._storage_service = self.storage_service
+
+        patchers = [
+            mock.patch.object(analysis_config, "alignment_cache_persist", True),
+            mock.patch.object(speech.aligned_segments_cache, "maxsize", 0),
+            mock.patch.multiple(
+                reanalyze,
+                _worker_storage_service=self.storage_service,
+                _worker_speech_service=self.speech_service,
+            ),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def analyze(self, dry_run: bool) -> int:
+        with contextlib.redirect_stdout(io.StringIO()):
+            *_, cache_write_count = reanalyze._analyze_speech(
+                PRESENTATION_ID, SPEECH_ID, dry_run
+            )
+        return cache_write_count
+
+    def test_write_cache(self):
+        self.assertEqual(self.analyze(dry_run=False), 1)
+        self.assertIn(
+            get_aligned_script_cache_url(PRESENTATION_ID, SPEECH_ID),
+            self.storage_service.objects,
+        )
+        # 저장된 재조합 결과를 재사용하면 다시 저장하지 않음
+        self.assertEqual(self.analyze(dry_run=False), 0)
+
+    def test_dry_run(self):
+        self.assertEqual(self.analyze(dry_run=True), 0)
+        self.assertEqual(list(self.storage_service.objects), [STT_KEY])
+
+    def test_rate_limit_cache_write(self):
+        """
+        worker에서 저장한 재조합 결과도 S3 업로드 수 제한에 포함
+        """
+        result = mock.Mock(records=[("STT", {})] * 6, speech_info={})
+        args = reanalyze.get_parser().parse_args(["--workers", "1"])
+        with mock.patch.multiple(
+            reanalyze,
+            ProcessPoolExecutor=lambda **kwargs: ThreadPoolExecutor(max_workers=1),
+            SpeechDatabaseClient=mock.DEFAULT,
+            RateLimiter=mock.DEFAULT,
+            _analyze_speech=mock.Mock(return_value=(1, 2, result, 1)),
+        ) as patched, mock.patch("api.service.analysis_record.AnalysisRecordService"):
+            patched["SpeechDatabaseClient"].return_value.iter_pages.return_value = [
+                [mock.Mock(presentation_id=1, id=2)]
+            ]
+            with contextlib.redirect_stdout(io.StringIO()):
+                reanalyze.reanalyze(args)
+
+        patched["RateLimiter"].return_value.acquire.assert_any_call(7)
+
+
+class RestoreBrokenSegmentTextsTest(unittest.TestCase):
+    def test_legacy_aligned_script(self):
+        """
+        이전 버전에서 깨진 문장의 텍스트를 잘라 저장한 STT.json도 다시 재조합할 수 있음
+        """
+        speech_service = SpeechService()
+        aligned = speech_service.get_aligned_script(get_broken_script())
+        # 이전 버전은 "저는 밥을 먹었습니다."에서 `먹었습니다.그래서`의 길이만큼 잘라 "저는 "으로 저장함
+        legacy = {
+            **aligned,
+            "segments": [
+                {**segment, "text": "저는 "} if segment["broken"] else segment
+                for segment in aligned["segments"]
+            ],
+        }
+
+        with self.assertRaises(IndexError):
+            speech_service.get_aligned_script(legacy)
+
+        realigned = speech_service.get_aligned_script(
+            reanalyze.restore_broken_segment_texts(legacy)
+        )
+        self.assertEqual(realigned["segments"], aligned["segments"])
+
+
+class RetryFailedTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.progress_file = Path(self.tmp_dir.name) / "progress.json"
+        with open(self.progress_file, "w") as f:
+            json.dump(
+                {
+                    "last_id": 10,
+                    "failed": [
+                        {"presentation_id": 1, "speech_id": 4, "error": "e"},
+                        {"presentation_id": 2, "speech_id": 5, "error": "e"},
+                    ],
+                },
+                f,
+            )
+
+        self.speech_db_client = mock.Mock()
+        self.speech_db_client.iter_pages.return_value = []
+        self.analysis_record_service = mock.Mock()
+
+        def analyze_speech(presentation_id, speech_id, dry_run):
+            if speech_id == 5:
+                raise FileNotFoundError(speech_id)
+            result = mock.Mock(records=[], speech_info={"avglpm": 1.0})
+            return presentation_id, speech_id, result, 0
+
+        patchers = [
+            mock.patch.object(
+                reanalyze,
+                "ProcessPoolExecutor",
+                lambda **kwargs: ThreadPoolExecutor(max_workers=1),
+            ),
+            mock.patch.object(
+                reanalyze,
+                "SpeechDatabaseClient",
+                return_value=self.speech_db_client,
+            ),
+            mock.patch(
+                "api.service.analysis_record.AnalysisRecordService",
+                return_value=self.analysis_record_service,
+            ),
+            mock.patch.object(reanalyze, "_analyze_speech", analyze_speech),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def run_reanalyze(self, *argv):
+        args = reanalyze.get_parser().parse_args(
+            ["--progress-file", str(self.progress_file), "--workers", "1", *argv]
+        )
+        return reanalyze.reanalyze(args)
+
+    def test_retry_failed(self):
+        progress = self.run_reanalyze("--retry-failed")
+
+        self.analysis_record_service.save_analysis_results.assert_called_once_with(
+            1, 4, [], upsert=True
+        )
+        # 다시 실패한 스피치만 남고, 이어서 last_id 이후부터 재개
+        self.assertEqual([failed["speech_id"] for failed in progress.failed], [5])
+        self.assertEqual(
+            self.speech_db_client.iter_pages.call_args.kwargs["after_id"], 10
+        )
+        with open(self.progress_file) as f:
+            saved = json.load(f)
+        self.assertEqual(saved["last_id"], 10)
+        self.assertEqual([failed["speech_id"] for failed in saved["failed"]], [5])
+
+    def test_without_retry_failed(self):
+        progress = self.run_reanalyze()
+
+        self.analysis_record_service.save_analysis_results.assert_not_called()
+        self.assertEqual([failed["speech_id"] for failed in progress.failed], [4, 5])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,48 @@
+import json
+import unittest
+
+import numpy as np
+
+from api.utils import serialization
+
+
+class TestSerialization(unittest.TestCase):
+    def test_numpy_array_serialization(self):
+        """
+        NumPy 배열은 list로 변환하지 않아도 직렬화되며, NaN은 null로 저장됨
+        """
+        result = serialization.dumps(
+            {"times": np.array([0.0, 0.5]), "f0": np.array([1.5, np.nan])}
+        )
+        self.assertEqual(
+            serialization.loads(result), {"times": [0.0, 0.5], "f0": [1.5, None]}
+        )
+
+    def test_utf8_without_escape(self):
+        """
+        한글은 escape 없이 UTF-8 그대로 저장됨
+        """
+        self.assertEqual(
+            serialization.dumps({"text": "안녕"}), '{"text":"안녕"}'.encode()
+        )
+
+    def test_legacy_double_encoded_object(self):
+        """
+        이전 버전에서 이중으로 인코딩되어 저장된 object도 한 번에 디코딩됨
+        """
+        original = {"text": "안녕하세요.", "values": [1.0, float("nan")]}
+        legacy = json.dumps(json.dumps(original, ensure_ascii=False)).encode()
+
+        result = serialization.loads(legacy)
+        self.assertEqual(result["text"], original["text"])
+        self.assertTrue(np.isnan(result["values"][1]))
+
+    def test_plain_string_value(self):
+        """
+        JSON 문자열이 아닌 단순 문자열 값은 그대로 반환됨
+        """
+        self.assertEqual(serialization.loads(b'"success"'), "success")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+import os
+import signal
+import sys
+import threading
+import unittest
+from unittest import mock
+
+from api.command import serve
+from api.configs.analysis import config as analysis_config
+
+
+class ServeTest(unittest.TestCase):
+    def setUp(self):
+        patchers = [
+            mock.patch.object(analysis_config, "kiwi_num_workers"),
+            mock.patch.object(analysis_config, "incremental_analysis_enabled", True),
+            mock.patch.dict(sys.modules, {"main": mock.Mock(app="app")}),
+            mock.patch.object(serve, "warm_up"),
+            mock.patch.object(serve, "PreforkServer"),
+            mock.patch.object(serve.socket, "socket"),
+            mock.patch.object(serve.gc, "freeze"),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def run_serve(self, *argv):
+        args = serve.get_parser().parse_args(list(argv))
+        serve.serve(args)
+        return args
+
+    def test_parser_defaults(self):
+        args = serve.get_parser().parse_args([])
+        self.assertEqual((args.host, args.port), ("127.0.0.1", 8000))
+        self.assertEqual(args.workers, os.cpu_count() or 1)
+
+    def test_serve(self):
+        args = self.run_serve("--workers", "1")
+
+        # kiwi는 fork 이후에도 동작하도록 single thread로 생성
+        self.assertEqual(analysis_config.kiwi_num_workers, 1)
+        serve.warm_up.assert_called_once()
+        serve.PreforkServer.assert_called_once_with(
+            "app", serve.socket.socket.return_value, args
+        )
+        serve.PreforkServer.return_value.run.assert_called_once()
+        self.assertTrue(analysis_config.incremental_analysis_enabled)
+
+    def test_disable_incremental_analysis(self):
+        """
+        worker가 2개 이상이면 같은 speech의 요청이 서로 다른 worker로 전달되므로 점진 분석을 끔
+        """
+        self.run_serve("--workers", "4")
+        self.assertFalse(analysis_config.incremental_analysis_enabled)
+
+
+class PreforkServerTest(unittest.TestCase):
+    def setUp(self):
+        handlers = {
+            signum: signal.getsignal(signum)
+            for signum in (signal.SIGTERM, signal.SIGINT)
+        }
+        for signum, handler in handlers.items():
+            self.addCleanup(signal.signal, signum, handler)
+
+    def test_restart_worker(self):
+        """
+        worker가 종료되면 같은 번호로 다시 fork함
+        """
+        server = serve.PreforkServer(
+            "app", mock.Mock(), serve.get_parser().parse_args(["--workers", "1"])
+        )
+        spawned = []
+        spawn_worker = server.spawn_worker
+
+        def record_spawn(worker_number):
+            spawned.append(worker_number)
+            spawn_worker(worker_number)
+
+        def stop_after_restart(seconds):
+            if len(spawned) == 2:
+                server.shutting_down = True
+
+        # 자식 프로세스의 run_worker는 바로 종료
+        with mock.patch.object(serve, "run_worker"), mock.patch.object(
+            server, "spawn_worker", record_spawn
+        ), mock.patch.object(serve.time, "sleep", stop_after_restart):
+            server.run()
+
+        self.assertEqual(spawned, [0, 0, 0])
+        self.assertEqual(server.workers, {})
+
+    def test_shutdown(self):
+        """
+        SIGTERM을 받으면 worker들을 종료시키고 다시 fork하지 않음
+        """
+        server = serve.PreforkServer(
+            "app", mock.Mock(), serve.get_parser().parse_args(["--workers", "2"])
+        )
+        timer = threading.Timer(0.5, os.kill, (os.getpid(), signal.SIGTERM))
+
+        # 자식 프로세스는 signal을 받을 때까지 대기
+        with mock.patch.object(serve, "run_worker", lambda *args: signal.pause()):
+            timer.start()
+            server.run()
+
+        self.assertTrue(server.shutting_down)
+        self.assertEqual(server.workers, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
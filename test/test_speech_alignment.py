@@ -0,0 +1,286 @@
+import contextlib
+import io
+import json
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from kiwipiepy import Kiwi
+
+from api.configs.analysis import config as analysis_config
+from api.data.enums import AnalysisRecordType
+from api.service import speech
+from api.service.speech import AlignedSegmentsCache, SpeechService, get_segments_hash
+from api.service.analysis2_service import analyze_stt_script
+from api.service.storage import MemoryStorageService
+from api.utils import serialization
+
+SAMPLE_PATH = (
+    Path(__file__).parent.parent / "research" / "samples" / "지식브런치_stt.json"
+)
+
+
+class AlignedSegmentsTest(unittest.TestCase):
+    def setUp(self):
+        self.speech_service = SpeechService()
+
+    def test_aligned(self):
+        """
+        문장 분리 결과와 STT 단어 단위가 같으면 문장마다 단어가 그대로 배정됨
+        """
+        words = [[0, 100, "안녕하세요."], [200, 300, "반갑습니다."]]
+        segments = self.speech_service._get_aligned_segments(
+            words, [" 안녕하세요. ", "반갑습니다."]
+        )
+
+        self.assertEqual(
+            segments,
+            [
+                {
+                    "start": 0,
+                    "end": 100,
+                    "text": "안녕하세요.",
+                    "words": [(0, 100, "안녕하세요.")],
+                    "broken": False,
+                },
+                {
+                    "start": 200,
+                    "end": 300,
+                    "text": "반갑습니다.",
+                    "words": [(200, 300, "반갑습니다.")],
+                    "broken": False,
+                },
+            ],
+        )
+
+    def test_broken(self):
+        """
+        STT 단어가 문장 경계에 걸치면 남은 부분이 다음 문장으로 넘어가고 broken으로 표시됨
+        """
+        words = [[0, 100, "오늘은"], [100, 200, "날씨가"], [200, 300, "좋네요."]]
+        segments = self.speech_service._get_aligned_segments(
+            words, ["오늘은 날", "씨가 좋네요."]
+        )
+
+        self.assertTrue(segments[0]["broken"])
+        self.assertEqual(segments[0]["words"], [(0, 100, "오늘은")])
+        self.assertEqual(segments[1]["text"], "날씨가 좋네요.")
+        self.assertEqual(
+            segments[1]["words"], [(100, 200, "날씨가"), (200, 300, "좋네요.")]
+        )
+        self.assertEqual((segments[1]["start"], segments[1]["end"]), (100, 300))
+
+
+class SplittedSentencesTest(unittest.TestCase):
+    texts = [
+        "안녕하세요. 오늘은 문장 분리에 대해",
+        "이야기해 보겠습니다. 문장 분리는 형태소 분석기로",
+        "수행합니다. 하지만 STT 결과는",
+        "문장 중간에서 끊기기도 합니다.",
+        "감사합니다.",
+    ]
+
+    def setUp(self):
+        self.speech_service = SpeechService()
+
+    def test_chunks(self):
+        """
+        chunk의 시작 위치는 segment 텍스트들을 공백으로 이어 붙인 텍스트에서의 위치임
+        """
+        text = " ".join(self.texts)
+        chunks = SpeechService._get_chunks(self.texts, 40)
+
+        self.assertEqual(" ".join(map(lambda c: c[1], chunks)), text)
+        for offset, chunk in chunks:
+            self.assertEqual(text[offset : offset + len(chunk)], chunk)
+
+    def test_same_as_single_call(self):
+        """
+        chunk로 나누어 분리한 결과는 한 번에 분리한 결과와 같음
+        """
+        with mock.patch("api.service.speech._kiwi", Kiwi(num_workers=2)):
+            expected = self.speech_service._get_splitted_sentences(" ".join(self.texts))
+            for chunk_size in (1, 20, 40, 80):
+                self.assertEqual(
+                    self.speech_service._get_splitted_sentences_of_segments(
+                        self.texts, chunk_size
+                    ),
+                    expected,
+                )
+
+
+class AlignedScriptCacheTest(unittest.TestCase):
+    script = {
+        "text": "안녕하세요. 반갑습니다.",
+        "segments": [
+            {
+                "start": 0,
+                "end": 300,
+                "text": "안녕하세요. 반갑습니다.",
+                "words": [[0, 100, "안녕하세요."], [200, 300, "반갑습니다."]],
+            }
+        ],
+    }
+
+    def setUp(self):
+        self.speech_service = SpeechService()
+        self.speech_service._storage_service = MemoryStorageService()
+
+        cache_patcher = mock.patch.object(
+            speech, "aligned_segments_cache", AlignedSegmentsCache(8)
+        )
+        cache_patcher.start()
+        self.addCleanup(cache_patcher.stop)
+
+    def get_aligned_script_counting_splits(self, script, cache_key=None):
+        with mock.patch.object(
+            self.speech_service,
+            "_get_splitted_sentences_of_segments",
+            wraps=self.speech_service._get_splitted_sentences_of_segments,
+        ) as split:
+            aligned = self.speech_service.get_aligned_script(script, cache_key)
+        return aligned, split.call_count
+
+    def test_segments_hash(self):
+        """
+        segment의 텍스트나 단어가 바뀌면 cache key도 바뀜
+        """
+        segments = self.script["segments"]
+        changed_word = [{**segments[0], "words": [[0, 100, "안녕하세요."]]}]
+        changed_text = [{**segments[0], "text": "안녕하세요."}]
+
+        self.assertEqual(get_segments_hash(segments), get_segments_hash(segments))
+        self.assertNotEqual(
+            get_segments_hash(segments), get_segments_hash(changed_word)
+        )
+        self.assertNotEqual(
+            get_segments_hash(segments), get_segments_hash(changed_text)
+        )
+
+    def test_lru(self):
+        """
+        maxsize를 넘으면 가장 오래 사용하지 않은 결과부터 삭제됨
+        """
+        cache = AlignedSegmentsCache(2)
+        cache.put("a", [])
+        cache.put("b", [])
+        cache.get("a")
+        cache.put("c", [])
+
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), [])
+        self.assertEqual(cache.get("c"), [])
+
+    def test_memory_cache(self):
+        """
+        같은 STT 결과를 다시 재조합하면 문장 분리를 수행하지 않음
+        """
+        expected, split_count = self.get_aligned_script_counting_splits(self.script)
+        self.assertEqual(split_count, 1)
+
+        aligned, split_count = self.get_aligned_script_counting_splits(self.script)
+        self.assertEqual(split_count, 0)
+        self.assertEqual(aligned, expected)
+
+    def test_persistent_cache(self):
+        """
+        저장소에 저장된 재조합 결과는 memory cache가 비어 있어도 재사용되며, STT 결과가 바뀌면 사용하지 않음
+        """
+        cache_key = "1/1/analysis/STT_ALIGNED.json"
+        with mock.patch.object(analysis_config, "alignment_cache_persist", True):
+            expected, _ = self.get_aligned_script_counting_splits(
+                self.script, cache_key
+            )
+
+            with mock.patch.object(
+                speech, "aligned_segments_cache", AlignedSegmentsCache(8)
+            ):
+                aligned, split_count = self.get_aligned_script_counting_splits(
+                    self.script, cache_key
+                )
+            self.assertEqual(split_count, 0)
+            self.assertEqual(aligned, expected)
+
+            changed = {
+                **self.script,
+                "segments": [{**self.script["segments"][0], "start": 10}],
+            }
+            changed["segments"][0]["words"] = [
+                [10, 100, "안녕하세요."],
+                [200, 300, "반갑습니다."],
+            ]
+            _, split_count = self.get_aligned_script_counting_splits(changed, cache_key)
+            self.assertEqual(split_count, 1)
+
+
+def get_broken_script() -> dict:
+    """
+    kiwi와 STT의 단어 단위가 달라 깨진 문장이 생기는 STT 결과 (`먹었습니다.그래서`가 두 문장에 걸침)
+    """
+    words = "저는 밥을 먹었습니다.그래서 배가 부릅니다. 오늘은 좋은 날입니다.".split()
+    timestamps = [[i * 500, i * 500 + 400, word] for i, word in enumerate(words)]
+    return {
+        "text": " ".join(words),
+        "segments": [
+            {
+                "start": 0,
+                "end": timestamps[-1][1],
+                "text": " ".join(words),
+                "words": timestamps,
+            }
+        ],
+    }
+
+
+class AlignmentFixedPointTest(unittest.TestCase):
+    """
+    analysis-2는 STT.json을 재조합 결과로 덮어쓰므로, 원본 STT 결과가 없는 스피치는 재조합 결과를 다시 재조합하여 재분석함
+    """
+
+    def setUp(self):
+        with open(SAMPLE_PATH, "r") as f:
+            self.scripts = [json.load(f), get_broken_script()]
+        self.speech_service = SpeechService()
+
+    @staticmethod
+    def round_trip(json_object):
+        # 저장 후 다시 읽은 형태 (tuple -> list)
+        return serialization.loads(serialization.dumps(json_object))
+
+    def test_broken_sentence(self):
+        """
+        깨진 문장의 텍스트는 배정된 단어들까지만 남김
+        """
+        aligned = self.speech_service.get_aligned_script(get_broken_script())
+        self.assertEqual(
+            [(s["text"], s["broken"]) for s in aligned["segments"]],
+            [
+                ("저는 밥을", True),
+                ("먹었습니다.그래서 배가 부릅니다.", False),
+                ("오늘은 좋은 날입니다.", False),
+            ],
+        )
+
+    def test_align_aligned_script(self):
+        for script in self.scripts:
+            aligned = self.round_trip(self.speech_service.get_aligned_script(script))
+            realigned = self.round_trip(self.speech_service.get_aligned_script(aligned))
+            self.assertEqual(realigned, aligned)
+
+    def test_reanalyze_aligned_script(self):
+        for script in self.scripts:
+            with contextlib.redirect_stdout(io.StringIO()):
+                expected = analyze_stt_script(script, self.speech_service)
+                stored_script = self.round_trip(
+                    dict(expected.records)[AnalysisRecordType.STT]
+                )
+                result = analyze_stt_script(stored_script, self.speech_service)
+
+            self.assertEqual(result.speech_info, expected.speech_info)
+            self.assertEqual(
+                self.round_trip(result.records), self.round_trip(expected.records)
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+import io
+import tempfile
+import unittest
+from pathlib import Path
+
+from api.service.storage import LocalStorageService, MemoryStorageService
+from api.utils import compression
+
+
+class StorageServiceTestMixin:
+    def test_json_round_trip(self):
+        """
+        업로드한 JSON object는 압축 여부와 관계 없이 그대로 다운로드됨
+        """
+        result = {"text": "안녕하세요.", "values": list(range(1000))}
+        for content_encoding in (compression.IDENTITY, compression.GZIP):
+            key = f"1/2/analysis/{content_encoding}.json"
+            self.storage.upload_json_object(
+                key, result, content_encoding=content_encoding, compression_level=6
+            )
+            self.assertEqual(self.storage.download_json_object(key), result)
+
+    def test_path_prefix(self):
+        """
+        *path로 전달한 prefix는 object key 앞에 붙음
+        """
+        self.storage.upload_json_object("STT.json", [1, 2], 1, 2, "analysis")
+        self.assertEqual(
+            self.storage.download_json_object("1/2/analysis/STT.json"), [1, 2]
+        )
+
+    def test_stream_and_file(self):
+        """
+        stream으로 업로드한 object를 파일로 다운로드할 수 있음
+        """
+        data = b"\x00\x01" * 1024 * 1024
+        self.storage.upload_stream(io.BytesIO(data), "1/full.mp3", "audio/mpeg")
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            dest_path = Path(tmp_dir) / "full.mp3"
+            self.storage.download_object("1/full.mp3", dest_path)
+            self.assertEqual(dest_path.read_bytes(), data)
+
+            self.storage.upload_object(dest_path, "copied.mp3", 1)
+            self.storage.download_object("1/copied.mp3", dest_path)
+            self.assertEqual(dest_path.read_bytes(), data)
+
+
+class TestLocalStorageService(StorageServiceTestMixin, unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.storage = LocalStorageService(self.tmp_dir.name)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_key_outside_root(self):
+        """
+        root 디렉토리 밖을 가리키는 object key는 허용하지 않음
+        """
+        with self.assertRaises(ValueError):
+            self.storage.upload_json_object("../outside.json", {})
+
+
+class TestMemoryStorageService(StorageServiceTestMixin, unittest.TestCase):
+    def setUp(self):
+        self.storage = MemoryStorageService()
+
+    def test_missing_object(self):
+        with self.assertRaises(FileNotFoundError):
+            self.storage.download_json_object("missing.json")
+
+
+if __name__ == "__main__":
+    unittest.main()
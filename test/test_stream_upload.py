@@ -0,0 +1,159 @@
+import io
+import os
+import threading
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import ffmpeg
+
+from api.service.aws.s3 import S3Metrics, S3Service, _CountingReader
+from api.service.ffmpeg_service import FfmpegOutputStream, wav_to_mp3_stream
+
+
+def pipe_stdout(data: bytes, chunk_size: int = 1000) -> io.BufferedReader:
+    """
+    ffmpeg처럼 data를 작은 조각으로 나누어 쓰는 pipe의 읽기 쪽 (Popen.stdout과 같은 BufferedReader)
+    """
+    read_fd, write_fd = os.pipe()
+
+    def write():
+        with os.fdopen(write_fd, "wb", buffering=0) as f:
+            for i in range(0, len(data), chunk_size):
+                f.write(data[i : i + chunk_size])
+
+    threading.Thread(target=write, daemon=True).start()
+    return os.fdopen(read_fd, "rb")
+
+
+class StubProcess:
+    def __init__(self, stdout: io.BufferedReader, exit_code: int = 0) -> None:
+        self.stdout = stdout
+        self.exit_code = exit_code
+        self.returncode = None
+        self.killed = False
+
+    def poll(self):
+        return self.returncode
+
+    def wait(self):
+        self.returncode = -9 if self.killed else self.exit_code
+        return self.returncode
+
+    def kill(self):
+        self.killed = True
+
+
+class StubS3Client:
+    """
+    upload_fileobj는 boto3와 같이 EOF(빈 bytes)까지 part 크기만큼 읽은 뒤에 object를 저장한다.
+    """
+
+    def __init__(self) -> None:
+        self.objects = {}
+        self.part_sizes = []
+        self.extra_args = None
+
+    def upload_fileobj(self, fileobj, bucket, key, ExtraArgs=None, Config=None):
+        parts = []
+        while part := fileobj.read(Config.multipart_chunksize):
+            parts.append(part)
+        self.part_sizes = [len(part) for part in parts]
+        self.extra_args = ExtraArgs
+        self.objects[key] = b"".join(parts)
+
+
+class FfmpegOutputStreamTest(unittest.TestCase):
+    def test_read_full_size_until_eof(self):
+        data = os.urandom(10000)
+        with FfmpegOutputStream(StubProcess(pipe_stdout(data))) as stream:
+            chunks = []
+            while chunk := stream.read(4096):
+                chunks.append(chunk)
+
+        self.assertEqual([len(chunk) for chunk in chunks], [4096, 4096, 1808])
+        self.assertEqual(b"".join(chunks), data)
+        self.assertEqual(stream.bytes_read, len(data))
+
+    def test_non_zero_exit(self):
+        stream = FfmpegOutputStream(StubProcess(pipe_stdout(b"\x00" * 100), 1))
+        with self.assertRaises(ffmpeg.Error):
+            stream.read()
+        stream.close()
+
+    def test_close_running_process(self):
+        """
+        끝까지 읽지 않고 닫으면 실행 중인 프로세스를 종료함
+        """
+        process = StubProcess(pipe_stdout(b"\x00" * 100))
+        with FfmpegOutputStream(process) as stream:
+            stream.read(10)
+
+        self.assertTrue(process.killed)
+        self.assertTrue(process.stdout.closed)
+
+    def test_wav_to_mp3_stream(self):
+        process = StubProcess(pipe_stdout(b""))
+        with mock.patch("ffmpeg._run.subprocess.Popen", return_value=process) as popen:
+            with wav_to_mp3_stream(Path("speech.wav")) as stream:
+                self.assertIs(stream.process, process)
+
+        args = popen.call_args.args[0]
+        self.assertIn("pipe:", args)
+        self.assertIn("mp3", args)
+        self.assertIsNotNone(popen.call_args.kwargs["stdout"])
+
+
+class UploadStreamTest(unittest.TestCase):
+    def setUp(self):
+        self.client = StubS3Client()
+        patcher = mock.patch.object(
+            S3Service,
+            "client",
+            new_callable=mock.PropertyMock,
+            return_value=self.client,
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.s3_service = S3Service()
+        self.s3_service.metrics = S3Metrics()
+
+    def test_counting_reader(self):
+        reader = _CountingReader(io.BytesIO(b"\x00" * 10))
+        reader.read(4)
+        reader.read()
+        reader.read()
+        self.assertEqual(reader.bytes_read, 10)
+
+    def test_upload_ffmpeg_stream(self):
+        data = os.urandom(10000)
+        with FfmpegOutputStream(StubProcess(pipe_stdout(data))) as stream:
+            url = self.s3_service.upload_stream(
+                stream, "1/2/full.mp3", "audio/mpeg", part_size=4096
+            )
+
+        self.assertTrue(url.endswith("/1/2/full.mp3"))
+        self.assertEqual(self.client.objects["1/2/full.mp3"], data)
+        self.assertEqual(self.client.part_sizes, [4096, 4096, 1808])
+        self.assertEqual(self.client.extra_args, {"ContentType": "audio/mpeg"})
+
+        stats = self.s3_service.metrics.get_stats()["upload_stream"]
+        self.assertEqual((stats["count"], stats["error_count"]), (1, 0))
+        self.assertEqual(stats["bytes"], len(data))
+
+    def test_upload_failed_ffmpeg_stream(self):
+        """
+        ffmpeg가 실패하면 잘린 결과를 업로드하지 않고 예외가 발생함
+        """
+        with FfmpegOutputStream(StubProcess(pipe_stdout(b"\x00" * 10000), 1)) as stream:
+            with self.assertRaises(ffmpeg.Error):
+                self.s3_service.upload_stream(stream, "1/2/full.mp3", part_size=4096)
+
+        self.assertNotIn("1/2/full.mp3", self.client.objects)
+        stats = self.s3_service.metrics.get_stats()["upload_stream"]
+        self.assertEqual(stats["error_count"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+import unittest
+from pathlib import Path
+
+import msgspec
+
+from api.data.stt import SttScript, decode_stt_script
+from api.utils import serialization
+
+SAMPLE_PATH = (
+    Path(__file__).parent.parent / "research" / "samples" / "지식브런치_stt.json"
+)
+
+
+class SttDecodingTest(unittest.TestCase):
+    def test_decode(self):
+        """
+        SttScript는 dict / list로 역직렬화한 결과와 같은 방식으로 접근할 수 있음
+        """
+        data = SAMPLE_PATH.read_bytes()
+        expected = serialization.loads(data)
+        script = decode_stt_script(data)
+
+        self.assertIsInstance(script, SttScript)
+        self.assertEqual(script["text"], expected["text"])
+        self.assertEqual(script["segments"][-1]["end"], expected["segments"][-1]["end"])
+
+        word, expected_word = (
+            script.segments[0].words[0],
+            expected["segments"][0]["words"][0],
+        )
+        self.assertEqual(list(word), expected_word)
+        self.assertEqual(word[2], expected_word[2])
+        self.assertEqual(word[:2], tuple(expected_word[:2]))
+
+        # 분석에 사용하지 않는 field는 유지되지만, 없던 field는 추가되지 않음
+        self.assertEqual(script.to_dict()["token"], expected["token"])
+        self.assertNotIn(
+            "result", decode_stt_script(b'{"text": "", "segments": []}').to_dict()
+        )
+
+    def test_validation(self):
+        """
+        필수 field가 없거나 시간 값이 잘못된 경우 ValidationError
+        """
+        invalid_payloads = [
+            b'{"segments": []}',
+            b'{"text": "", "segments": [{"start": 0, "end": 1, "text": ""}]}',
+            b'{"text": "", "segments": [{"start": -1, "end": 1, "text": "", "words": []}]}',
+            b'{"text": "", "segments": [{"start": 0, "end": 9, "text": "", "words": [[5, 1, "a"]]}]}',
+        ]
+        for payload in invalid_payloads:
+            with self.assertRaises(msgspec.ValidationError):
+                decode_stt_script(payload)
+
+
+if __name__ == "__main__":
+    unittest.main()
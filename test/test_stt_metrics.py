@@ -0,0 +1,133 @@
+import contextlib
+import io
+import json
+import unittest
+from pathlib import Path
+
+from api.service import stt_analysis_service
+from api.service.stt_analysis_service import get_lpm_heatmap, get_lpm_heatmaps
+from api.service.speech_correction_symbol_service import get_speech_correction
+from api.service.stt_metrics_service import WordTable, get_stt_metrics
+
+SAMPLE_PATH = (
+    Path(__file__).parent.parent
+    / "research"
+    / "samples"
+    / "kss_concatenated_script_sample.json"
+)
+
+
+class SttMetricsTest(unittest.TestCase):
+    def setUp(self):
+        with open(SAMPLE_PATH, "r") as f:
+            self.script = json.load(f)
+
+    def test_word_table(self):
+        """
+        문장 별 단어 범위는 sentence_offsets로, 단어가 속한 문장은 sentence_id로 표현됨
+        """
+        table = WordTable(self.script)
+        segments = self.script["segments"]
+
+        self.assertEqual(len(table), sum(len(s["words"]) for s in segments))
+        self.assertEqual(table.sentence_count, len(segments))
+        for s_idx, segment in enumerate(segments):
+            begin, end = table.sentence_offsets[s_idx : s_idx + 2]
+            self.assertEqual(end - begin, len(segment["words"]))
+            self.assertTrue((table.sentence_id[begin:end] == s_idx).all())
+            self.assertEqual(table.start[begin], segment["words"][0][0])
+
+    def test_same_as_functions(self):
+        """
+        한 번에 계산한 분석 결과는 기존 분석 함수들의 결과와 같음
+        """
+        metrics = get_stt_metrics(self.script)
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            ptl = stt_analysis_service.get_ptl_by_sentence(self.script)
+            lpm = stt_analysis_service.get_lpm_by_sentence_v2(self.script)
+
+        self.assertEqual(metrics.ptl_by_sentence, ptl)
+        self.assertEqual(metrics.word_speed, lpm)
+        self.assertEqual(
+            metrics.lpm_by_sentence,
+            stt_analysis_service.get_lpm_by_sentence(self.script),
+        )
+        self.assertEqual(
+            metrics.ptl_ratio, stt_analysis_service.get_ptl_ratio(self.script)
+        )
+        self.assertEqual(
+            metrics.average_lpm, stt_analysis_service.get_average_lpm(self.script)
+        )
+        self.assertEqual(
+            metrics.speech_correction,
+            get_speech_correction(None, ptl, self.script),
+        )
+
+    def test_speech_correction(self):
+        """
+        문장 별 LPM이 주어지면 속도 교정 부호도 생성하며, 입력된 STT 결과는 수정하지 않음
+        """
+        with open(SAMPLE_PATH, "r") as f:
+            original = json.load(f)
+
+        lpm = stt_analysis_service.get_lpm_by_sentence(self.script)
+        ptl = stt_analysis_service.get_ptl_by_sentence(self.script)
+        result = get_speech_correction(lpm, ptl, self.script)
+
+        self.assertEqual(self.script, original)
+        self.assertEqual(
+            get_stt_metrics(self.script, lpm_correction=True).speech_correction,
+            result,
+        )
+
+        start, end = result["TOO_FAST"][0]
+        sentence_index = next(i for i, v in enumerate(lpm) if v >= 400)
+        self.assertEqual(
+            end - start + 1, len(self.script["segments"][sentence_index]["words"])
+        )
+
+
+class LpmHeatmapTest(unittest.TestCase):
+    @staticmethod
+    def get_script(words):
+        return {
+            "text": "",
+            "segments": [{"start": 0, "end": 0, "text": "", "words": words}],
+        }
+
+    def test_legacy(self):
+        """
+        legacy 방식은 앞 부분 window에 다음 단어의 끝 시각과 450 LPM 기준을 사용함
+        """
+        # 첫 window는 첫 단어(6글자)를 두 번째 단어의 끝(1.5초)까지로 보므로 240 LPM (-1)
+        # 나머지 두 단어 구간은 12글자 / 1.5초 = 480 LPM (+1), 마지막 단어만의 구간은 360 LPM (0)
+        words = [[0, 1000, "가" * 6], [500, 1500, "가" * 6], [1000, 2000, "가" * 6]]
+        result = get_lpm_heatmap(self.get_script(words), window_size=2)
+
+        self.assertEqual(result["WINDOW_SIZE"], 2)
+        self.assertEqual(result["speed_list"], [0, 2, 1])
+
+    def test_symmetric(self):
+        """
+        symmetric 방식은 모든 단어가 window size 만큼의 window에 포함됨
+        """
+        fast_words = [[i * 100, i * 100 + 50, "가" * 10] for i in range(12)]
+        results = get_lpm_heatmaps(self.get_script(fast_words), [1, 4, 20], "symmetric")
+
+        self.assertEqual([r["WINDOW_SIZE"] for r in results], [1, 4, 12])
+        for r in results:
+            self.assertEqual(r["speed_list"], [r["WINDOW_SIZE"]] * 12)
+
+    def test_full(self):
+        """
+        full 방식은 잘리지 않은 window만 적용하므로 양 끝 단어는 더 적은 window에 포함됨
+        """
+        slow_words = [[i * 1000, i * 1000 + 900, "가"] for i in range(5)]
+        result = get_lpm_heatmap(self.get_script(slow_words), 3, "full")
+
+        self.assertEqual(result["speed_list"], [-1, -2, -3, -2, -1])
+
+
+if __name__ == "__main__":
+    unittest.main()
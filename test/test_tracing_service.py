@@ -0,0 +1,111 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from sqlalchemy import create_engine, text
+
+from api.configs.tracing import TracingConfig
+from api.service.tracing_service import (
+    JsonlSpanExporter,
+    Tracer,
+    inject_traceparent,
+    parse_traceparent,
+)
+
+TRACE_ID = "4bf92f3577b34da6a3ce929d0e0e4736"
+PARENT_ID = "00f067aa0ba902b7"
+TRACEPARENT = f"00-{TRACE_ID}-{PARENT_ID}-01"
+
+
+class TraceparentTest(unittest.TestCase):
+    def test_parse(self):
+        self.assertEqual(parse_traceparent(TRACEPARENT), (TRACE_ID, PARENT_ID))
+        self.assertIsNone(parse_traceparent(None))
+        self.assertIsNone(parse_traceparent("00-1234-5678-01"))
+        self.assertIsNone(parse_traceparent(f"00-{'0' * 32}-{PARENT_ID}-01"))
+
+    def test_inject(self):
+        """
+        기존 query parameter는 유지하고, 이미 있는 traceparent는 교체함
+        """
+        url = inject_traceparent(
+            "https://dalcom/callback?speech=7&traceparent=old", TRACEPARENT
+        )
+        self.assertEqual(
+            url, f"https://dalcom/callback?speech=7&traceparent={TRACEPARENT}"
+        )
+        self.assertEqual(
+            inject_traceparent("https://dalcom/callback", None),
+            "https://dalcom/callback",
+        )
+
+
+class TracerTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp_dir.name) / "traces.jsonl"
+        self.tracer = Tracer(
+            TracingConfig(tracing_enabled=True),
+            JsonlSpanExporter(str(self.path)),
+        )
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def read_spans(self):
+        with open(self.path) as f:
+            return {span["name"]: span for span in map(json.loads, f)}
+
+    def test_nested_spans(self):
+        """
+        이어받은 trace context의 하위 span으로 기록되며, 작업 attribute는 모든 span에 기록됨
+        """
+        with self.tracer.start_trace(
+            "analysis-2", TRACEPARENT, presentation_id=3, speech_id=7
+        ):
+            with self.tracer.span("align", kind="analysis-2"):
+                traceparent = self.tracer.get_traceparent()
+            with self.assertRaises(ValueError):
+                with self.tracer.span("save_results"):
+                    raise ValueError("upload failed")
+
+        spans = self.read_spans()
+        root, align = spans["analysis-2"], spans["align"]
+        self.assertEqual(root["trace_id"], TRACE_ID)
+        self.assertEqual(root["parent_id"], PARENT_ID)
+        self.assertEqual(align["parent_id"], root["span_id"])
+        self.assertEqual(traceparent, f"00-{TRACE_ID}-{align['span_id']}-01")
+        self.assertEqual(
+            align["attributes"],
+            {"presentation_id": 3, "speech_id": 7, "kind": "analysis-2"},
+        )
+        self.assertEqual(root["status"], "ok")
+        self.assertEqual(spans["save_results"]["status"], "error")
+
+    def test_db_query_span(self):
+        """
+        진행 중인 trace가 있으면 모든 engine의 SQL 문이 span으로 기록됨
+        """
+        engine = create_engine("sqlite://")
+        with self.tracer.start_trace("analysis-1"), engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+
+        spans = self.read_spans()
+        self.assertEqual(spans["db.query"]["parent_id"], spans["analysis-1"]["span_id"])
+        self.assertEqual(spans["db.query"]["attributes"]["statement"], "SELECT 1")
+
+    def test_disabled(self):
+        """
+        tracing이 꺼져 있거나 진행 중인 trace가 없으면 아무것도 기록하지 않음
+        """
+        tracer = Tracer(
+            TracingConfig(tracing_enabled=False), JsonlSpanExporter(str(self.path))
+        )
+        with tracer.start_trace("analysis-1") as root, tracer.span("pyin") as span:
+            self.assertIsNone(root)
+            self.assertIsNone(span)
+            self.assertIsNone(tracer.get_traceparent())
+        with self.tracer.span("pyin") as span:
+            self.assertIsNone(span)
+        self.assertFalse(self.path.exists())